@@ -14,14 +14,14 @@ from flask import Flask, jsonify
 from flask_swagger import swagger
 from celery import Celery
 
-from .models.role import create_roles
-from .models.task_option import populate_task_options
-
 from .celery import make_celery
 from .extensions import db, mail, limiter, initialize_extensions
 from .blueprints import register_all_blueprints
+from .rate_limits import register_rate_limits
+from .metrics import init_metrics
 from .utils.helpers.loggers import log_exception, console_log
 from .utils.hooks import register_hooks
+from .utils.commands import register_commands
 from config import Config, configure_logging, config_by_name
 
 
@@ -50,6 +50,15 @@ def create_app(config_name=Config.ENV):
     
     # Register blueprints
     register_all_blueprints(flask_app)
+    
+    # Apply rate limit policies to the registered routes
+    register_rate_limits(flask_app)
+    
+    # Set up request, database and outbound call metrics, served on /metrics
+    init_metrics(flask_app)
+    
+    # Register custom CLI commands
+    register_commands(flask_app)
 
     @flask_app.route('/spec')
     def spec():
@@ -65,9 +74,6 @@ def create_app(config_name=Config.ENV):
     import app.celery.jobs.tasks # Ensure the tasks are imported
     celery.set_default()
     
-    
-    with flask_app.app_context():
-        create_roles()  # Create roles for trendit3
-        populate_task_options(clear=True)
+    # Default data (roles, task options) is seeded once per deploy with `flask seed`, not on every boot
     
     return flask_app, celery
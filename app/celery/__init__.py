@@ -29,6 +29,16 @@ def make_celery(flask_app: Flask) -> Celery:
 
     celery.Task = ContextTask
     
+    celery.conf.beat_schedule = {
+        "rebuild-leaderboards": {
+            "task": "app.celery.jobs.tasks.rebuild_leaderboards",
+            "schedule": Config.LEADERBOARD_REBUILD_INTERVAL,
+        },
+    }
+    
+    from app.metrics import init_celery_metrics
+    init_celery_metrics(flask_app)
+    
     # Import all tasks to ensure they are registered with Celery
     from app.celery.jobs import tasks
     
@@ -2,39 +2,107 @@ from datetime import datetime, timedelta
 from celery import shared_task
 from flask import current_app
 
+from config import Config
 
 from ...extensions import db
 from ...models import TaskPerformance
 from ...utils.helpers.loggers import console_log, log_exception
-from ...utils.helpers.media_helpers import save_media
+from ...utils.helpers.media_helpers import process_staged_media, discard_staged_media
 
 
-@shared_task(bind=True)
-def save_task_media_files(self, task_id_key: str | int, media_file_paths):
+@shared_task(bind=True, max_retries=Config.MEDIA_UPLOAD_MAX_RETRIES)
+def upload_staged_media(self, target: str, target_id: int, staged_media: list[dict]):
+    """Uploads staged media files and attaches them to their target, retrying with backoff."""
+    try:
+        failed = process_staged_media(target, target_id, staged_media)
+    except Exception as e:
+        log_exception(f"an exception occurred uploading staged media for {target} {target_id}", e)
+        failed = staged_media
+    finally:
+        db.session.close()
+    
+    if not failed:
+        return
+    
+    if self.request.retries >= self.max_retries:
+        log_exception(f"giving up on staged media for {target} {target_id}", [staged["location"] for staged in failed])
+        discard_staged_media(failed)
+        return
+    
+    # Uploaded files are removed from staging, so a retry only picks up what is left
+    raise self.retry(args=(target, target_id, failed), countdown=2 ** self.request.retries * 5)
+
+
+@shared_task(bind=True, max_retries=5)
+def complete_referral_payment(self, user_id: int):
+    """Completes a referral and rewards the referrer after the attempt made with the payment failed."""
+    from ...utils.helpers.referral_helpers import complete_referral
+    try:
+        complete_referral(user_id)
+    except Exception as e:
+        db.session.rollback()
+        log_exception(f"an exception occurred completing the referral of user {user_id}", e)
+        raise self.retry(countdown=2 ** self.request.retries * 30)
+    finally:
+        db.session.close()
+
+
+@shared_task(bind=True, max_retries=10)
+def flush_telegram_outbox(self):
+    """Sends the queued Telegram admin notifications, coalescing bursts into digests."""
+    from ...utils.helpers.telegram_bot import flush_telegram_outbox_messages
     try:
-        with current_app.app_context():
-            console_log("celery saving media", f"starting... {media_file_paths}")
-            from ...utils.helpers.task_helpers import fetch_task
-            task = fetch_task(task_id_key)
-            
-            if task:
-                #save media files
-                if media_file_paths:
-                    for media_file_path in media_file_paths:
-                        with open(media_file_path, 'rb') as media_file:
-                            console_log("media_file", media_file)
-                            media = save_media(media_file)
-                            console_log("media saved", media)
-                            task.media.append(media)
-                elif not media_file_paths and task:
-                    task.media = task.media
-            
-                db.session.commit()
-                console_log("end of celery task...", "...")
+        sent = flush_telegram_outbox_messages()
     except Exception as e:
-        log_exception("an exception occurred saving task media", e)
         db.session.rollback()
-        raise e
+        log_exception("an exception occurred flushing the telegram outbox", e)
+        # The failed batch stays in the processing list, and is dead-lettered if it keeps failing
+        raise self.retry(countdown=Config.TELEGRAM_DIGEST_WINDOW)
+    finally:
+        db.session.close()
+    
+    if sent is None:
+        # Another flush is running, try again once it has had time to finish
+        raise self.retry(countdown=Config.TELEGRAM_DIGEST_WINDOW)
+    console_log("telegram outbox flushed", f"{sent} messages sent")
+
+
+@shared_task(bind=True, max_retries=5)
+def flush_item_counters(self):
+    """Writes the pending item views, likes and shares to the database in batches."""
+    from ...utils.helpers.item_counter_helpers import flush_item_counters as flush_counters
+    try:
+        flush_counters()
+    except Exception as e:
+        db.session.rollback()
+        log_exception("an exception occurred flushing item counters", e)
+        # Batches that failed stay in redis, so a retry picks them up again
+        raise self.retry(countdown=Config.ITEM_COUNTER_FLUSH_INTERVAL)
+    finally:
+        db.session.close()
+
+
+@shared_task(bind=True)
+def send_social_profile_review_emails(self, profile_ids: list[int]):
+    """Emails the owners of a batch of reviewed social profiles."""
+    from ...utils.helpers.mail_helpers import send_social_profile_review_emails as send_review_emails
+    try:
+        sent = send_review_emails(profile_ids)
+        console_log("social profile review emails", f"{sent} of {len(profile_ids)} sent")
+    except Exception as e:
+        log_exception("an exception occurred sending social profile review emails", e)
+    finally:
+        db.session.close()
+
+
+@shared_task(bind=True)
+def rebuild_leaderboards(self):
+    """Recomputes the earner and advertiser leaderboards from the database."""
+    from ...utils.helpers.leaderboard_helpers import rebuild_leaderboards as rebuild
+    try:
+        rebuild()
+    except Exception as e:
+        log_exception("an exception occurred rebuilding the leaderboards", e)
     finally:
         db.session.close()
 
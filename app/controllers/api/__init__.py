@@ -17,6 +17,7 @@ from .task import TaskController
 from .task_performance import TaskPerformanceController
 from .profile import ProfileController
 from .referral import ReferralController
+from .leaderboard import LeaderboardController
 from .location import LocationController
 from .stats import StatsController
 from .notification import NotificationController
@@ -8,11 +8,10 @@ It includes methods for checking username, checking email, signing up, resending
 @package: Trendit³
 '''
 
-import logging, json
+import logging, json, secrets
 from datetime import timedelta
 from flask import request, make_response, current_app
 from sqlalchemy.exc import ( IntegrityError, DataError, DatabaseError, InvalidRequestError )
-from werkzeug.security import generate_password_hash
 from werkzeug.exceptions import UnsupportedMediaType
 from flask_jwt_extended import create_access_token, decode_token, get_jwt_identity
 from flask_jwt_extended.exceptions import JWTDecodeError
@@ -25,10 +24,16 @@ from config import config_class
 from ...extensions import db
 from ...models import Role, RoleNames, TempUser, Trendit3User, Address, Profile, ReferralHistory, Membership, Wallet, UserSettings, SocialLinks
 from ...models.social import social_media_platforms
+from ...exceptions import OTPError
 from ...utils.helpers.loggers import console_log, log_exception
 from ...utils.helpers.response_helpers import error_response, success_response
-from ...utils.helpers.auth_helpers import generate_six_digit_code, save_pwd_reset_token, send_2fa_code
+from ...utils.helpers.auth_helpers import send_2fa_code
+from ...utils.helpers.otp_helpers import OTPPurpose, issue_otp, verify_otp
+from ...utils.helpers.password_helpers import hash_password
 from ...utils.helpers.user_helpers import is_user_exist, get_trendit3_user, referral_code_exists
+from ...utils.helpers.referral_helpers import record_referral_invite, record_referral_signup
+from ...utils.helpers.principal_helpers import invalidate_user_roles
+from ...utils.helpers.user_data_helpers import get_user_data, get_requested_level
 from ...utils.helpers.mail_helpers import send_other_emails, send_code_to_email, send_url_to_email
 
 class AuthController:
@@ -54,8 +59,13 @@ class AuthController:
             if referral_code and not Trendit3User.query.filter_by(username=referral_code).first():
                 return error_response("Referral code is invalid", 404)
             
+            if referral_code:
+                referrer = get_trendit3_user(referral_code)
+                if not referrer.is_membership_paid:
+                    return error_response("invalid referral url", 400)
+            
             # Generate a random six-digit number
-            verification_code = generate_six_digit_code()
+            verification_code = issue_otp(OTPPurpose.SIGNUP, email)
             
             try:
                 send_code_to_email(email, verification_code) # send verification code to user's email
@@ -63,22 +73,17 @@ class AuthController:
                 logging.exception(f"Error sending Email: {str(e)}")
                 return error_response(f"An error occurred while sending the verification email: {str(e)}", 500)
             
-            # Create a JWT that includes the user's email and the verification code
+            # Create a JWT that includes the user's email. The code itself is kept in the OTP store.
             expires = timedelta(minutes=30)
-            identity = {
-                "email": email,
-                "verification_code": verification_code
-            }
+            identity = {"email": email}
             if referral_code:
-                referrer = get_trendit3_user(referral_code)
-                if not referrer.is_membership_paid:
-                    return error_response("invalid referral url", 400)
-                
                 identity["referral_code"] = referral_code
             
             signup_token = create_access_token(identity=identity, expires_delta=expires, additional_claims={"type": "signup"})
             extra_data = {"signup_token": signup_token}
             api_response = success_response("Verification code sent successfully", 200, extra_data)
+        except OTPError as e:
+            api_response = error_response(e.message, e.status_code)
         except Exception as e:
             db.session.rollback()
             logging.exception(f"An exception occurred during registration. {e}") # Log the error details for debugging
@@ -103,8 +108,7 @@ class AuthController:
             if not email:
                 raise ValueError("Token is invalid or has been tampered with")
             
-            if int(entered_code) != int(user_info["verification_code"]):
-                return error_response("Verification code is incorrect", 400)
+            verify_otp(OTPPurpose.SIGNUP, email, entered_code)
             
             # The entered code matches the one in the JWT, so create temporary user (TempUser)
             
@@ -125,6 +129,7 @@ class AuthController:
             if referral_code:
                 referrer = get_trendit3_user(referral_code)
                 new_user.referrer_id = referrer.id
+                record_referral_invite(new_user)
                 db.session.commit()
             
             
@@ -138,6 +143,8 @@ class AuthController:
         except DecodeError as e:
             log_exception('JWT Decode Error', e)
             return error_response('Signup token invalid or corrupted. Make sure you are sending it correctly.', 401)
+        except OTPError as e:
+            return error_response(e.message, e.status_code)
         except ValueError as e:
             log_exception("", e)
             return error_response(f"{e}", 400)
@@ -171,9 +178,8 @@ class AuthController:
             email = user_info['email']
             
             # Generate a random six-digit number
-            new_verification_code = generate_six_digit_code()
-            
-            user_info.update({'verification_code': new_verification_code})
+            new_verification_code = issue_otp(OTPPurpose.SIGNUP, email)
+            user_info.pop('verification_code', None) # tokens issued before codes moved to the OTP store
             
             try:
                 send_code_to_email(email, new_verification_code) # send verification code to user's email
@@ -195,6 +201,10 @@ class AuthController:
             msg = f"The Signup token has expired or corrupted. Please try signing up again."
             status_code = 401
             logging.exception(f"JWT Decode Error: {e}")
+        except OTPError as e:
+            error = True
+            msg = e.message
+            status_code = e.status_code
         except Exception as e:
             error = True
             status_code = 500
@@ -233,7 +243,7 @@ class AuthController:
                 return {"error": "A required field is not provided."}, 400
             
             email = user.email
-            hashed_pwd = generate_password_hash(password, "pbkdf2:sha256")
+            hashed_pwd = hash_password(password)
             
             new_user = Trendit3User(email=email, username=username, thePassword=hashed_pwd)
             new_user_profile = Profile(trendit3_user=new_user, firstname=firstname, lastname=lastname)
@@ -257,13 +267,7 @@ class AuthController:
                 new_user_social_links
             ])
             
-            if user.referrer_id:
-                referrer = user.referrer
-                referral_history = ReferralHistory.create_referral_history(email=email, username=username, status="pending", trendit3_user=referrer, date_joined=new_user.date_joined)
-            
-            referral = ReferralHistory.query.filter_by(email=email).first()
-            if referral:
-                referral.update(username=username, status='registered', date_joined=new_user.date_joined)
+            record_referral_signup(new_user, referrer=user.referrer)
             
             db.session.delete(user)
             db.session.commit()
@@ -349,21 +353,21 @@ class AuthController:
             }
             if not user_settings or not two_factor_method:
                 access_token = create_access_token(identity=user.id, expires_delta=timedelta(minutes=131400), additional_claims={'type': 'access'})
-                user_data = user.to_dict()
+                level, sections = get_requested_level()
+                user_data = get_user_data(user, level, sections)
                 extra_data = {'access_token':access_token, 'user_data':user_data}
                 msg = 'Logged in successfully'
             elif user_security_setting and two_factor_method.lower() in ['email', 'phone']:
                 # Generate 2FA code and send it to the user
-                two_FA_code = generate_six_digit_code()
+                two_FA_code = issue_otp(OTPPurpose.TWO_FA, user.id)
                 
                 try:
                     send_2fa_code(user, two_factor_method.lower(), two_FA_code)
                 except Exception as e:
                     return error_response(f'An error occurred sending the 2FA code', 500)
                 
-                # Create a JWT that includes the user's info and the 2FA code
+                # Create a JWT that includes the user's info. The code itself is kept in the OTP store.
                 expires = timedelta(minutes=15)
-                identity.update({'two_fa_code': two_FA_code})
                 two_FA_token = create_access_token(identity=identity, expires_delta=expires, additional_claims={'type': 'two_fa'})
                 extra_data = { 'two_fa_token': two_FA_token }
                 msg = '2 Factor Authentication code sent successfully'
@@ -378,6 +382,8 @@ class AuthController:
         except UnsupportedMediaType as e:
             logging.exception(f"An UnsupportedMediaType exception occurred: {e}")
             api_response = success_response(f"{str(e)}", 415)
+        except OTPError as e:
+            api_response = error_response(e.message, e.status_code)
         except Exception as e:
             logging.exception(f"An exception occurred trying to login: {e}")
             api_response = error_response('An unexpected error. Our developers are already looking into it.', 500)
@@ -420,9 +426,10 @@ class AuthController:
                 return error_response('2 Factor Authentication not set', 400)
             
             elif two_factor_method.lower() in ['email', 'phone']:
-                # Check if the entered code matches the one in the JWT
-                if int(entered_code) != int(token_data['two_fa_code']):
-                    return error_response('The wrong 2FA Code was provided. Please check your mail for the correct code and try again.', 400)
+                try:
+                    verify_otp(OTPPurpose.TWO_FA, user.id, entered_code)
+                except OTPError as e:
+                    return error_response(e.message if e.status_code != 400 else 'The wrong 2FA Code was provided. Please check your mail for the correct code and try again.', e.status_code)
             
             elif two_factor_method.lower() == 'google_auth_app':
                 secret_key = user.two_fa_secret
@@ -435,7 +442,8 @@ class AuthController:
             # 2FA token is valid, log user in.
             # User authentication successful
             access_token = create_access_token(identity=user.id, expires_delta=timedelta(minutes=131400), additional_claims={'type': 'access'})
-            user_data = user.to_dict()
+            level, sections = get_requested_level()
+            user_data = get_user_data(user, level, sections)
             extra_data = {'access_token':access_token, 'user_data':user_data}
             
             api_response = success_response('User logged in successfully', 200, extra_data)
@@ -454,8 +462,38 @@ class AuthController:
         try:
             data = request.get_json()
             two_FA_token = data.get('two_fa_token')
+            
+            try:
+                token_data = decode_token(two_FA_token)['sub']
+            except ExpiredSignatureError as e:
+                log_exception("The 2FA token has expired.", e)
+                return error_response("The 2FA session has expired. Please log in again.", 401)
+            
+            two_factor_method = (token_data.get('two_factor_method') or '').lower()
+            if two_factor_method not in ['email', 'phone']:
+                return error_response('A new code can only be sent for email or phone 2FA', 400)
+            
+            user = get_trendit3_user(token_data['username'])
+            if not user:
+                return error_response('user not found', 404)
+            
+            two_FA_code = issue_otp(OTPPurpose.TWO_FA, user.id)
+            send_2fa_code(user, two_factor_method, two_FA_code)
+            
+            # The code isn't in the token, so the client keeps using the same one
+            api_response = success_response('2 Factor Authentication code sent successfully', 200, {'two_fa_token': two_FA_token})
+        except OTPError as e:
+            api_response = error_response(e.message, e.status_code)
+        except (JWTDecodeError, DecodeError) as e:
+            log_exception("An Exception occurred decoding the 2FA token", e)
+            api_response = error_response('2FA token invalid or corrupted. Please log in again.', 401)
         except Exception as e:
-            pass
+            log_exception("An exception occurred resending the 2FA code", e)
+            api_response = error_response('An unexpected error. Our developers are already looking into it.', 500)
+        finally:
+            db.session.close()
+        
+        return api_response
 
     @staticmethod
     def forgot_password():
@@ -470,12 +508,14 @@ class AuthController:
             if not user:
                 return error_response('No account with that username or email exists.', 404)
             
-            # Generate a password reset token
+            # Generate a password reset token. The nonce makes the link single use.
+            reset_nonce = issue_otp(OTPPurpose.PWD_RESET, user.id, code=secrets.token_urlsafe(16))
             expires = timedelta(minutes=15)
             reset_token = create_access_token(identity={
                 'user_id': user.id,
                 'username': user.username,
-                'email': user.email
+                'email': user.email,
+                'reset_nonce': reset_nonce
             }, expires_delta=expires, additional_claims={'type': 'reset-pwd', "reset": True})
             
             console_log("base app url", config_class.APP_DOMAIN_NAME)
@@ -490,6 +530,8 @@ class AuthController:
             extra_data = { 'email': user.email, }
             api_response = success_response('An email with instructions to reset your password has been sent.', 200, extra_data)
             
+        except OTPError as e:
+            api_response = error_response(e.message, e.status_code)
         except Exception as e:
             log_exception(f"An exception occurred processing the request", e)
             api_response = error_response('An unexpected error. Our developers are already looking into it.', 500)
@@ -506,7 +548,7 @@ class AuthController:
             data = request.get_json()
             reset_token = data.get('reset_token', '')
             new_password = data.get('new_password')
-            hashed_pwd = generate_password_hash(new_password, "pbkdf2:sha256")
+            hashed_pwd = hash_password(new_password)
             
             console_log('reset token', reset_token)
             try:
@@ -527,6 +569,11 @@ class AuthController:
                 return error_response(f"Invalid or expired reset URL", 401)
             
             
+            try:
+                verify_otp(OTPPurpose.PWD_RESET, token_data['user_id'], token_data.get('reset_nonce'))
+            except OTPError:
+                return error_response("This reset URL has expired or has already been used. Please request a new one.", 401)
+            
             # Reset token is valid, update user password
             # get user from db with the email.
             user = get_trendit3_user(token_data['email'])
@@ -679,6 +726,7 @@ class AuthController:
                     current_user.roles.append(role)
             
             db.session.commit()
+            invalidate_user_roles(current_user_id)
             return success_response("User type updated successfully", 200)
         except Exception as e:
             db.session.rollback()
@@ -4,7 +4,8 @@ from flask_jwt_extended import get_jwt_identity
 
 from config import Config
 from app.models.item import Item
-from app.utils.helpers.item_helpers import save_item, fetch_item
+from app.utils.helpers.item_helpers import save_item, fetch_item, serialize_items, ITEM_LISTING_OPTIONS
+from app.utils.helpers.item_search_helpers import InvalidSearchError, parse_search_args, search_items, get_facets
 from app.utils.helpers.payment_helpers import is_paid
 from app.utils.helpers.response_helpers import error_response, success_response
 
@@ -17,10 +18,10 @@ class ItemController:
             page = request.args.get("page", 1, type=int)
             items_per_page = request.args.get("per_page", 10, type=int)
             
-            pagination = Item.query.order_by(Item.created_at.desc()).paginate(page=page, per_page=items_per_page, error_out=False)
+            pagination = Item.query.options(*ITEM_LISTING_OPTIONS).order_by(Item.created_at.desc()).paginate(page=page, per_page=items_per_page, error_out=False)
             
             items = pagination.items
-            current_items = [item.to_dict() for item in items]
+            current_items = serialize_items(items)
             extra_data = {
                 "total": pagination.total,
                 "all_items": current_items,
@@ -124,6 +125,28 @@ class ItemController:
             return success_response(msg, status_code, extra_data)
 
 
+    @staticmethod
+    def search_items():
+        try:
+            params = parse_search_args(request.args)
+            items, next_cursor = search_items(params)
+            
+            extra_data = {
+                "all_items": serialize_items(items),
+                "next_cursor": next_cursor,
+            }
+            if params["facets"] and not params["cursor"]:
+                # Facets don't change between pages, so they are only computed for the first one
+                extra_data["facets"] = get_facets(params)
+        except InvalidSearchError as e:
+            return error_response(str(e), 400)
+        except Exception as e:
+            logging.exception(f"An exception occurred during searching Items.\n{str(e)}")
+            return error_response("Error searching Products & Services", 500)
+        
+        return success_response('Products & Services fetched successfully', 200, extra_data)
+
+
     @staticmethod
     def get_single_item(item_id_slug):
         error = False
@@ -139,7 +162,8 @@ class ItemController:
         if error:
             return error_response(msg, status_code)
         else:
-            return success_response(f'{item.item_type} fetched successfully', 200, {"item": item.to_dict()})
+            item_data = serialize_items([item])[0]
+            return success_response(f'{item.item_type} fetched successfully', 200, {"item": item_data})
 
 
     @staticmethod
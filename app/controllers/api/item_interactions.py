@@ -2,9 +2,9 @@ import logging
 from flask import request, jsonify
 from flask_jwt_extended import get_jwt_identity
 
-from app.extensions import db
-from app.models.item import LikeLog, Share, Comment
 from app.utils.helpers.item_helpers import fetch_item
+from app.utils.helpers.item_counter_helpers import record_view, record_like, record_share
+from app.utils.helpers.comment_helpers import COMMENTS_PER_PAGE, get_comments_page, add_item_comment
 from app.utils.helpers.response_helpers import error_response, success_response
 
 
@@ -20,13 +20,8 @@ class ItemInteractionsController:
             
             item_id = item.id
             
-            like = LikeLog.query.filter_by(user_id=user_id, item_id=item_id).first()
-            if like:
+            if not record_like(item_id, int(user_id)):
                 return success_response(f"You have already liked this {item.item_type}", 200)
-            
-            new_like = LikeLog(user_id=user_id, item_id=item_id)
-            db.session.add(new_like)
-            db.session.commit()
         except Exception as e:
             error = True
             status_code = 500
@@ -49,7 +44,6 @@ class ItemInteractionsController:
         try:
             user_id = get_jwt_identity()
             item = fetch_item(item_id_slug)
-            item_id = item.id
             
             if item is None:
                 return jsonify({
@@ -58,17 +52,14 @@ class ItemInteractionsController:
                     "message": "Item not found"
                 }), 404
             
-            share = Share.query.filter_by(user_id=user_id, item_id=item_id).first()
-            if share:
+            item_id = item.id
+            
+            if not record_share(item_id, int(user_id)):
                 return jsonify({
                     "status": "failed",
                     "status_code": 400,
                     "message": "You have already shared this item"
                 }), 400
-            
-            new_share = Share(user_id=user_id, item_id=item_id)
-            db.session.add(new_share)
-            db.session.commit()
         except Exception as e:
             error = True
             status_code = 500
@@ -103,13 +94,8 @@ class ItemInteractionsController:
             
             item_id = item.id
             
-            # Check if views_count is None or not defined
-            if item.views_count is None:
-                item.views_count = 1
-            else:
-                item.views_count += 1
-            
-            db.session.commit()
+            # Counted in redis and flushed to the database in batches
+            record_view(item_id)
         except Exception as e:
             error = True
             status_code = 500
@@ -152,9 +138,7 @@ class ItemInteractionsController:
                 return error_response("Comment not provided", 400)
             
                 
-            new_comment = Comment(user_id=user_id, item_id=item_id, text=comment)
-            db.session.add(new_comment)
-            db.session.commit()
+            new_comment = add_item_comment(item, user_id, comment)
             extra_data = {'comment_details': new_comment.to_dict()}
         except Exception as e:
             error = True
@@ -167,3 +151,21 @@ class ItemInteractionsController:
         else:
             return success_response("Comment added successfully", 200, extra_data)
 
+
+    @staticmethod
+    def get_comments(item_id_slug):
+        try:
+            item = fetch_item(item_id_slug)
+            if item is None:
+                return error_response("Item not found", 404)
+            
+            cursor = request.args.get("cursor")
+            per_page = request.args.get("per_page", COMMENTS_PER_PAGE, type=int)
+            extra_data = get_comments_page(item, cursor=cursor, per_page=per_page)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        except Exception as e:
+            logging.exception(f"An exception occurred fetching comments of Item {item_id_slug}.\n{str(e)}")
+            return error_response("Error fetching comments", 500)
+        
+        return success_response("Comments fetched successfully", 200, extra_data)
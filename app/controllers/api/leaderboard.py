@@ -0,0 +1,40 @@
+from flask import request
+from flask_jwt_extended import get_jwt_identity
+from redis.exceptions import RedisError
+
+from ...utils.helpers.loggers import log_exception
+from ...utils.helpers.response_helpers import error_response, success_response
+from ...utils.helpers.leaderboard_helpers import BOARDS, PERIODS, get_leaderboard, get_user_rank
+
+
+class LeaderboardController:
+    
+    @staticmethod
+    def get_leaderboard(board):
+        try:
+            period = request.args.get("period", "weekly")
+            platform = request.args.get("platform")
+            limit = request.args.get("limit", 10, type=int)
+            
+            if board not in BOARDS:
+                return error_response(f"board must be one of: {', '.join(BOARDS)}", 400)
+            if period not in PERIODS:
+                return error_response(f"period must be one of: {', '.join(PERIODS)}", 400)
+            
+            current_user_id = int(get_jwt_identity())
+            extra_data = {
+                "board": board,
+                "period": period,
+                "platform": platform or "all",
+                "leaderboard": get_leaderboard(board, period, platform, limit),
+                "me": get_user_rank(board, period, current_user_id, platform),
+            }
+            api_response = success_response('Leaderboard fetched successfully', 200, extra_data)
+        except RedisError as e:
+            log_exception("Could not read the leaderboard from redis", e)
+            api_response = error_response('Leaderboards are unavailable right now. Please try again later.', 503)
+        except Exception as e:
+            log_exception("An exception occurred getting the leaderboard", e)
+            api_response = error_response('An unexpected error. Our developers are already looking into it.', 500)
+        
+        return api_response
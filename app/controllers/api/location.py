@@ -5,6 +5,7 @@ from config import Config
 from ...utils import AppJSON
 from ...utils.helpers.loggers import console_log, log_exception
 from ...utils.helpers.response_helpers import error_response, success_response
+from ...utils.helpers.location_helpers import get_naija_states_lga
 
 from ...utils.payments.flutterwave import fetch_supported_countries
 
@@ -117,6 +118,16 @@ class LocationController:
             return success_response(msg, status_code)
     
     
+    @staticmethod
+    def get_all_naija_states_lga():
+        try:
+            api_response = get_naija_states_lga()
+        except Exception as e:
+            log_exception("An exception occurred getting the states and local governments", e)
+            api_response = error_response('An error occurred while processing the request.', 500)
+        
+        return api_response
+    
     @staticmethod
     def get_naija_state_lga():
         try:
@@ -9,7 +9,7 @@ from ...models import Notification, NotificationType
 from ...models.user import Trendit3User
 
 from ...utils.helpers.loggers import console_log, log_exception
-from ...utils.helpers.user_helpers import get_notifications, mark_as_read
+from ...utils.helpers.user_helpers import get_notifications, mark_as_read, search_notifications
 from ...utils.helpers.response_helpers import *
 
 class NotificationController:
@@ -229,16 +229,24 @@ class NotificationController:
     def global_search():
 
         try:
-            # user_id = int(get_jwt_identity())
-            data = request.get_json()
-            query = data["query"]
+            current_user_id = int(get_jwt_identity())
+            data = request.get_json() or {}
+            query = str(data.get("query", "")).strip()
+            page = request.args.get("page", 1, type=int)
+            per_page = request.args.get("per_page", 10, type=int)
 
             if not query:
                 return error_response('No search query', 400)
             
-            results = Notification.query.filter(Notification.notification_type == NotificationType.ACTIVITY).filter(Notification.body.ilike(f'%{query}%')).all()
+            pagination = search_notifications(current_user_id, query, page, per_page)
             
-            extra_data = {"search_result": [result.to_dict() for result in results]}
+            results: list[Notification] = pagination.items
+            extra_data = {
+                'total': pagination.total,
+                "current_page": pagination.page,
+                "total_pages": pagination.pages,
+                "search_result": [result.to_dict() for result in results],
+            }
 
             return success_response("Search successful", 200, extra_data)
         
@@ -248,6 +256,3 @@ class NotificationController:
             logging.exception(f"An exception occurred trying to fetch search results: ==>", str(e))
 
             return error_response(msg, status_code)
-        
-    
-    
\ No newline at end of file
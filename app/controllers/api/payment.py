@@ -339,17 +339,12 @@ class PaymentController:
     @staticmethod
     def withdraw_approval_webhook():
         try:
-            data = request.get_json()
-            console_log('DATA', data)
-            data = json.loads(request.data) # Get the data from the request
+            data = request.get_json() # Get the data from the request
             console_log('DATA', data)
             
             secret_hash = Config.FLW_SECRET_HASH
             signature = request.headers.get('verif-hash') # Get the signature from the request headers
             
-            console_log('secret_hash', secret_hash)
-            console_log('signature', signature)
-            
             if signature == None or (signature != secret_hash):
                 # This request isn't from Flutterwave; discard
                 raise SignatureError(f'No signature in headers')
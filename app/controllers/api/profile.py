@@ -11,9 +11,12 @@ from ...models import Trendit3User, Profile, BankAccount, Wallet
 from ...utils.helpers.location_helpers import get_currency_info
 from ...utils.helpers.loggers import console_log, log_exception
 from ...utils.helpers.user_helpers import get_user_info
+from ...utils.helpers.user_data_helpers import get_user_data
 from ...utils.helpers.media_helpers import save_media
 from ...utils.helpers.user_helpers import is_username_exist, is_email_exist, save_profile_pic
-from ...utils.helpers.auth_helpers import send_code_to_email, generate_six_digit_code
+from ...utils.helpers.auth_helpers import send_code_to_email
+from ...utils.helpers.otp_helpers import OTPPurpose, issue_otp, verify_otp
+from ...exceptions import OTPError
 from ...utils.helpers.bank_helpers import get_bank_code
 from ...utils.helpers.response_helpers import *
 
@@ -23,12 +26,10 @@ class ProfileController:
         
         try:
             current_user_id = get_jwt_identity()
-            user: Trendit3User = Trendit3User.query.get(current_user_id)
-            
-            if not user:
+            try:
+                user_info = get_user_data(int(current_user_id))
+            except ValueError:
                 return error_response("user not found", 400)
-            
-            user_info = user.to_dict()
     
             for key in user_info:
                 if user_info[key] is None:
@@ -98,7 +99,7 @@ class ProfileController:
             user_address.update(country=country, state=state, local_government=local_government)
             
             
-            extra_data={'user_data': current_user.to_dict()}
+            extra_data={'user_data': get_user_data(current_user)}
             api_response = success_response('User profile updated successfully', 200, extra_data)
             
         except (DataError, DatabaseError) as e:
@@ -170,7 +171,7 @@ class ProfileController:
             user_address.update(country=country, state=state, local_government=local_government)
             
             
-            extra_data={'user_data': current_user.to_dict()}
+            extra_data={'user_data': get_user_data(current_user)}
             api_response = success_response('User profile updated successfully', 200, extra_data)
             
         except (DataError, DatabaseError) as e:
@@ -195,30 +196,35 @@ class ProfileController:
             data = request.get_json()
             new_email = data.get('new_email')
             
+            if not new_email:
+                return error_response("new_email is required", 400)
+            
             if new_email == current_user.email:
                 return error_response("email provided isn't a new email", 406)
             
             if is_email_exist(new_email, current_user):
                 return error_response("Email already Taken", 409)
                 
-            verification_code = generate_six_digit_code() # Generate a random six-digit number
+            # Bound to the new email, so a code sent to one address can't confirm a change to another
+            verification_code = issue_otp(OTPPurpose.EMAIL_CHANGE, current_user.id, bound_to=new_email.lower())
             
             try:
                 send_code_to_email(new_email, verification_code) # send verification code to user's email
             except Exception as e:
                 return error_response(f'An error occurred while sending the verification email: {str(e)}', 500)
             
-            # Create a JWT that includes the user's info and the verification code
+            # Create a JWT that includes the user's info. The code itself is kept in the OTP store.
             expires = timedelta(minutes=30)
             edit_email_token = create_access_token(identity={
                 'new_email': new_email,
-                'user_id': get_jwt_identity(),
-                'verification_code': verification_code
+                'user_id': get_jwt_identity()
             }, expires_delta=expires)
             
             extra_data = {'edit_email_token': edit_email_token}
             api_response = success_response("Verification code sent successfully", 200, extra_data)
         
+        except OTPError as e:
+            api_response = error_response(e.message, e.status_code)
         except Exception as e:
             log_exception("An exception occurred changing the email.", e)
             api_response = error_response("An unexpected error occurred. Our developers are already looking into it.", 500)
@@ -240,13 +246,17 @@ class ProfileController:
             
             current_user = Trendit3User.query.get(get_jwt_identity())
             
-            if int(entered_code) == int(user_info['verification_code']):
-                current_user.email = new_email
-                db.session.commit()
-                extra_data = {'user_email': current_user.email}
-                api_response = success_response("Email updated successfully", 201, extra_data)
-            else:
-                api_response = error_response("Verification code is incorrect", 400)
+            if str(user_info['user_id']) != str(current_user.id):
+                return error_response("This verification code wasn't issued to you", 403)
+            
+            verify_otp(OTPPurpose.EMAIL_CHANGE, current_user.id, entered_code, bound_to=new_email.lower())
+            
+            current_user.email = new_email
+            db.session.commit()
+            extra_data = {'user_email': current_user.email}
+            api_response = success_response("Email updated successfully", 201, extra_data)
+        except OTPError as e:
+            api_response = error_response(e.message if e.status_code != 400 else "Verification code is incorrect", e.status_code)
         except (DataError, DatabaseError) as e:
             db.session.rollback()
             api_response = error_response('Error interacting to the database.', 500)
@@ -6,6 +6,7 @@ from app.extensions import db
 from app.models.user import Trendit3User, Profile, ReferralHistory
 from ...utils.helpers.loggers import console_log, log_exception
 from app.utils.helpers.user_helpers import generate_referral_code
+from app.utils.helpers.referral_helpers import get_referral_stats, get_downline_counts, get_top_referrers
 from app.utils.helpers.response_helpers import *
 
 
@@ -78,4 +79,36 @@ class ReferralController:
         if error:
             return error_response(msg, status_code)
         else:
-            return success_response(msg, status_code, extra_data)
\ No newline at end of file
+            return success_response(msg, status_code, extra_data)
+    
+    
+    @staticmethod
+    def get_referral_stats():
+        try:
+            current_user_id = int(get_jwt_identity())
+            levels = request.args.get("levels", 3, type=int)
+            
+            extra_data = {
+                "referral_stats": get_referral_stats(current_user_id),
+                "referrals_per_level": get_downline_counts(current_user_id, levels),
+            }
+            api_response = success_response('Referral stats fetched successfully', 200, extra_data)
+        except Exception as e:
+            log_exception("An exception occurred getting referral stats", e)
+            api_response = error_response('Error getting referral stats', 500)
+        
+        return api_response
+    
+    
+    @staticmethod
+    def get_top_referrers():
+        try:
+            limit = min(request.args.get("limit", 10, type=int), 50)
+            
+            extra_data = {"top_referrers": get_top_referrers(limit)}
+            api_response = success_response('Top referrers fetched successfully', 200, extra_data)
+        except Exception as e:
+            log_exception("An exception occurred getting top referrers", e)
+            api_response = error_response('Error getting top referrers', 500)
+        
+        return api_response
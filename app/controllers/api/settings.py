@@ -10,7 +10,6 @@ import logging, hashlib, pyotp
 from flask import request
 from sqlalchemy.exc import ( DataError, DatabaseError )
 from flask_jwt_extended import get_jwt_identity
-from werkzeug.security import generate_password_hash
 from werkzeug.exceptions import UnsupportedMediaType
 
 from ...extensions import db
@@ -19,6 +18,7 @@ from ...exceptions import InvalidTwoFactorMethod
 from ...utils.helpers.loggers import console_log, log_exception
 from ...utils.helpers.settings_helpers import set_2fa_method, generate_google_authenticator_secret_key, generate_google_authenticator_qr_code
 from ...utils.helpers.response_helpers import error_response, success_response
+from ...utils.helpers.password_helpers import hash_password
 from ...utils.helpers.settings_helpers import update_notification_preferences, update_user_preferences, update_user_security_settings
 
 
@@ -410,7 +410,7 @@ class ManageSettingsController:
             if not current_user.verify_password(old_password):
                 return error_response('Old Password is incorrect', 401)
             
-            hashed_pwd = generate_password_hash(new_password, "pbkdf2:sha256")
+            hashed_pwd = hash_password(new_password)
             current_user.update(thePassword=hashed_pwd)
             
             api_response = success_response("Password updated successfully", 200)
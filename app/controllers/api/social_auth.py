@@ -17,12 +17,13 @@ from ...models import Role, RoleNames, TempUser, Trendit3User, Address, Profile,
 from ...models.membership import Membership
 from ...models.payment import Wallet
 from ...utils.helpers.loggers import console_log, log_exception
-from ...utils.helpers.basic_helpers import generate_random_string
+from ...utils.helpers.basic_helpers import generate_random_string, save_with_unique_value
 from ...utils.helpers.response_helpers import error_response, success_response
 from ...utils.helpers.user_helpers import get_trendit3_user_by_google_id
 from ...utils.helpers.location_helpers import get_currency_info
-from ...utils.helpers.auth_helpers import generate_six_digit_code, send_code_to_email, save_pwd_reset_token
+from ...utils.helpers.auth_helpers import generate_six_digit_code, send_code_to_email
 from ...utils.helpers.user_helpers import is_user_exist, get_trendit3_user, referral_code_exists
+from ...utils.helpers.referral_helpers import record_referral_signup
 from ...utils.helpers.mail_helpers import send_other_emails, send_code_to_email
 
 
@@ -97,12 +98,7 @@ class SocialAuthController:
 
                 firstname = user_data.get('name', '').split()[0]
                 lastname = user_data.get('name', '').split()[1] if len(user_data.get('name', '').split()) > 1 else ''
-                username = generate_random_string(12)
-
-                while Trendit3User.query.filter_by(username=username).first():
-                    username = generate_random_string(12)
-
-                new_user = Trendit3User(email=email, username=username)
+                new_user = Trendit3User(email=email)
                 new_user_profile = Profile(trendit3_user=new_user, firstname=firstname, lastname=lastname)
                 new_user_address = Address(trendit3_user=new_user)
                 new_membership = Membership(trendit3_user=new_user)
@@ -112,14 +108,13 @@ class SocialAuthController:
                 if role:
                     new_user.roles.append(role)
 
-                db.session.add_all([new_user, new_user_profile, new_user_address, new_membership, new_user_wallet, new_user_setting])
-                db.session.commit()
+                # the profile, address, membership, wallet and settings are saved with the user
+                save_with_unique_value(new_user, "username", lambda attempt: generate_random_string(12))
 
                 user_data = new_user.to_dict()
 
-                referral = ReferralHistory.query.filter_by(email=email).first()
-                if referral:
-                    referral.update(username=username, status='registered', date_joined=new_user.date_joined)
+                record_referral_signup(new_user)
+                db.session.commit()
 
                 # Create access token
                 access_token = create_access_token(identity=new_user.id, expires_delta=timedelta(minutes=1440), additional_claims={'type': 'access'})
@@ -358,12 +353,7 @@ class SocialAuthController:
                 
                 firstname = user_google_data.get('given_name', '')
                 lastname = user_google_data.get('family_name', '')
-                username = f"{firstname}_{generate_random_string(2)}_{lastname}"
-
-                while (Trendit3User.query.filter_by(username=username).first()):
-                    username = generate_random_string(12)
-
-                new_user = Trendit3User(email=email, username=username)
+                new_user = Trendit3User(email=email)
                 new_user_profile = Profile(trendit3_user=new_user, firstname=firstname, lastname=lastname)
                 new_user_address = Address(trendit3_user=new_user)
                 new_membership = Membership(trendit3_user=new_user)
@@ -375,23 +365,16 @@ class SocialAuthController:
                 if role:
                     new_user.roles.append(role)
 
-                db.session.add_all([
-                    new_user,
-                    new_user_profile,
-                    new_user_address,
-                    new_membership,
-                    new_user_wallet,
-                    new_user_setting,
-                    new_user_social_links
-                ])
-                
-                db.session.commit()
+                # the profile, address, membership, wallet, settings and social links are saved with the user
+                save_with_unique_value(
+                    new_user, "username",
+                    lambda attempt: f"{firstname}_{generate_random_string(2)}_{lastname}" if attempt == 0 else generate_random_string(12)
+                )
 
                 user_data = new_user.to_dict()
             
-                referral = ReferralHistory.query.filter_by(email=email).first()
-                if referral:
-                    referral.update(username=username, status='registered', date_joined=new_user.date_joined)
+                record_referral_signup(new_user)
+                db.session.commit()
                 
                 # create access token.
                 access_token = create_access_token(identity=new_user.id, expires_delta=timedelta(minutes=131400), additional_claims={'type': 'access'})
@@ -639,12 +622,7 @@ class SocialAuthController:
                 # user_google_id = user_google_data['user_id']
                 firstname = user_google_data.get('given_name', '')
                 lastname = user_google_data.get('family_name', '')
-                username = generate_random_string(12)
-
-                while (Trendit3User.query.filter_by(username=username).first()):
-                    username = generate_random_string(12)
-
-                new_user = Trendit3User(email=email, username=username)
+                new_user = Trendit3User(email=email)
                 new_user_profile = Profile(trendit3_user=new_user, firstname=firstname, lastname=lastname)
                 new_user_address = Address(trendit3_user=new_user)
                 new_membership = Membership(trendit3_user=new_user)
@@ -655,16 +633,13 @@ class SocialAuthController:
                     new_user.roles.append(role)
 
                 
-                db.session.add_all([new_user, new_user_profile, new_user_address, new_membership, new_user_wallet, new_user_setting])
-                # db.session.delete(temp_user)
-                
-                db.session.commit()
+                # the profile, address, membership, wallet and settings are saved with the user
+                save_with_unique_value(new_user, "username", lambda attempt: generate_random_string(12))
 
                 user_data = new_user.to_dict()
             
-                referral = ReferralHistory.query.filter_by(email=email).first()
-                if referral:
-                    referral.update(username=username, status='registered', date_joined=new_user.date_joined)
+                record_referral_signup(new_user)
+                db.session.commit()
                 
                 # create access token.
                 access_token = create_access_token(identity=new_user.id, expires_delta=timedelta(minutes=1440), additional_claims={'type': 'access'})
@@ -92,6 +92,8 @@ class SocialProfileController:
             elif profile.status == SocialLinkStatus.REJECTED or profile.status == SocialLinkStatus.IDLE:
                 profile.link = link
                 profile.status = SocialLinkStatus.PENDING
+                profile.claimed_by_id = None
+                profile.claimed_until = None
             
             # Send verification notification
             SocialVerification.add_notification(
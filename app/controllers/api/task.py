@@ -1,4 +1,5 @@
 import logging
+from datetime import datetime
 from flask import request
 from flask_jwt_extended import get_jwt_identity
 from sqlalchemy.exc import ( DataError, DatabaseError, )
@@ -10,6 +11,7 @@ from ...utils.helpers.task_helpers import save_task, get_tasks_dict_grouped_by_f
 from ...utils.helpers.response_helpers import error_response, success_response
 from ...utils.helpers.loggers import console_log, log_exception
 from ...utils.helpers.telegram_bot import notify_telegram_admins_new_task
+from ...utils.helpers.leaderboard_helpers import record_task_spend
 from ...utils.payments.utils import initialize_payment
 from ...utils.payments.wallet import debit_wallet, credit_wallet
 from ...utils.mailing import send_task_order_review_email
@@ -381,11 +383,11 @@ class TaskController:
             
             status_val = "completed" if status == "accept" else "rejected"
             
-            performed_task.update(status=status_val)
+            performed_task.update(status=status_val, date_completed=datetime.utcnow() if status_val == "completed" else None)
             
             if status_val == "completed":
                 user_id = performed_task.user_id
-                credit_wallet(user_id, performed_task.reward_money)
+                credit_wallet(user_id, performed_task.reward_money, platform=performed_task.platform)
             
             extra_data = {"performed_task": performed_task.to_dict()}
             
@@ -752,7 +754,8 @@ class TaskController:
                     msg = f'Error creating new Task: {e}'
                     return error_response(msg, 400)
                 
-                new_task.update(payment_status=TaskPaymentStatus.COMPLETE)
+                new_task.mark_paid()
+                record_task_spend(new_task)
                 
                 msg = 'Task created successfully. Payment made using Trendit³ Wallet.'
                 new_task_dict = new_task.to_dict()
@@ -1,12 +1,12 @@
 from flask import request
 from sqlalchemy.exc import ( DataError, DatabaseError, )
-from flask_jwt_extended import get_jwt_identity
 
 from config import Config
 from ...extensions import db
-from ...models import TaskOption, Trendit3User
+from ...models import TaskOption
 from ...utils.helpers.response_helpers import error_response, success_response
 from ...utils.helpers.loggers import console_log, log_exception
+from ...utils.helpers.principal_helpers import get_current_principal
 
 
 class TaskOptionsController:
@@ -14,9 +14,7 @@ class TaskOptionsController:
     @staticmethod
     def get_task_options():
         try:
-            user_id = int(get_jwt_identity())
-
-            current_user = Trendit3User.query.filter_by(id=user_id).first()
+            current_user = get_current_principal()
             if not current_user:
                 return error_response("User not found", 404)
             
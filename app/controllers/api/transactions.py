@@ -1,20 +1,17 @@
 import os
 import io
-import pandas as pd
 import requests
 from sqlalchemy.exc import ( DataError, DatabaseError, InvalidRequestError, SQLAlchemyError )
 from flask import request, send_file
 from flask_jwt_extended import get_jwt_identity
 from datetime import datetime
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Image, Spacer
 from io import BytesIO
 
+from config import Config
 from ...models import Trendit3User, Payment, Transaction, TransactionType
 from ...utils.helpers.response_helpers import error_response, success_response
 from ...utils.helpers.loggers import console_log, log_exception
+from ...utils.helpers.db_helpers import statement_timeout
 from ...utils.helpers.payment_helpers import get_total_amount_earned, get_total_amount_spent
 
 
@@ -193,7 +190,9 @@ class TransactionController:
         if end_date:
             query = query.filter(Transaction.created_at <= end_date)
 
-        transactions = query.order_by(Transaction.created_at.desc()).all()
+        # Exports can cover a user's whole history, so they get more time than the default statement timeout
+        with statement_timeout(Config.DB_EXPORT_STATEMENT_TIMEOUT_MS):
+            transactions = query.order_by(Transaction.created_at.desc()).all()
         current_transactions = [transaction.to_dict() for transaction in transactions]
 
         if not transactions:
@@ -203,6 +202,12 @@ class TransactionController:
 
     @staticmethod
     def generate_pdf(transactions, logo_path):
+        # reportlab is heavy, so it's only loaded when a PDF is exported
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Image, Spacer
+        
         pdf_buffer = io.BytesIO()
         doc = SimpleDocTemplate(pdf_buffer, pagesize=letter)
         elements = []
@@ -257,6 +262,8 @@ class TransactionController:
 
     @staticmethod
     def generate_excel(transactions):
+        import pandas as pd
+        
         df = pd.DataFrame(transactions)
         excel_buffer = io.BytesIO()
         with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
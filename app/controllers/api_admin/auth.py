@@ -20,11 +20,13 @@ from flask_jwt_extended.exceptions import JWTDecodeError
 from jwt import ExpiredSignatureError, DecodeError
 
 from ...extensions import db
-from ...models import Role, RoleNames, TempUser, Trendit3User, Address, Profile, OneTimeToken, ReferralHistory, Membership, Wallet, UserSettings
+from ...models import Role, RoleNames, TempUser, Trendit3User, Address, Profile, ReferralHistory, Membership, Wallet, UserSettings
 from ...utils.helpers.basic_helpers import console_log, log_exception
 from ...utils.helpers.response_helpers import error_response, success_response
 from ...utils.helpers.location_helpers import get_currency_info
-from ...utils.helpers.auth_helpers import generate_six_digit_code, send_code_to_email, save_pwd_reset_token, send_2fa_code
+from ...utils.helpers.auth_helpers import send_code_to_email, send_2fa_code
+from ...utils.helpers.otp_helpers import OTPPurpose, check_resend_throttle, issue_link_token, consume_link_token
+from ...exceptions import OTPError
 from ...utils.helpers.user_helpers import is_user_exist, get_trendit3_user, referral_code_exists
 from ...utils.helpers.mail_helpers import send_other_emails
 
@@ -53,16 +55,14 @@ class AdminAuthController:
                 return error_response('Email is incorrect or doesn\'t exist', 401)
             
             if user and any(role.name in required_roles for role in user.roles):
-                token = secrets.token_urlsafe(16)
-                signin_token = OneTimeToken.query.filter(OneTimeToken.trendit3_user_id == user.id).first()
-                if signin_token:
-                    signin_token.update(token=token, used=False)
-                    send_other_emails(email, email_type='admin_login', admin_login_code=token)
-                    return success_response('Login link sent to email', 200)
-                else:
-                    new_signin_token = OneTimeToken.create_token(token=token, trendit3_user_id=user.id)
-                    send_other_emails(email, email_type='admin_login', admin_login_code=token)
-                    return success_response('Login link sent to email', 200)
+                try:
+                    check_resend_throttle(OTPPurpose.ADMIN_LOGIN, user.id)
+                except OTPError as e:
+                    return error_response(e.message, e.status_code)
+                
+                token = issue_link_token(OTPPurpose.ADMIN_LOGIN, user.id)
+                send_other_emails(email, email_type='admin_login', admin_login_code=token)
+                return success_response('Login link sent to email', 200)
                 
             else:
                 return error_response('You do not have the required roles to access this resource', 403)
@@ -99,10 +99,9 @@ class AdminAuthController:
             data = request.get_json()
             token = data.get('token')
 
-            signin_token = OneTimeToken.query.filter(OneTimeToken.token == token).first()
-            if signin_token and not signin_token.used:
-                signin_token.update(used=True)
-                access_token = create_access_token(identity=signin_token.trendit3_user_id, expires_delta=timedelta(minutes=1440), additional_claims={'type': 'access'})
+            user_id = consume_link_token(OTPPurpose.ADMIN_LOGIN, token)
+            if user_id:
+                access_token = create_access_token(identity=int(user_id), expires_delta=timedelta(minutes=1440), additional_claims={'type': 'access'})
                 extra_data = {'access_token':access_token}
                 return success_response('Login successful', 200, extra_data)
             else:
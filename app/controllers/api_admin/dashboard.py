@@ -25,8 +25,9 @@ from ...models import Role, RoleNames, TempUser, Trendit3User, Task, TaskStatus,
 from ...utils.helpers.basic_helpers import console_log, log_exception
 from ...utils.helpers.response_helpers import error_response, success_response
 from ...utils.helpers.location_helpers import get_currency_info
-from ...utils.helpers.auth_helpers import generate_six_digit_code, save_pwd_reset_token, send_2fa_code
+from ...utils.helpers.auth_helpers import generate_six_digit_code, send_2fa_code
 from ...utils.helpers.user_helpers import is_user_exist, get_trendit3_user, referral_code_exists
+from ...utils.helpers.principal_helpers import invalidate_user_roles
 from ...utils.helpers.mail_helpers import send_other_emails
 from datetime import datetime, timedelta
 
@@ -142,6 +143,7 @@ class AdminDashboardController:
                 user.roles.append(role)
             
             db.session.commit()
+            invalidate_user_roles(user.id)
             extra_data = {'user_roles': [role.name.value for role in user.roles]}
             send_other_emails(user.email, email_type='new_admin')
             db.session.close()
@@ -11,10 +11,13 @@ from sqlalchemy.exc import ( DataError, DatabaseError )
 from ...extensions import db
 from ...models import Trendit3User, Wallet, Transaction, Notification, TransactionType, NotificationType
 from ...utils.helpers.response_helpers import error_response, success_response
-from ...utils.helpers.basic_helpers import log_exception, console_log, generate_random_number, generate_random_string
+from ...utils.helpers.basic_helpers import log_exception, console_log, generate_random_string
+from ...utils.helpers.otp_helpers import OTPPurpose, issue_otp, verify_otp
+from ...exceptions import OTPError
 from ...utils.payments.flutterwave import flutterwave_fetch_balance
 from ...utils.payments.rates import convert_amount
 from ...utils.helpers.user_helpers import get_trendit3_user
+from ...utils.helpers.user_data_helpers import get_user_data, get_requested_level
 from ...utils.mailing.payout import send_payout_otp_to_email
 
 class AdminPayoutController:
@@ -56,13 +59,15 @@ class AdminPayoutController:
                 db.session.commit()
                 
                 extra_data = {
-                    "user_data": user.to_dict(),
+                    "user_data": get_user_data(user, *get_requested_level()),
                     "user_wallet": user_wallet.to_dict()
                 }
                 
                 api_response = success_response("Payout made successfully", 200, extra_data)
             else:
-                otp = generate_random_number(7)
+                # Each payout gets its own reference, so its OTP can only confirm this payout, once.
+                payout_ref = generate_random_string(16)
+                otp = issue_otp(OTPPurpose.PAYOUT, payout_ref, length=7, throttle=False)
                 
                 try:
                     send_payout_otp_to_email(otp)
@@ -72,7 +77,7 @@ class AdminPayoutController:
                 identity={
                     "username": user.username,
                     "email": user.email,
-                    "otp": otp,
+                    "payout_ref": payout_ref,
                     "amount": amount,
                     "description": description
                 }
@@ -126,9 +131,11 @@ class AdminPayoutController:
             description = token_data["description"]
             
             
-            # Check if the entered code matches the one in the JWT
-            if int(entered_code) != int(token_data["otp"]):
-                return error_response("The wrong OTP was provided. Please check your mail for the correct code and try again.", 400)
+            # Check the entered code against the OTP store. A confirmed payout can't be replayed.
+            try:
+                verify_otp(OTPPurpose.PAYOUT, token_data.get("payout_ref"), entered_code)
+            except OTPError as e:
+                return error_response(e.message if e.status_code != 400 else "The wrong OTP was provided. Please check your mail for the correct code and try again.", e.status_code)
             
             # 2FA token is valid, log user in.
             # User authentication successful
@@ -150,7 +157,7 @@ class AdminPayoutController:
             db.session.commit()
             
             extra_data = {
-                "user_data": user.to_dict(),
+                "user_data": get_user_data(user, *get_requested_level()),
                 "user_wallet": user_wallet.to_dict()
             }
             
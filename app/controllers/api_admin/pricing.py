@@ -78,8 +78,8 @@ class PricingController:
             db.session.add(pricing)
             db.session.flush()  # Ensure the instance is bound to the session and has an ID before using it
 
-            save_pricing_icon(pricing.id, price_icon)
             db.session.commit()
+            save_pricing_icon(pricing.id, price_icon) # queued after commit so the upload job can find the pricing
 
             extra_data = {'pricing_data': pricing.to_dict()}
             api_response = success_response('Pricing added successfully', 200, extra_data)
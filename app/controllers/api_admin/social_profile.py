@@ -6,7 +6,7 @@ from flask_jwt_extended import get_jwt_identity
 from ...extensions import db
 from ...utils.helpers import log_exception, console_log
 from ...utils.helpers.response_helpers import error_response, success_response
-from ...utils.helpers.mail_helpers import send_social_profile_status_email
+from ...utils.helpers.social_profile_helpers import get_review_queue, claim_profiles, parse_review_decisions, review_profiles
 from ...models import SocialLinkStatus, SocialLinks, SocialMediaProfile
 from ...models.notification import SocialVerification, SocialVerificationStatus, Notification, NotificationType
 from ...models.user import Trendit3User
@@ -45,93 +45,121 @@ class AdminSocialProfileController:
             return api_response
     
         @staticmethod
-        def approve_social_media_profile(profile_id):
+        def get_review_queue():
             try:
+                after_id = request.args.get("after_id", type=int)
+                per_page = request.args.get("per_page", 20, type=int)
                 
-                if not profile_id:
-                    return error_response("profile_id is missing or empty.", 400)
+                profiles, next_after_id = get_review_queue(after_id=after_id, per_page=per_page)
                 
-                profile: SocialMediaProfile = SocialMediaProfile.query.filter_by(id=profile_id).first()
-                if not profile:
-                    return error_response("Social media profile not found", 404)
-                    
-                platform: str = profile.platform
-                recipient_id: int = profile.trendit3_user_id
-                sender: Trendit3User = profile.trendit3_user
-                body: str = f"Your {profile.platform.capitalize()} verification request has been approved"
+                extra_data = {
+                    "social_profiles": [profile.to_review_dict() for profile in profiles],
+                    "next_after_id": next_after_id,
+                }
                 
+                api_response = success_response('Pending social media profiles fetched successfully', 200, extra_data)
+            except (DataError, DatabaseError) as e:
+                db.session.rollback()
+                log_exception('Database error:', e)
+                api_response = error_response('Error connecting to the database.', 500)
+            except Exception as e:
+                db.session.rollback()
+                log_exception(f"An unexpected error occurred fetching the social profile review queue", e)
+                api_response = error_response('An unexpected error. Our developers are already looking into it.', 500)
+            
+            return api_response
+        
+        @staticmethod
+        def claim_social_profiles():
+            try:
+                admin_id = int(get_jwt_identity())
+                data = request.get_json(silent=True) or {}
+                limit = int(data.get("limit", 20))
                 
-                # Approve and send notification
-                profile.status = SocialLinkStatus.VERIFIED
+                profiles = claim_profiles(admin_id, limit)
                 
-                Notification.add_notification(
-                    recipient_id=recipient_id,
-                    body=body,
-                    notification_type=NotificationType.NOTIFICATION,
-                    commit=False
-                )
-
-                db.session.commit()
+                extra_data = {"social_profiles": [profile.to_review_dict() for profile in profiles]}
+                api_response = success_response(f"{len(profiles)} social profiles claimed for review", 200, extra_data)
+            except ValueError:
+                api_response = error_response("limit must be a number", 400)
+            except (DataError, DatabaseError) as e:
+                db.session.rollback()
+                log_exception('Database error occurred claiming social profiles', e)
+                api_response = error_response('Error interacting to the database.', 500)
+            except Exception as e:
+                db.session.rollback()
+                log_exception(f"An unexpected error occurred claiming social profiles", e)
+                api_response = error_response('An unexpected error. Our developers are already looking into it.', 500)
+            
+            return api_response
+        
+        @staticmethod
+        def review_social_profiles():
+            try:
+                admin_id = int(get_jwt_identity())
+                
+                try:
+                    decisions = parse_review_decisions(request.get_json(silent=True) or {})
+                except ValueError as e:
+                    return error_response(str(e), 400)
                 
-                send_social_profile_status_email(sender.email, platform, status=SocialLinkStatus.VERIFIED)
+                result = review_profiles(admin_id, decisions)
                 
-                api_response = success_response(f"{sender.full_name}'s {platform} profile  approved successfully", 200)
+                msg = f"{len(result['reviewed'])} social profiles reviewed"
+                if result["skipped"]:
+                    msg += f", {len(result['skipped'])} skipped because they are no longer pending or are claimed by another admin"
+                api_response = success_response(msg, 200, result)
             except (DataError, DatabaseError) as e:
                 db.session.rollback()
-                log_exception('Database error occurred approving social profile', e)
+                log_exception('Database error occurred reviewing social profiles', e)
                 api_response = error_response('Error interacting to the database.', 500)
             except Exception as e:
                 db.session.rollback()
-                log_exception(f"An unexpected error occurred approving social profiles", e)
+                log_exception(f"An unexpected error occurred reviewing social profiles", e)
                 api_response = error_response('An unexpected error. Our developers are already looking into it.', 500)
-            finally:
-                db.session.close()
             
             return api_response
         
         @staticmethod
-        def reject_social_media_profile(profile_id):
+        def review_social_media_profile(profile_id, status: SocialLinkStatus):
+            """Approves or rejects a single profile through the review queue."""
             try:
                 if not profile_id:
                     return error_response("profile_id is missing or empty.", 400)
                 
                 profile: SocialMediaProfile = SocialMediaProfile.query.filter_by(id=profile_id).first()
                 if not profile:
-                    return error_response("Social profile not found", 404)
+                    return error_response("Social media profile not found", 404)
                 
                 platform: str = profile.platform
-                recipient_id: int = profile.trendit3_user_id
-                sender: Trendit3User = profile.trendit3_user
-                body: str = f"Your {profile.platform.capitalize()} verification request has been rejected"
-                
+                owner: Trendit3User = profile.trendit3_user
+                outcome = "approved" if status == SocialLinkStatus.VERIFIED else "rejected"
                 
-                # reject and send notification
-                profile.status = SocialLinkStatus.REJECTED
+                result = review_profiles(int(get_jwt_identity()), {profile.id: status})
+                if not result["reviewed"]:
+                    return error_response(f"This {platform} profile is no longer pending or is claimed by another admin", 409)
                 
-                Notification.add_notification(
-                    recipient_id=recipient_id,
-                    body=body,
-                    notification_type=NotificationType.NOTIFICATION,
-                    commit=False
-                )
-
-                db.session.commit()
-                
-                send_social_profile_status_email(sender.email, platform, status=SocialLinkStatus.REJECTED)
-                
-                api_response = success_response(f"{sender.full_name}'s {platform} profile rejected successfully", 200)
+                api_response = success_response(f"{owner.full_name}'s {platform} profile {outcome} successfully", 200)
             except (DataError, DatabaseError) as e:
                 db.session.rollback()
-                log_exception('Database error occurred rejecting social profile', e)
+                log_exception('Database error occurred reviewing social profile', e)
                 api_response = error_response('Error interacting to the database.', 500)
             except Exception as e:
                 db.session.rollback()
-                log_exception(f"An unexpected error occurred rejecting social profiles", e)
+                log_exception(f"An unexpected error occurred reviewing social profile", e)
                 api_response = error_response('An unexpected error. Our developers are already looking into it.', 500)
             finally:
                 db.session.close()
             
             return api_response
+        
+        @staticmethod
+        def approve_social_media_profile(profile_id):
+            return AdminSocialProfileController.review_social_media_profile(profile_id, SocialLinkStatus.VERIFIED)
+        
+        @staticmethod
+        def reject_social_media_profile(profile_id):
+            return AdminSocialProfileController.review_social_media_profile(profile_id, SocialLinkStatus.REJECTED)
     
         # DEPRECATED
         @staticmethod
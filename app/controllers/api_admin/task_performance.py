@@ -1,4 +1,5 @@
 import logging
+from datetime import datetime
 from flask import request
 from sqlalchemy.exc import ( DataError, DatabaseError )
 
@@ -46,6 +47,7 @@ class AdminTaskPerformanceController:
                 return error_response('Performed task not found', 404)
             
             pt_dict = performed_task.to_dict()
+            pt_dict['screenshot_reused_in'] = performed_task.get_screenshot_reuses() # other performances submitted with the same screenshot
             
             msg = 'Performed Task fetched successfully'
             status_code = 200
@@ -141,11 +143,11 @@ class AdminTaskPerformanceController:
             
             status_val = "completed" if status == "accept" else "rejected"
             
-            performed_task.update(status=status_val)
+            performed_task.update(status=status_val, date_completed=datetime.utcnow() if status_val == "completed" else None)
             
             if status_val == "completed":
                 user_id = performed_task.user_id
-                credit_wallet(user_id, performed_task.reward_money)
+                credit_wallet(user_id, performed_task.reward_money, platform=performed_task.platform)
             
             extra_data = {"performed_task": performed_task.to_dict()}
             
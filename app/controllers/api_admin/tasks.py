@@ -1,4 +1,5 @@
 import logging
+from datetime import datetime
 from flask import request
 from flask_jwt_extended import get_jwt_identity
 from sqlalchemy.exc import ( DataError, DatabaseError, )
@@ -241,11 +242,11 @@ class AdminTaskController:
             
             status_val = "completed" if status == "accept" else "rejected"
             
-            performed_task.update(status=status_val)
+            performed_task.update(status=status_val, date_completed=datetime.utcnow() if status_val == "completed" else None)
             
             if status_val == "completed":
                 user_id = performed_task.user_id
-                credit_wallet(user_id, performed_task.reward_money)
+                credit_wallet(user_id, performed_task.reward_money, platform=performed_task.platform)
             
             extra_data = {"performed_task": performed_task.to_dict()}
             
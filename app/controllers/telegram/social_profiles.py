@@ -9,6 +9,7 @@ from ...models.social import SocialLinks, SocialLinkStatus, SocialMediaProfile
 from ...models.user import Trendit3User
 from ...utils.helpers.loggers import console_log, log_exception
 from ...utils.helpers.user_helpers import get_social_profile
+from ...utils.helpers.social_profile_helpers import get_review_queue, claim_profiles, parse_review_decisions, review_profiles
 
 
 class SocialProfilesTelegramController:
@@ -16,13 +17,10 @@ class SocialProfilesTelegramController:
     @staticmethod
     def get_pending_social_profiles():
         try:
-            page = request.args.get("page", 1, type=int)
+            after_id = request.args.get("after_id", type=int)
             per_page = 15
             
-            pagination = SocialMediaProfile.query.filter_by(status=SocialLinkStatus.PENDING) \
-                .paginate(page=page, per_page=per_page, error_out=False)
-            
-            social_profiles = pagination.items
+            social_profiles, next_after_id = get_review_queue(after_id=after_id, per_page=per_page)
             
             if not social_profiles:
                 extra_data = {"social_profiles": []}
@@ -31,12 +29,10 @@ class SocialProfilesTelegramController:
             for profile in social_profiles:
                 notify_telegram_admins_new_profile(profile)
             
-            current_social_profiles = [profile.to_dict() for profile in social_profiles]
+            current_social_profiles = [profile.to_review_dict() for profile in social_profiles]
             
             extra_data = {
-                'total': pagination.total,
-                "current_page": pagination.page,
-                "total_pages": pagination.pages,
+                "next_after_id": next_after_id,
                 "pending_social_profiles": current_social_profiles,
             }
             
@@ -53,3 +49,46 @@ class SocialProfilesTelegramController:
         
         return api_response
     
+    @staticmethod
+    def claim_social_profiles():
+        try:
+            admin_id = int(get_jwt_identity())
+            limit = request.args.get("limit", 15, type=int)
+            
+            social_profiles = claim_profiles(admin_id, limit)
+            
+            extra_data = {"social_profiles": [profile.to_review_dict() for profile in social_profiles]}
+            api_response = success_response(f"{len(social_profiles)} social profiles claimed for review", 200, extra_data)
+        except (DataError, DatabaseError) as e:
+            db.session.rollback()
+            log_exception('Database error:', e)
+            api_response = error_response('Error connecting to the database.', 500)
+        except Exception as e:
+            db.session.rollback()
+            log_exception(f"An unexpected error occurred claiming social profiles", e)
+            api_response = error_response('An unexpected error. Our developers are already looking into it.', 500)
+        
+        return api_response
+    
+    @staticmethod
+    def review_social_profiles():
+        try:
+            admin_id = int(get_jwt_identity())
+            
+            try:
+                decisions = parse_review_decisions(request.get_json(silent=True) or {})
+            except ValueError as e:
+                return error_response(str(e), 400)
+            
+            result = review_profiles(admin_id, decisions)
+            api_response = success_response(f"{len(result['reviewed'])} social profiles reviewed", 200, result)
+        except (DataError, DatabaseError) as e:
+            db.session.rollback()
+            log_exception('Database error:', e)
+            api_response = error_response('Error connecting to the database.', 500)
+        except Exception as e:
+            db.session.rollback()
+            log_exception(f"An unexpected error occurred reviewing social profiles", e)
+            api_response = error_response('An unexpected error. Our developers are already looking into it.', 500)
+        
+        return api_response
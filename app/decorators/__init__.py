@@ -6,4 +6,5 @@ This package contains the decorators for the Trendit³ Flask application.
 @package: Trendit³
 """
 from .auth import roles_required
-from .membership import membership_required
\ No newline at end of file
+from .membership import membership_required
+from .cache import cached_response
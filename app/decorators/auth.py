@@ -12,7 +12,7 @@ If the user does not have the required roles, it returns a 403 error.
 from functools import wraps
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
-from app.models import Trendit3User
+from app.utils.helpers.principal_helpers import get_user_role_names
 from app.utils.helpers.response_helpers import error_response
 
 def roles_required(*required_roles):
@@ -21,6 +21,8 @@ def roles_required(*required_roles):
 
     This decorator will return a 403 error if the current user does not have
     all of the roles specified in `required_roles`.
+    
+    Role sets come from a short-lived shared cache, so most checks cost no query.
 
     Args:
         *required_roles (str): The required roles to access the route.
@@ -36,9 +38,9 @@ def roles_required(*required_roles):
         @jwt_required()
         def wrapper(*args, **kwargs):
             current_user_id = get_jwt_identity()
-            user = Trendit3User.query.get(current_user_id)
+            role_names = get_user_role_names(current_user_id)
             
-            if user and any(role.name.value in required_roles for role in user.roles):
+            if any(role_name in required_roles for role_name in role_names):
                 return fn(*args, **kwargs)
             else:
                 return error_response("Access denied: You do not have the required roles to access this resource", 403)
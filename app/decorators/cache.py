@@ -0,0 +1,42 @@
+'''
+This module defines the `cached_response` decorator for the Trendit³ Flask application.
+
+It serves a GET endpoint through the response cache, with ETag and Cache-Control headers.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from functools import wraps
+from typing import Callable
+
+from app.utils.helpers.cache_helpers import serve_cached
+
+def cached_response(namespace: str, vary: Callable[[], str | None] | None = None, private: bool = False):
+    """
+    Decorator to cache the response of an endpoint.
+
+    Responses are keyed by the request path and query args. Endpoints whose payload depends
+    on the caller pass `vary`, a function returning the caller's variant (e.g. their currency);
+    when it returns None the endpoint is called without the cache. Such endpoints should also
+    set `private`, so shared caches don't store them.
+
+    Must be placed below `jwt_required` when `vary` reads the current user.
+
+    Args:
+        namespace (str): The cache namespace, invalidated when the models it's built from change.
+        vary (callable, optional): Returns the caller's variant of the response.
+        private (bool): Whether the response is specific to the caller.
+
+    Returns:
+        function: The decorated function.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            variant = vary() if vary else None
+            if vary and variant is None:
+                return fn(*args, **kwargs)
+            return serve_cached(namespace, lambda: fn(*args, **kwargs), variant, private)
+        return wrapper
+    return decorator
@@ -10,9 +10,9 @@ If the user hasn't paid, it returns a 403 error.
 @package: Trendit³
 '''
 from functools import wraps
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 
-from app.models import Trendit3User
+from app.utils.helpers.principal_helpers import get_current_principal
 from app.utils.helpers.response_helpers import error_response
 
 def membership_required():
@@ -21,6 +21,9 @@ def membership_required():
 
     This decorator will return a 403 error if the current user has not
     paid the membership fee
+    
+    The user is loaded through the request-scoped principal, so controllers
+    fetching the same user afterwards don't query it again.
 
     Returns:
         function: The decorated function.
@@ -29,10 +32,9 @@ def membership_required():
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            current_user_id = get_jwt_identity()
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_principal()
             
-            if user and user.membership.membership_fee_paid:
+            if user and user.membership and user.membership.membership_fee_paid:
                 return fn(*args, **kwargs)
             else:
                 return error_response("Access denied: Membership fee hasn't been paid", 403)
@@ -10,9 +10,11 @@ returning a 429 Too Many Requests status code.
 
 '''
 
+import time
 from flask_limiter.errors import RateLimitExceeded
 
 from ..error_handlers import bp
+from ..extensions import limiter
 from ..utils.helpers.basic_helpers import console_log, log_exception
 from ..utils.helpers.response_helpers import error_response
 
@@ -21,4 +23,8 @@ from ..utils.helpers.response_helpers import error_response
 @bp.app_errorhandler(RateLimitExceeded)
 def handle_rate_limit_exceeded(error):
     log_exception('Rate Limit Exceeded', error)
-    return error_response(f'You have exceeded your request limit. Please try again later.', 429) # Return 429 Too Many Requests status code
+    
+    # The Retry-After header is added by Flask-Limiter. It's repeated in the body for clients that can't read headers.
+    current_limit = limiter.current_limit
+    extra_data = {'retry_after': max(int(current_limit.reset_at - time.time()), 1)} if current_limit else None
+    return error_response(f'You have exceeded your request limit. Please try again later.', 429, extra_data) # Return 429 Too Many Requests status code
@@ -60,4 +60,20 @@ class InvalidTwoFactorMethod(Exception):
     def __init__(self, message="Invalid 2FA method.", status_code=400):
         super().__init__(message)
         self.status_code = status_code
-        self.message = message
\ No newline at end of file
+        self.message = message
+
+class OTPError(Exception):
+    """Exception raised when a one-time code can't be issued or verified."""
+
+    def __init__(self, message="Invalid or expired code.", status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+class OTPThrottledError(OTPError):
+    """Exception raised when a new code is requested too soon after the last one."""
+
+    def __init__(self, retry_after: int, message=None, status_code=429):
+        super().__init__(message or f"Please wait {retry_after} seconds before requesting a new code.", status_code)
+        self.retry_after = retry_after
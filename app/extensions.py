@@ -1,7 +1,7 @@
 '''
 This module initializes the extensions used in the Trendit³ Flask application.
 
-It sets up SQLAlchemy, Flask-Mail, and Celery with the configurations defined in the Config class.
+It sets up SQLAlchemy, Flask-Mail, Redis, and Celery with the configurations defined in the Config class.
 
 @author: Emmanuel Olowu
 @link: https://github.com/zeddyemy
@@ -15,6 +15,7 @@ from flask_migrate import Migrate
 from flask_limiter.util import get_remote_address
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
+from redis import Redis
 
 from config import Config
 
@@ -25,6 +26,10 @@ migration = Migrate()
 jwt_extended = JWTManager()
 limiter = Limiter(key_func=get_remote_address)
 
+# Shared Redis client. Connections are only opened on first use, with short timeouts
+# so a slow or missing Redis can't hold up a request.
+redis_client = Redis.from_url(Config.REDIS_URL, socket_timeout=Config.REDIS_SOCKET_TIMEOUT, socket_connect_timeout=Config.REDIS_SOCKET_TIMEOUT, decode_responses=True)
+
 def initialize_extensions(app: Flask):
     db.init_app(app)
     mail.init_app(app)
@@ -0,0 +1,230 @@
+'''
+This module contains the Prometheus metrics of the Trendit³ Flask application, all in one place.
+
+It records request latency by endpoint and status, database pool usage, Celery task durations
+and queue depth, the latency of outbound calls to Paystack, Flutterwave, Cloudinary and
+Telegram, and the hit rate of the response cache. Metrics are served in the Prometheus text format on `/metrics`,
+which in production is only enabled when METRICS_TOKEN is set.
+
+Under gunicorn (and Celery's prefork pool) every process keeps its own values. Set
+PROMETHEUS_MULTIPROC_DIR before the app is imported so the values are written to that
+directory and aggregated on scrape; `gunicorn.conf.py` prepares the directory and cleans up
+after dead workers.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import os, time, hmac
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from flask import Flask, Response, request, current_app
+from sqlalchemy import event
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess, start_http_server,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from .extensions import db, limiter, redis_client
+
+# Buckets in seconds, from fast cached reads up to slow gateway calls
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time spent handling requests.",
+    ["method", "endpoint", "status"], buckets=LATENCY_BUCKETS,
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out", "Database connections currently in use.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Database connections the pool keeps open.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a database connection from the pool.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds", "Time spent running Celery tasks.",
+    ["task", "state"], buckets=LATENCY_BUCKETS,
+)
+OUTBOUND_LATENCY = Histogram(
+    "outbound_request_duration_seconds", "Time spent on calls to external services.",
+    ["service", "method", "status"], buckets=LATENCY_BUCKETS,
+)
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "response_cache_lookups_total", "Response cache lookups, by namespace and result (hit or miss).",
+    ["namespace", "result"],
+)
+RESPONSE_CACHE_NOT_MODIFIED = Counter(
+    "response_cache_not_modified_total", "Cached responses answered with 304 Not Modified.",
+    ["namespace"],
+)
+
+# Hosts of the external services we want to tell apart. Other hosts are grouped as "other".
+OUTBOUND_SERVICES = {
+    "api.paystack.co": "paystack",
+    "api.flutterwave.com": "flutterwave",
+    "api.cloudinary.com": "cloudinary",
+    "api.telegram.org": "telegram",
+}
+
+_task_started: dict[str, float] = {}
+
+
+def is_multiprocess() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+class CeleryQueueCollector:
+    """Reports the number of messages waiting in each Celery queue, read from the Redis broker on scrape."""
+
+    def __init__(self, queues: list[str]):
+        self.queues = queues
+
+    def collect(self):
+        depth = GaugeMetricFamily("celery_queue_length", "Messages waiting in the Celery queue.", labels=["queue"])
+        for queue in self.queues:
+            try:
+                depth.add_metric([queue], redis_client.llen(queue))
+            except Exception:
+                continue # an unreachable broker shouldn't fail the whole scrape
+        yield depth
+
+
+@contextmanager
+def track_outbound(service: str, method: str = "POST"):
+    """Times a call to an external service that doesn't go through `requests`, e.g. the Cloudinary SDK."""
+    status = "error"
+    start = time.perf_counter()
+    try:
+        yield
+        status = "ok"
+    finally:
+        OUTBOUND_LATENCY.labels(service, method, status).observe(time.perf_counter() - start)
+
+
+def instrument_requests() -> None:
+    """Times every call made with `requests`, labelled by the service it went to."""
+    send = requests.Session.send
+    if getattr(send, "instrumented", False):
+        return
+
+    def timed_send(self, prepared, **kwargs):
+        service = OUTBOUND_SERVICES.get(urlsplit(prepared.url).hostname, "other")
+        start = time.perf_counter()
+        status = "error"
+        try:
+            response = send(self, prepared, **kwargs)
+            status = str(response.status_code)
+            return response
+        finally:
+            OUTBOUND_LATENCY.labels(service, prepared.method, status).observe(time.perf_counter() - start)
+
+    timed_send.instrumented = True
+    requests.Session.send = timed_send
+
+
+def instrument_db_pool(app: Flask) -> None:
+    """
+    Tracks checked out connections with pool events, so the gauge is right in every process,
+    and times how long each checkout waits for a free connection.
+    """
+    with app.app_context():
+        engine = db.engine
+
+    pool = engine.pool
+    DB_POOL_SIZE.set(pool.size() if hasattr(pool, "size") else 0)
+    event.listen(engine, "checkout", lambda *args: DB_POOL_CHECKED_OUT.inc())
+    event.listen(engine, "checkin", lambda *args: DB_POOL_CHECKED_OUT.dec())
+
+    # The engine gets every connection through pool.connect(); there is no event for the wait itself
+    connect = pool.connect
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+    pool.connect = timed_connect
+
+
+def observe_request(response: Response) -> Response:
+    start_time = getattr(request, "context", {}).get("start_time")
+    if start_time is not None and request.endpoint != "metrics":
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched" # keep label values bounded
+        REQUEST_LATENCY.labels(request.method, endpoint, response.status_code).observe(time.perf_counter() - start_time)
+    return response
+
+
+def build_registry() -> CollectorRegistry:
+    if not is_multiprocess():
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+@limiter.exempt
+def metrics():
+    token = current_app.config.get("METRICS_TOKEN")
+    if token and not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return Response("Unauthorized", status=401)
+
+    output = generate_latest(build_registry()) + generate_latest(current_app.extensions["metrics_queue_registry"])
+    return Response(output, mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app: Flask) -> None:
+    """
+    Sets up request, database and outbound call metrics and adds the `/metrics` endpoint.
+
+    Must run after the before_request hooks are registered, as it reads the request start time.
+    """
+    if not app.config.get("METRICS_ENABLED"):
+        return
+
+    # The metrics expose routes, latencies, pool state and queue depth, so production never serves them publicly
+    if app.config.get("ENV") == "production" and not app.config.get("METRICS_TOKEN"):
+        app.logger.warning("METRICS_TOKEN is not set, /metrics is disabled")
+        return
+
+    # The queue depth is read from the broker on scrape, so it lives in its own registry
+    # instead of being aggregated with the per-process values
+    queue_registry = CollectorRegistry()
+    queue_registry.register(CeleryQueueCollector(app.config["METRICS_CELERY_QUEUES"]))
+    app.extensions["metrics_queue_registry"] = queue_registry
+
+    instrument_requests()
+    instrument_db_pool(app)
+    app.after_request(observe_request)
+    app.add_url_rule("/metrics", "metrics", metrics, methods=["GET"])
+
+
+def init_celery_metrics(app: Flask) -> None:
+    """Times Celery tasks and, when METRICS_CELERY_PORT is set, serves the worker's metrics on that port."""
+    from celery.signals import task_prerun, task_postrun, worker_ready
+
+    if not app.config.get("METRICS_ENABLED"):
+        return
+
+    @task_prerun.connect(weak=False)
+    def start_task_timer(task_id=None, **kwargs):
+        _task_started[task_id] = time.perf_counter()
+
+    @task_postrun.connect(weak=False)
+    def observe_task(task_id=None, task=None, state=None, **kwargs):
+        start = _task_started.pop(task_id, None)
+        if start is not None:
+            CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - start)
+
+    @worker_ready.connect(weak=False)
+    def serve_worker_metrics(**kwargs):
+        port = app.config.get("METRICS_CELERY_PORT")
+        if port:
+            start_http_server(port, registry=build_registry())
@@ -9,13 +9,14 @@ It includes models for User, Product, Category, Transaction, Role, etc. Each mod
 '''
 from ..models.media import Media
 from ..models.membership import Membership
-from ..models.item import Item, LikeLog, Share, Comment
+from ..models.item import Item, LikeLog, Share, Comment, ItemCounterFlush, backfill_comments_count
 from ..models.payment import Payment, Transaction, Wallet, Withdrawal, TransactionType
-from ..models.user import Trendit3User, Address, Profile, ReferralHistory, TempUser, OneTimeToken, BankAccount, Recipient
+from ..models.user import Trendit3User, Address, Profile, ReferralHistory, ReferralStats, TempUser, OneTimeToken, BankAccount, Recipient, backfill_referral_stats
 from ..models.task import Task, AdvertTask, EngagementTask, TaskStatus, TaskPaymentStatus, TaskPerformance
-from .task_option import TaskOption
+from .task_option import TaskOption, populate_task_options
 from ..models.notification import UserMessageStatus, Notification, user_notification, SocialVerificationStatus, SocialVerification, NotificationType
 from ..models.settings import UserSettings, NotificationPreference, SecuritySetting, UserPreference
 from ..models.role import Role, RoleNames, user_roles, create_roles
 from ..models.pricing import Pricing, PricingCategory
-from .social import SocialMediaProfile, SocialIDs, SocialLinks, SocialLinkStatus
\ No newline at end of file
+from .social import SocialMediaProfile, SocialIDs, SocialLinks, SocialLinkStatus
+from .seed import SeedVersion
@@ -1,5 +1,6 @@
 import time
 from sqlalchemy.orm import backref
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from datetime import datetime
 
 from app.extensions import db
@@ -22,6 +23,7 @@ class Item(db.Model):
     material = db.Column(db.String(300), nullable=True)
     phone = db.Column(db.String(100), nullable=True)
     views_count = db.Column(db.Integer, default=0)
+    comments_count = db.Column(db.Integer, nullable=False, default=0, server_default="0") # kept up to date by add_comment
     slug = db.Column(db.String(), nullable=False, unique=True)
     country = db.Column(db.String(80), nullable=True)
     state = db.Column(db.String(80), nullable=True)
@@ -34,6 +36,24 @@ class Item(db.Model):
     item_img_id = db.Column(db.Integer, db.ForeignKey('media.id'), nullable=True)
     media = db.relationship('Media')
     
+    # Kept up to date by Postgres, used for marketplace text search
+    search_vector = db.Column(TSVECTOR, db.Computed(
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(brand_name, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+        persisted=True,
+    ))
+    
+    # Indexes for the marketplace filters; each ends with the keyset pagination columns
+    __table_args__ = (
+        db.Index('ix_item_created_at_id', 'created_at', 'id'),
+        db.Index('ix_item_category_created_at_id', 'category', 'created_at', 'id'),
+        db.Index('ix_item_item_type_created_at_id', 'item_type', 'created_at', 'id'),
+        db.Index('ix_item_location_created_at_id', 'country', 'state', 'city', 'created_at', 'id'),
+        db.Index('ix_item_price_id', 'price', 'id'),
+        db.Index('ix_item_search_vector', 'search_vector', postgresql_using='gin'),
+    )
+    
 
     def __repr__(self):
         return f'<Item ID: {self.id}, name: {self.name}, type: {self.item_type}, time: {self.created_at}>'
@@ -61,16 +81,22 @@ class Item(db.Model):
         db.session.commit()
     
     def get_item_img(self):
-        if self.item_img_id:
-            theImage = Media.query.get(self.item_img_id)
-            if theImage:
-                return theImage.get_path()
-            else:
-                return None
-        else:
-            return None
+        return self.media.get_path() if self.media else None
     
-    def to_dict(self):
+    def get_engagement_counts(self) -> dict:
+        return {
+            'likes': self.likes.count(),
+            'shares': self.shares.count(),
+            'comments': self.comments_count,
+        }
+    
+    def to_dict(self, counts: dict | None = None):
+        """
+        Args:
+            counts (dict, optional): Like, share and comment counts already loaded for a page of
+                items (see `serialize_items`). Counted with one query each when not given.
+        """
+        counts = counts or self.get_engagement_counts()
         return {
             'id': self.id,
             'name': self.name,
@@ -86,8 +112,9 @@ class Item(db.Model):
             'slug': self.slug,
             'views_count': self.views_count,
             'item_type': self.item_type,
-            'total_likes': len(list(self.likes)),
-            'total_comments': len(list(self.comments)),
+            'total_likes': counts['likes'],
+            'total_shares': counts['shares'],
+            'total_comments': counts['comments'],
             'created_at': self.created_at,
             'updated_at': self.updated_at,
             'seller': {
@@ -107,6 +134,10 @@ class LikeLog(db.Model):
     liked_item = db.relationship('Item', backref=db.backref('likes', lazy='dynamic'))
     trendit3_user = db.relationship('Trendit3User', backref=db.backref('likes', lazy='dynamic'))
     
+    __table_args__ = (
+        db.UniqueConstraint('item_id', 'user_id', name='uq_like_log_item_id_user_id'),
+    )
+    
     def __repr__(self):
         return f'<LikeLog ID: {self.id}, Item_ID: {self.item_id}, User_ID: {self.user_id}>'
     
@@ -132,6 +163,10 @@ class Share(db.Model):
     shared_item = db.relationship('Item', backref=db.backref('shares', lazy='dynamic'))
     trendit3_user = db.relationship('Trendit3User', backref=db.backref('shares', lazy='dynamic'))
     
+    __table_args__ = (
+        db.UniqueConstraint('item_id', 'user_id', name='uq_share_item_id_user_id'),
+    )
+    
     def __repr__(self):
         return f'<Share ID: {self.id}, Item_ID: {self.item_id}, User_ID: {self.user_id}>'
     
@@ -159,6 +194,11 @@ class Comment(db.Model):
     commented_item = db.relationship('Item', backref=db.backref('comments', lazy='dynamic'))
     trendit3_user = db.relationship('Trendit3User', backref=db.backref('comments', lazy='dynamic'))
     
+    # Comment threads are paginated by (item_id, created_at, id)
+    __table_args__ = (
+        db.Index('ix_comment_item_id_created_at_id', 'item_id', 'created_at', 'id'),
+    )
+    
     def __repr__(self):
         return f'<Comment ID: {self.id}, Item_ID: {self.item_id}, User_ID: {self.user_id}, Created_at: {self.created_at}>'
     
@@ -175,3 +215,18 @@ class Comment(db.Model):
                 'email': self.trendit3_user.email
             }
         }
+
+
+class ItemCounterFlush(db.Model):
+    """A batch of view counts written to `Item.views_count`, recorded in the same transaction so it is never applied twice."""
+    __tablename__ = 'item_counter_flush'
+
+    batch_id = db.Column(db.String(32), primary_key=True)
+    flushed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+
+def backfill_comments_count() -> None:
+    """Sets Item.comments_count from the comment table, for items created before the column existed."""
+    comment_counts = db.select(db.func.count(Comment.id)).where(Comment.item_id == Item.id).scalar_subquery()
+    db.session.execute(db.update(Item).values(comments_count=comment_counts))
+    db.session.commit()
@@ -7,6 +7,11 @@ class Media(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(128), nullable=False)
     media_path = db.Column(db.String(256), nullable=True) # False
+    thumbnail_path = db.Column(db.String(256), nullable=True)
+    width = db.Column(db.Integer, nullable=True)
+    height = db.Column(db.Integer, nullable=True)
+    size = db.Column(db.Integer, nullable=True) # in bytes
+    content_hash = db.Column(db.String(64), nullable=True, index=True) # sha256 of the uploaded bytes
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     task_id = db.Column(db.Integer, db.ForeignKey('task.id'), nullable=True)
 
@@ -21,5 +26,9 @@ class Media(db.Model):
             'id': self.id,
             'filename': self.filename,
             'media_path': self.media_path,
+            'thumbnail_path': self.thumbnail_path,
+            'width': self.width,
+            'height': self.height,
+            'size': self.size,
             'created_at': self.created_at,
         }
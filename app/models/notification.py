@@ -5,6 +5,7 @@ Description: This module contains models and functions for notifications.
 """
 from datetime import datetime, timezone
 from sqlalchemy.orm import backref
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from enum import Enum
 
 from app.extensions import db
@@ -50,6 +51,10 @@ class UserMessageStatus(db.Model):
 # Notification model
 class Notification(db.Model):
     __tablename__ = 'notification'
+    __table_args__ = (
+        db.Index('ix_notification_recipient_type_created', 'recipient_id', 'notification_type', 'created_at'),
+        db.Index('ix_notification_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
     id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
     notification_type = db.Column(db.Enum(NotificationType), nullable=False, default=NotificationType.MESSAGE)
@@ -59,6 +64,9 @@ class Notification(db.Model):
     body = db.Column(db.Text, nullable=True, default=None)
     read = db.Column(db.Boolean, nullable=True, default=False)
     recipient_id = db.Column(db.Integer, db.ForeignKey('trendit3_user.id'), nullable=True)
+    
+    # Full-text search document, generated by postgres on insert/update of title or body
+    search_vector = db.Column(TSVECTOR, db.Computed("to_tsvector('english', coalesce(title, '') || ' ' || coalesce(body, ''))", persisted=True))
 
     # Relationships
     # recipients = db.relationship('Trendit3User', secondary=user_notification, backref='received_messages', lazy='dynamic')
@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from ..extensions import db
+
+
+class SeedVersion(db.Model):
+    """Records the version of each data seed applied to the database, so `flask seed` only runs what changed."""
+    __tablename__ = "seed_version"
+    
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<seed: {self.name}, version: {self.version}>"
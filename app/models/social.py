@@ -9,6 +9,7 @@ It includes fields for the user's social media profile links
 '''
 
 from enum import Enum
+from datetime import datetime
 
 from ..extensions import db
 
@@ -27,8 +28,20 @@ class SocialMediaProfile(db.Model):
     link = db.Column(db.String(200), default="", nullable=True)
     status = db.Column(db.Enum(SocialLinkStatus), default=SocialLinkStatus.IDLE)
     
+    created_at = db.Column(db.DateTime, nullable=True, default=datetime.utcnow)
+    
+    # review queue: the admin holding the profile and until when, then who decided and when
+    claimed_by_id = db.Column(db.Integer, db.ForeignKey('trendit3_user.id', ondelete='SET NULL'), nullable=True)
+    claimed_until = db.Column(db.DateTime, nullable=True)
+    reviewed_by_id = db.Column(db.Integer, db.ForeignKey('trendit3_user.id', ondelete='SET NULL'), nullable=True)
+    reviewed_at = db.Column(db.DateTime, nullable=True)
+    
     trendit3_user_id = db.Column(db.Integer, db.ForeignKey('trendit3_user.id', ondelete='CASCADE'), nullable=False,)
-    trendit3_user = db.relationship('Trendit3User', backref=db.backref('social_media_profiles', lazy='dynamic'))
+    trendit3_user = db.relationship('Trendit3User', foreign_keys=[trendit3_user_id], backref=db.backref('social_media_profiles', lazy='dynamic'))
+    
+    __table_args__ = (
+        db.Index("ix_social_media_profile_status_id", "status", "id"),
+    )
     
     def __repr__(self):
         return f'< primary ID: {self.id}, platform: {self.platform}, status: {self.status} >'
@@ -62,6 +75,23 @@ class SocialMediaProfile(db.Model):
             'link': self.link,
             'status': str(self.status.value)
         }
+    
+    def to_review_dict(self):
+        """Serializes the profile for the admin review queue. Load `trendit3_user.profile` eagerly."""
+        user = self.trendit3_user
+        return {
+            'id': self.id,
+            **self.to_dict(),
+            'created_at': self.created_at,
+            'claimed_by_id': self.claimed_by_id,
+            'claimed_until': self.claimed_until,
+            'owner': {
+                'id': user.id,
+                'username': user.username,
+                'email': user.email,
+                'full_name': f"{user.profile.firstname} {user.profile.lastname}" if user.profile else None,
+            },
+        }
 
 
 class SocialLinks(db.Model):
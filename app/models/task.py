@@ -5,7 +5,7 @@ from sqlalchemy.exc import IntegrityError
 
 from ..extensions import db
 from ..models import Media
-from ..utils.helpers.basic_helpers import generate_random_string
+from ..utils.helpers.basic_helpers import generate_random_string, save_with_unique_value
 
 
 class TaskStatus(Enum):
@@ -51,6 +51,7 @@ class Task(db.Model):
     reward_money = db.Column(db.Numeric(10, 2), default=110.00, nullable=True)
     
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    date_paid = db.Column(db.DateTime, nullable=True) # when payment_status became complete
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     total_allocated = db.Column(db.Integer, default=0, nullable=True)
     total_success = db.Column(db.Integer, default=0, nullable=True)
@@ -69,6 +70,10 @@ class Task(db.Model):
         'polymorphic_identity': 'task'
     }
     
+    __table_args__ = (
+        db.Index("ix_task_payment_status_date_paid", "payment_status", "date_paid"), # leaderboard rebuilds
+    )
+    
     @property
     def total_performances(self) -> int:
         """Returns the total number times the task has been performed."""
@@ -76,32 +81,20 @@ class Task(db.Model):
     
     @classmethod
     def create_task(cls, trendit3_user_id, task_type, platform, fee, fee_paid, payment_status, **kwargs):
-        the_task_ref = generate_random_string(20)
-        counter = 1
-        max_attempts = 6  # maximum number of attempts to create a unique task_key
-        
-        while cls.query.filter_by(task_key=the_task_ref).first() is not None:
-            if counter > max_attempts:
-                raise ValueError(f"Unable to create a unique task after {max_attempts} attempts.")
-            the_task_ref = f"{generate_random_string(20)}-{generate_random_string(4)}-{counter}"
-            counter += 1
-        
-        task = cls(trendit3_user_id=trendit3_user_id, task_type=task_type, platform=platform, fee=fee, fee_paid=fee_paid, task_key=the_task_ref, payment_status=payment_status, **kwargs)
-        
-        # Set additional attributes from kwargs
-        for key, value in kwargs.items():
-            setattr(task, key, value)
-        
-        db.session.add(task)
-        db.session.commit()
+        task = cls(trendit3_user_id=trendit3_user_id, task_type=task_type, platform=platform, fee=fee, fee_paid=fee_paid, payment_status=payment_status, **kwargs)
         
-        return task
+        # 20 random characters practically never collide; the unique constraint catches it if they do
+        return save_with_unique_value(task, "task_key", lambda attempt: generate_random_string(20))
     
     def update(self, **kwargs):
         for key, value in kwargs.items():
             setattr(self, key, value)
         db.session.commit()
     
+    def mark_paid(self):
+        """Completes the task's payment, keeping the time it was first paid."""
+        self.update(payment_status=TaskPaymentStatus.COMPLETE, date_paid=self.date_paid or datetime.utcnow())
+    
     def delete(self):
         db.session.delete(self)
         db.session.commit()
@@ -271,7 +264,7 @@ class EngagementTask(Task):
 
 class TaskPerformance(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    key = db.Column(db.String(120), unique=True, nullable=False, default=generate_random_string(20))
+    key = db.Column(db.String(120), unique=True, nullable=False, default=lambda: f"{generate_random_string(20)}_pt")
     task_type = db.Column(db.String(80), nullable=False)  # either 'advert' or 'engagement'
     reward_money = db.Column(db.Numeric(10, 2), nullable=True)
     account_name = db.Column(db.String(255), nullable=True)
@@ -289,6 +282,10 @@ class TaskPerformance(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('trendit3_user.id'), nullable=False)
     trendit3_user = db.relationship('Trendit3User', backref=db.backref('performed_tasks', lazy='dynamic'))
     
+    __table_args__ = (
+        db.Index("ix_task_performance_status_date_completed", "status", "date_completed"), # leaderboard rebuilds
+    )
+    
     @property
     def platform(self):
         return self.task.platform
@@ -298,22 +295,9 @@ class TaskPerformance(db.Model):
     
     @classmethod
     def create_task_performance(cls, user_id, task_id, task_type, reward_money, proof_screenshot, account_name, post_link, status):
-        the_task_key = f"{generate_random_string(20)}_pt"
-        counter = 1
-        max_attempts = 6  # maximum number of attempts to create a unique task_key
-        
-        while cls.query.filter_by(key=the_task_key).first() is not None:
-            if counter > max_attempts:
-                raise ValueError(f"Unable to create a unique task after {max_attempts} attempts.")
-            the_task_key = f"{generate_random_string(20)}-{generate_random_string(4)}-{counter}"
-            counter += 1
-        
-        task = cls(user_id=user_id, task_id=task_id, key=the_task_key, task_type=task_type, reward_money=reward_money, proof_screenshot=proof_screenshot, account_name=account_name, post_link=post_link, status=status)
-        
-        db.session.add(task)
-        db.session.commit()
+        task = cls(user_id=user_id, task_id=task_id, task_type=task_type, reward_money=reward_money, proof_screenshot=proof_screenshot, account_name=account_name, post_link=post_link, status=status)
         
-        return task
+        return save_with_unique_value(task, "key", lambda attempt: f"{generate_random_string(20)}_pt")
     
     def update(self, **kwargs):
         for key, value in kwargs.items():
@@ -336,6 +320,21 @@ class TaskPerformance(db.Model):
         else:
             return None
     
+    def get_screenshot_reuses(self) -> list[int]:
+        """Returns the IDs of other performances whose proof screenshot has the same content."""
+        if not self.proof_screenshot_id:
+            return []
+        
+        content_hash = db.session.query(Media.content_hash).filter(Media.id == self.proof_screenshot_id).scalar()
+        if not content_hash:
+            return []
+        
+        reuses = db.session.query(TaskPerformance.id) \
+            .join(Media, TaskPerformance.proof_screenshot_id == Media.id) \
+            .filter(Media.content_hash == content_hash, TaskPerformance.id != self.id) \
+            .all()
+        return [pt_id for (pt_id,) in reuses]
+    
     @property
     def get_task(self) -> Task | AdvertTask | EngagementTask:
         task_model = (AdvertTask if self.task_type == 'advert' else EngagementTask if self.task_type == 'engagement' else Task)
@@ -11,7 +11,6 @@ as well as methods for password hashing and verification.
 
 from sqlalchemy.orm import backref, validates
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask import current_app
 
 from ..extensions import db
@@ -20,6 +19,8 @@ from .social import SocialMediaProfile
 from .role import Role, user_roles
 from .notification import Notification, user_notification
 from .payment import TransactionType
+from ..utils.helpers.password_helpers import hash_password, needs_rehash, verify_password_hash
+from ..utils.helpers.loggers import log_exception
 from enum import Enum
 from config import Config
 
@@ -66,6 +67,7 @@ class Trendit3User(db.Model):
     
     # notifications = db.relationship("Notification", secondary="user_notification", backref=db.backref("users", lazy="dynamic"))
     notifications = db.relationship("Notification", secondary="user_notification", back_populates="recipients")
+    primary_bank_account = db.relationship("BankAccount", primaryjoin="and_(Trendit3User.id == BankAccount.trendit3_user_id, BankAccount.is_primary == True)", uselist=False, viewonly=True)
 
     @property
     def password(self):
@@ -73,13 +75,24 @@ class Trendit3User(db.Model):
     
     @password.setter
     def password(self, password):
-        self.thePassword = generate_password_hash(password)
+        self.thePassword = hash_password(password)
     
-    def verify_password(self, password):
+    def verify_password(self, password, rehash=True):
         """
         #This returns True if the password is same as hashed password in the database.
+        
+        If the hash was made with older hashing parameters, it is upgraded to the current policy.
         """
-        return check_password_hash(self.thePassword, password)
+        is_valid = verify_password_hash(self.thePassword, password)
+        
+        if is_valid and rehash and needs_rehash(self.thePassword):
+            try:
+                self.update(thePassword=hash_password(password))
+            except Exception as e:
+                db.session.rollback()
+                log_exception("Could not upgrade password hash", e)
+        
+        return is_valid
     
     @property
     def full_name(self):
@@ -212,45 +225,64 @@ class Trendit3User(db.Model):
         self.membership.membership_fee_paid = paid
         db.session.commit()
     
-    def to_dict(self) -> dict:
+    def to_dict(self, level: str = "full", sections: list[str] | None = None) -> dict:
+        """
+        Serializes the user.
+
+        Args:
+            level (str): "summary", "standard" or "full". See USER_DATA_LEVELS for the sections each includes.
+            sections (list[str], optional): Sections to include on top of the basic user fields, instead of a level.
+
+        Use `user_helpers.get_user_data` to load the user with the sections eager loaded.
+        """
+        sections = set(sections) if sections else set(USER_DATA_LEVELS.get(level, USER_DATA_LEVELS["full"]))
         
-        address_info = {}
-        if self.address:
+        user_dict = {
+            "id": self.id,
+            "username": self.username,
+            "email": self.email,
+            "date_joined": self.date_joined,
+        }
+        
+        if "membership" in sections:
+            user_dict["membership_fee"] = self.membership.membership_fee_paid if self.membership else False
+        
+        if "wallet" in sections and self.wallet:
+            user_wallet = self.wallet.to_dict()
+            user_wallet.pop("id")
+            user_dict["wallet"] = user_wallet
+        
+        if "social_profiles" in sections:
+            user_dict["social_profiles"] = [social_profile.to_dict() for social_profile in self.social_media_profiles]
+        
+        if "primary_bank" in sections:
+            user_dict["primary_bank"] = self.primary_bank_account.to_dict() if self.primary_bank_account else {}
+        
+        if "roles" in sections:
+            user_dict["roles"] = self.role_names
+        
+        if "two_fa" in sections:
+            user_dict["two_fa"] = self.two_fa_info()
+        
+        if "address" in sections and self.address:
             address_info = self.address.to_dict()
             address_info.pop("id")
+            user_dict.update(address_info) # Merge address information into the output dictionary
         
-        profile_data = {}
-        if self.profile:
+        if "profile" in sections and self.profile:
             profile_data = self.profile.to_dict()
             profile_data.pop("id")
+            user_dict.update(profile_data) # Merge profile information into the output dictionary
         
-        bank_details = {}
-        primary_bank = BankAccount.query.filter_by(trendit3_user_id=self.id, is_primary=True).first()
-        if primary_bank:
-            bank_details.update(primary_bank.to_dict())
-        
-        user_wallet = self.wallet.to_dict()
-        user_wallet.pop("id")
-        wallet_info = user_wallet
-        
-        user_social_profiles = self.social_media_profiles
-        social_profiles = [social_profile.to_dict() for social_profile in user_social_profiles]
-        
-        return {
-            "id": self.id,
-            "username": self.username,
-            "email": self.email,
-            "date_joined": self.date_joined,
-            "membership_fee": self.membership.membership_fee_paid,
-            "wallet": wallet_info,
-            "social_profiles": social_profiles,
-            "primary_bank": bank_details,
-            "roles": self.role_names,
-            "two_fa": self.two_fa_info(),
-            **address_info,  # Merge address information into the output dictionary
-            **profile_data # Merge profile information into the output dictionary
-        }
+        return user_dict
+
 
+# Sections of the user data included at each serialization level
+USER_DATA_LEVELS = {
+    "summary": ("membership", "roles"),
+    "standard": ("membership", "roles", "wallet", "two_fa", "address", "profile"),
+    "full": ("membership", "roles", "wallet", "two_fa", "address", "profile", "primary_bank", "social_profiles"),
+}
 
 
 class Profile(db.Model):
@@ -283,14 +315,7 @@ class Profile(db.Model):
     
     @property
     def profile_pic(self):
-        if self.profile_picture_id:
-            theImage = Media.query.get(self.profile_picture_id)
-            if theImage:
-                return theImage.get_path()
-            else:
-                return ""
-        else:
-            return ""
+        return self.profile_picture.get_path() if self.profile_picture else ""
         
     def to_dict(self):
         return {
@@ -372,6 +397,9 @@ class OneTimeToken(db.Model):
         }
 
 
+REFERRAL_REWARD = 500 # Naira credited to the referrer when the referee pays the membership fee
+
+
 class ReferralHistory(db.Model):
     __tablename__ = "referral_history"
     
@@ -381,8 +409,15 @@ class ReferralHistory(db.Model):
     status = db.Column(db.String(900), nullable=False, unique=False)
     date_joined = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
+    # trendit3_user is the referrer; referee is the account created from the referral, once it exists
     trendit3_user_id = db.Column(db.Integer, db.ForeignKey("trendit3_user.id", ondelete="CASCADE"), nullable=False)
-    trendit3_user = db.relationship("Trendit3User", backref=db.backref("referrals", lazy="dynamic"))
+    trendit3_user = db.relationship("Trendit3User", foreign_keys=[trendit3_user_id], backref=db.backref("referrals", lazy="dynamic"))
+    referee_id = db.Column(db.Integer, db.ForeignKey("trendit3_user.id", ondelete="SET NULL"), nullable=True, unique=True)
+    referee = db.relationship("Trendit3User", foreign_keys=[referee_id])
+    
+    __table_args__ = (
+        db.Index("ix_referral_history_referrer_date_joined", "trendit3_user_id", "date_joined"),
+    )
     
     def __repr__(self):
         return f"<ID: {self.id}, user ID: {self.trendit3_user_id}, referred_username: {self.username}, status: {self.status}>"
@@ -410,10 +445,75 @@ class ReferralHistory(db.Model):
             "username": self.username,
             "status": self.status,
             "referrer_id": self.trendit3_user_id,
+            "referee_id": self.referee_id,
             "date": self.date_joined,
         }
 
 
+class ReferralStats(db.Model):
+    """Running referral totals of a referrer, kept up to date on signup and membership payment."""
+    __tablename__ = "referral_stats"
+    
+    trendit3_user_id = db.Column(db.Integer, db.ForeignKey("trendit3_user.id", ondelete="CASCADE"), primary_key=True)
+    invited = db.Column(db.Integer, nullable=False, default=0, server_default="0") # verified their email with the referral code
+    registered = db.Column(db.Integer, nullable=False, default=0, server_default="0") # completed their registration
+    paid = db.Column(db.Integer, nullable=False, default=0, server_default="0") # paid the membership fee
+    earned = db.Column(db.Numeric(14, 2), nullable=False, default=0, server_default="0") # referral rewards credited, in Naira
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    trendit3_user = db.relationship("Trendit3User", backref=db.backref("referral_stats", uselist=False))
+    
+    __table_args__ = (
+        db.Index("ix_referral_stats_registered", "registered"),
+    )
+    
+    def __repr__(self):
+        return f"<referrer ID: {self.trendit3_user_id}, registered: {self.registered}, paid: {self.paid}>"
+    
+    def to_dict(self):
+        return {
+            "invited": self.invited,
+            "registered": self.registered,
+            "paid": self.paid,
+            "earned": float(self.earned),
+        }
+
+
+def backfill_referral_stats() -> None:
+    """Links referral history to the referees' accounts and rebuilds ReferralStats from it."""
+    # referee_id is unique: link each account to one history row only, the newest with its email
+    db.session.execute(db.text("""
+        UPDATE referral_history SET referee_id = matched.user_id
+        FROM (
+            SELECT DISTINCT ON (trendit3_user.id) trendit3_user.id AS user_id, referral_history.id AS history_id
+            FROM referral_history
+            JOIN trendit3_user ON trendit3_user.email = referral_history.email
+            WHERE referral_history.referee_id IS NULL
+              AND NOT EXISTS (SELECT 1 FROM referral_history linked WHERE linked.referee_id = trendit3_user.id)
+            ORDER BY trendit3_user.id, referral_history.date_joined DESC, referral_history.id DESC
+        ) AS matched
+        WHERE referral_history.id = matched.history_id
+    """))
+    db.session.execute(db.text("""
+        INSERT INTO referral_stats (trendit3_user_id, invited, registered, paid, earned, updated_at)
+        SELECT trendit3_user_id,
+               count(*),
+               count(*) FILTER (WHERE status IN ('registered', 'completed')),
+               count(*) FILTER (WHERE status = 'completed'),
+               coalesce(sum(:reward) FILTER (WHERE status = 'completed'), 0),
+               now()
+        FROM referral_history
+        GROUP BY trendit3_user_id
+        ON CONFLICT (trendit3_user_id) DO UPDATE SET
+            invited = EXCLUDED.invited,
+            registered = EXCLUDED.registered,
+            paid = EXCLUDED.paid,
+            earned = EXCLUDED.earned,
+            updated_at = EXCLUDED.updated_at
+    """), {"reward": REFERRAL_REWARD})
+    db.session.commit()
+
+
 class BankAccount(db.Model):
     __tablename__ = "bank_account"
 
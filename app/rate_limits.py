@@ -0,0 +1,98 @@
+'''
+This module contains the rate limit policies of the Trendit³ Flask application, all in one place.
+
+Each policy maps an endpoint to the limits applied to it. Limits are counted per user when the
+request carries a valid access token and per IP address otherwise. Expensive endpoints also draw
+from a shared per-user budget, where each call costs more than one hit.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from dataclasses import dataclass
+from flask import Flask
+from flask_limiter.util import get_remote_address
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+
+from .extensions import limiter
+
+
+def get_ip_key() -> str:
+    return f"ip:{get_remote_address()}"
+
+
+def get_user_key() -> str:
+    """Keys limits by the logged in user, falling back to the IP address for anonymous requests."""
+    try:
+        verify_jwt_in_request(optional=True)
+        user_id = get_jwt_identity()
+    except Exception:
+        user_id = None
+
+    return f"user:{user_id}" if user_id else get_ip_key()
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    limit: str
+    key: str = "ip" # "ip" or "user"
+    cost: int = 1
+    scope: str | None = None # limits with the same scope share one budget
+
+
+KEY_FUNCS = {
+    "ip": get_ip_key,
+    "user": get_user_key,
+}
+
+# Budget shared by the endpoints that trigger the most work (task generation, payments, payouts)
+EXPENSIVE_BUDGET = "60/hour"
+
+RATE_LIMIT_POLICIES: dict[str, list[RateLimitPolicy]] = {
+    # Auth
+    "api.signUp": [RateLimitPolicy("5/minute;30/hour")],
+    "api.verify_email": [RateLimitPolicy("10/minute")],
+    "api.complete_registration": [RateLimitPolicy("10/minute")],
+    "api.login": [RateLimitPolicy("10/minute;100/hour")],
+    "api.verify_2fa": [RateLimitPolicy("10/minute")],
+    "api.forgot_password": [RateLimitPolicy("3/minute;20/hour")],
+    "api.reset_password": [RateLimitPolicy("5/minute")],
+    "api.resend_code": [RateLimitPolicy("3/minute;20/hour")],
+    "api_admin.admin_login": [RateLimitPolicy("3/minute")],
+    "api_admin.verify_admin_login": [RateLimitPolicy("10/minute")],
+
+    # Marketplace
+    "api.search_items": [RateLimitPolicy("60/minute")],
+
+    # Task generation and payments
+    "api.generate_task": [RateLimitPolicy("10/minute", key="user"), RateLimitPolicy(EXPENSIVE_BUDGET, key="user", cost=2, scope="expensive")],
+    "api.create_task": [RateLimitPolicy("5/minute", key="user"), RateLimitPolicy(EXPENSIVE_BUDGET, key="user", cost=3, scope="expensive")],
+    "api.make_payment": [RateLimitPolicy("5/minute", key="user"), RateLimitPolicy(EXPENSIVE_BUDGET, key="user", cost=3, scope="expensive")],
+    "api.verify_payment": [RateLimitPolicy("10/minute", key="user")],
+    "api.withdraw": [RateLimitPolicy("1/minute", key="user"), RateLimitPolicy(EXPENSIVE_BUDGET, key="user", cost=5, scope="expensive")],
+    "api_admin.payout": [RateLimitPolicy("10/minute", key="user")],
+    "api_admin.verify_payout_otp": [RateLimitPolicy("10/minute", key="user")],
+}
+
+
+def register_rate_limits(app: Flask) -> None:
+    """
+    Applies the rate limit policies to the registered view functions.
+
+    Must run after the blueprints are registered.
+    """
+    for endpoint, policies in RATE_LIMIT_POLICIES.items():
+        view_func = app.view_functions.get(endpoint)
+        if view_func is None:
+            app.logger.warning(f"Rate limit policy set for unknown endpoint: {endpoint}")
+            continue
+
+        for policy in policies:
+            key_func = KEY_FUNCS[policy.key]
+            if policy.scope:
+                decorator = limiter.shared_limit(policy.limit, scope=policy.scope, key_func=key_func, cost=policy.cost)
+            else:
+                decorator = limiter.limit(policy.limit, key_func=key_func, cost=policy.cost)
+            view_func = decorator(view_func)
+
+        app.view_functions[endpoint] = view_func
@@ -1,7 +1,7 @@
 '''
 This package contains the API routes for the Trendit³ Flask application.
 
-It includes routes for authentication, payments, items, item interactions, location, task, task performance, profile, referral, religions, stats, and banks.
+It includes routes for authentication, payments, items, item interactions, location, task, task performance, profile, referral, leaderboard, religions, stats, and banks.
 
 A Flask blueprint named 'api' is created to group these routes, and it is registered under the '/api' URL prefix.
 
@@ -13,7 +13,7 @@ from flask import Blueprint, render_template
 
 api = Blueprint('api', __name__, url_prefix='/api')
 
-from . import (error_handlers, auth, payment, items, item_interactions, location, social_profile, social_platforms, task, task_performance, profile, referral, religions, stats, banks, notification, settings, transactions, social_auth, pricing, task_option)
+from . import (error_handlers, auth, payment, items, item_interactions, location, social_profile, social_platforms, task, task_performance, profile, referral, leaderboard, religions, stats, banks, notification, settings, transactions, social_auth, pricing, task_option)
 
 @api.route("/", methods=['GET'])
 def index():
@@ -5,13 +5,16 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from . import api
 from ...extensions import db
 from ...models import Trendit3User
+from ...decorators import cached_response
 from ...utils.payments.flutterwave import get_banks, get_bank_code, flutterwave_verify_bank_account
 from ...utils.helpers.basic_helpers import log_exception, console_log
+from ...utils.helpers.cache_helpers import current_user_country
 from ...utils.helpers.response_helpers import error_response, success_response
 
 
 @api.route("/banks", methods=["GET"])
 @jwt_required()
+@cached_response("banks", vary=current_user_country, private=True)
 def supported_banks():
     """
     Get a list of all supported banks.
@@ -28,6 +31,9 @@ def supported_banks():
         country = user.address.country or "Nigeria"
         
         banks = get_banks(country)
+        if banks is None:
+            # not a 200, so the empty list isn't cached
+            return error_response("The payment gateway did not return the supported banks, try again later", 502)
         
         extra_data = { "supported_banks": banks }
         api_response = success_response("supported banks fetched successfully", 200, extra_data)
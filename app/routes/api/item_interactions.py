@@ -31,3 +31,8 @@ def view_item(item_id_slug):
 def add_comment(item_id_slug):
     return ItemInteractionsController.add_comment(item_id_slug)
 
+
+# Route for reading the comments of an item, newest first
+@api.route('/items/<item_id_slug>/comments', methods=['GET'])
+def get_comments(item_id_slug):
+    return ItemInteractionsController.get_comments(item_id_slug)
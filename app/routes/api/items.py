@@ -10,6 +10,12 @@ def list_items():
 
 
 
+@api.route('/items/search', methods=['GET'])
+def search_items():
+    return ItemController.search_items()
+
+
+
 @api.route('/items/new', methods=['POST'])
 @jwt_required()
 def create_item():
@@ -0,0 +1,10 @@
+from flask_jwt_extended import jwt_required
+
+from . import api
+from app.controllers.api import LeaderboardController
+
+
+@api.route('/leaderboards/<board>', methods=['GET'])
+@jwt_required()
+def get_leaderboard(board):
+    return LeaderboardController.get_leaderboard(board)
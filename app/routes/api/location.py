@@ -2,9 +2,11 @@ from flask import request
 
 from . import api
 from app.controllers.api import LocationController
+from app.decorators import cached_response
 
 
 @api.route('/countries', methods=['GET'])
+@cached_response("countries")
 def get_countries():
     return LocationController.get_supported_countries()
 
@@ -16,3 +18,7 @@ def get_states():
 @api.route('/states/lga', methods=['POST'])
 def naija_states_lga():
     return LocationController.get_naija_state_lga()
+
+@api.route('/states/lga', methods=['GET'])
+def all_naija_states_lga():
+    return LocationController.get_all_naija_states_lga()
@@ -1,7 +1,6 @@
 from flask_jwt_extended import jwt_required
 
 from . import api
-from ...extensions import limiter
 from app.controllers.api.payment import PaymentController
 from ...decorators.membership import membership_required
 
@@ -55,7 +54,6 @@ def payment_hook():
 @api.route('/payment/withdraw', methods=['POST'])
 @jwt_required()
 @membership_required()
-# @limiter.limit("1/minute")
 def withdraw():
     """
     Process for users to Withdraw money into their bank accounts.
@@ -1,6 +1,8 @@
 from . import api
 from app.controllers.api.pricing import PricingController
+from app.decorators import cached_response
 
 @api.route('/pricing', methods=['GET'])
+@cached_response("pricing")
 def get_all_pricing():
     return PricingController.get_all_pricing()
@@ -14,3 +14,15 @@ def generate_referral_link():
 @jwt_required()
 def get_referral_history():
     return ReferralController.get_referral_history()
+
+
+@api.route('/referral/stats', methods=['GET'])
+@jwt_required()
+def get_referral_stats():
+    return ReferralController.get_referral_stats()
+
+
+@api.route('/referral/top', methods=['GET'])
+@jwt_required()
+def get_top_referrers():
+    return ReferralController.get_top_referrers()
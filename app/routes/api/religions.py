@@ -2,6 +2,7 @@ import logging
 from flask import request
 
 from . import api
+from app.decorators import cached_response
 from app.utils.helpers.response_helpers import error_response, success_response
 
 # list of all practiced religions
@@ -64,6 +65,7 @@ religions = [
 
 # RELIGIONS ENDPOINTS
 @api.route("/religions", methods=['GET'])
+@cached_response("religions")
 def get_all_religion():
     """
     Get a list of all practiced religions.
@@ -1,8 +1,10 @@
 from flask_jwt_extended import jwt_required
 from . import api
 from app.controllers.api import SocialMediaPlatformsController
+from app.decorators import cached_response
 
 
 @api.route('/social-platforms', methods=["GET"])
+@cached_response("social_platforms")
 def get_social_media_platforms():
     return SocialMediaPlatformsController.get_social_media_platforms()
\ No newline at end of file
@@ -3,7 +3,7 @@ from flask_jwt_extended import jwt_required
 
 from . import api
 from ...controllers.api import TaskController
-from ...decorators import roles_required
+from ...decorators import roles_required, cached_response
 from ...utils.helpers.response_helpers import success_response
 
 # CREATE NEW TASK
@@ -18,6 +18,7 @@ def get_all_tasks():
     return TaskController.get_tasks()
 
 @api.route('/tasks/counts/<field>', methods=['GET'])
+@cached_response("task_counts")
 def get_all_aggregated_task_counts(field):
     return TaskController.get_all_aggregated_task_counts(field)
 
@@ -88,6 +89,7 @@ def get_advert_tasks_grouped_by_field(field):
     return TaskController.get_advert_tasks_grouped_by_field(field)
 
 @api.route('/tasks/advert/counts/<field>', methods=['GET'])
+@cached_response("task_counts")
 def get_advert_aggregated_task_counts(field):
     return TaskController.get_advert_aggregated_task_counts(field)
 
@@ -101,6 +103,7 @@ def get_engagement_tasks_grouped_by_field(field):
     return TaskController.get_engagement_tasks_grouped_by_field(field)
 
 @api.route('/tasks/engagement/counts/<field>', methods=['GET'])
+@cached_response("task_counts")
 def get_engagement_aggregated_task_counts(field):
     return TaskController.get_engagement_aggregated_task_counts(field)
 
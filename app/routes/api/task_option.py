@@ -3,10 +3,13 @@ from flask_jwt_extended import jwt_required
 
 from . import api
 from ...controllers.api import TaskOptionsController
+from ...decorators import cached_response
+from ...utils.helpers.cache_helpers import current_user_currency
 from ...utils.helpers.response_helpers import success_response
 
 # CREATE NEW TASK
 @api.route('/task_options', methods=['GET'])
 @jwt_required()
+@cached_response("task_options", vary=current_user_currency, private=True)
 def get_task_options():
     return TaskOptionsController.get_task_options()
\ No newline at end of file
@@ -9,6 +9,21 @@ from ...controllers.api_admin import AdminSocialProfileController
 def get_social_profiles():
     return AdminSocialProfileController.get_social_profiles()
 
+@bp.route('/social-profiles/queue', methods=["GET"])
+@roles_required('Junior Admin')
+def get_social_profile_review_queue():
+    return AdminSocialProfileController.get_review_queue()
+
+@bp.route('/social-profiles/claim', methods=['POST'])
+@roles_required('Junior Admin')
+def claim_social_profiles():
+    return AdminSocialProfileController.claim_social_profiles()
+
+@bp.route('/social-profiles/review', methods=['POST'])
+@roles_required('Junior Admin')
+def review_social_profiles():
+    return AdminSocialProfileController.review_social_profiles()
+
 @bp.route('/social-profiles/<profile_id>/approve', methods=['POST'])
 @roles_required('Junior Admin')
 def approve_social_media_profile(profile_id):
@@ -8,3 +8,12 @@ from ...decorators import roles_required
 def get_pending_social_profiles():
     return SocialProfilesTelegramController.get_pending_social_profiles()
 
+@telegram_bp.route('/pending-socials/claim', methods=["POST"])
+@roles_required("Super Admin", "Admin", "Junior Admin")
+def claim_social_profiles():
+    return SocialProfilesTelegramController.claim_social_profiles()
+
+@telegram_bp.route('/pending-socials/review', methods=["POST"])
+@roles_required("Super Admin", "Admin", "Junior Admin")
+def review_social_profiles():
+    return SocialProfilesTelegramController.review_social_profiles()
@@ -0,0 +1,32 @@
+from flask import Flask
+
+from .password import benchmark_password_hash
+from .rate_limit import benchmark_rate_limit, check_rate_limits
+from .seed import seed
+from .startup import benchmark_startup
+from .imports import profile_imports
+from .db_pool import benchmark_db_pool
+from .item_search import benchmark_item_search
+from .notification_search import benchmark_notification_search
+from .image_normalization import benchmark_image_normalization
+from .unique_keys import check_unique_slugs
+
+
+def register_commands(app: Flask) -> None:
+    """
+    Function to register all custom `flask` CLI commands.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    app.cli.add_command(benchmark_password_hash)
+    app.cli.add_command(benchmark_rate_limit)
+    app.cli.add_command(check_rate_limits)
+    app.cli.add_command(seed)
+    app.cli.add_command(benchmark_startup)
+    app.cli.add_command(profile_imports)
+    app.cli.add_command(benchmark_db_pool)
+    app.cli.add_command(benchmark_item_search)
+    app.cli.add_command(benchmark_notification_search)
+    app.cli.add_command(benchmark_image_normalization)
+    app.cli.add_command(check_unique_slugs)
@@ -0,0 +1,82 @@
+'''
+This module contains the CLI command that load tests the database connection pool.
+
+`flask benchmark-db-pool` runs the same concurrent workload against pools of different
+sizes and reports latency percentiles for each, including the time spent waiting for a
+connection. Use it to pick DB_POOL_SIZE and DB_MAX_OVERFLOW for a given number of
+gunicorn threads; remember Postgres' max_connections is shared by every process.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import time
+from concurrent.futures import ThreadPoolExecutor
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+
+def percentile(timings: list[float], share: float) -> float:
+    return timings[max(int(len(timings) * share) - 1, 0)]
+
+
+def run_workload(engine, requests: int, concurrency: int, query_ms: float) -> tuple[list[float], list[float], int]:
+    """Runs `requests` queries from `concurrency` threads. Returns total latencies, checkout waits and timeouts."""
+    statement = text("SELECT pg_sleep(:seconds)")
+
+    def one_request():
+        start = time.perf_counter()
+        try:
+            with engine.connect() as connection:
+                checked_out = time.perf_counter()
+                connection.execute(statement, {"seconds": query_ms / 1000})
+        except PoolTimeoutError:
+            return None
+        end = time.perf_counter()
+        return (end - start) * 1000, (checked_out - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: one_request(), range(requests)))
+
+    completed = [result for result in results if result is not None]
+    latencies = sorted(latency for latency, _wait in completed)
+    waits = sorted(wait for _latency, wait in completed)
+    return latencies, waits, len(results) - len(completed)
+
+
+@click.command("benchmark-db-pool")
+@click.option("--pool-sizes", default="2,5,10,20", show_default=True, help="Comma separated pool sizes to compare.")
+@click.option("--max-overflow", default=0, show_default=True, help="Overflow connections allowed on top of each pool size.")
+@click.option("--concurrency", default=20, show_default=True, help="Threads sending queries at the same time.")
+@click.option("--requests", "requests", default=500, show_default=True, help="Queries to run per pool size.")
+@click.option("--query-ms", default=20.0, show_default=True, help="How long each query takes on the server.")
+@with_appcontext
+def benchmark_db_pool(pool_sizes, max_overflow, concurrency, requests, query_ms):
+    """Compares p50/p99 latency and checkout wait across pool sizes."""
+    options = current_app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {})
+    click.echo(f"{'pool':>6}{'p50 ms':>10}{'p99 ms':>10}{'wait p99':>10}{'timeouts':>10}")
+
+    for pool_size in [int(size) for size in pool_sizes.split(",")]:
+        engine = create_engine(
+            current_app.config["SQLALCHEMY_DATABASE_URI"],
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=options.get("pool_timeout", 10),
+            pool_pre_ping=True,
+        )
+        try:
+            latencies, waits, timeouts = run_workload(engine, requests, concurrency, query_ms)
+        finally:
+            engine.dispose()
+
+        if not latencies:
+            click.echo(f"{pool_size:>6}{'-':>10}{'-':>10}{'-':>10}{timeouts:>10}")
+            continue
+
+        click.echo(
+            f"{pool_size:>6}{percentile(latencies, 0.5):>10.1f}{percentile(latencies, 0.99):>10.1f}"
+            f"{percentile(waits, 0.99):>10.1f}{timeouts:>10}"
+        )
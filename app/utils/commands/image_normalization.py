@@ -0,0 +1,78 @@
+'''
+This module contains the CLI command that benchmarks image normalization.
+
+`flask benchmark-image-normalization photo1.jpg photo2.png` runs each image through
+`normalize_image` with the current MEDIA_* settings and reports the bytes saved and the
+upload time that saves at a given uplink speed. Without files, a synthetic phone-sized
+photo is used.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import os, time, statistics
+from io import BytesIO
+import click
+from flask.cli import with_appcontext
+
+
+def synthetic_photo(width: int = 4032, height: int = 3024) -> BytesIO:
+    """A noisy 12 MP JPEG, about as hard to compress as a phone photo."""
+    from PIL import Image
+
+    image = Image.merge("RGB", [Image.effect_noise((width, height), sigma) for sigma in (40, 50, 60)])
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=95)
+    buffer.name = "synthetic.jpg"
+    return buffer
+
+
+@click.command("benchmark-image-normalization")
+@click.argument("paths", nargs=-1, type=click.Path(exists=True, dir_okay=False))
+@click.option("--rounds", default=5, show_default=True, help="Times to normalize each image.")
+@click.option("--uplink-mbps", default=10.0, show_default=True, help="Upload speed used to estimate the upload time saved.")
+@with_appcontext
+def benchmark_image_normalization(paths, rounds, uplink_mbps):
+    """Reports the size and upload time saved by normalizing images before upload."""
+    from ..helpers.image_helpers import normalize_image # Pillow is only loaded when the command runs
+
+    if paths:
+        images = []
+        for path in paths:
+            with open(path, "rb") as image_file:
+                buffer = BytesIO(image_file.read())
+            images.append((os.path.basename(path), buffer))
+    else:
+        images = [("synthetic.jpg", synthetic_photo())]
+
+    bytes_per_second = uplink_mbps * 1_000_000 / 8
+    total_original = total_processed = 0
+
+    click.echo(f"{'image':<24}{'original KB':>13}{'processed KB':>14}{'thumb KB':>10}{'saved':>8}{'ms p50':>9}{'ms p95':>9}{'upload s saved':>16}")
+    for name, buffer in images:
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            processed = normalize_image(buffer, name)
+            timings.append((time.perf_counter() - start) * 1000)
+        if not processed:
+            click.echo(f"{name:<24}  not processed (unsupported or unreadable)")
+            continue
+
+        original, size = processed["original_size"], processed["size"]
+        thumbnail_size = processed["thumbnail"].getbuffer().nbytes
+        total_original += original
+        total_processed += size + thumbnail_size
+
+        # the thumbnail is an extra upload, so it counts against the savings
+        upload_saved = (original - size - thumbnail_size) / bytes_per_second
+        timings.sort()
+        p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+        click.echo(
+            f"{name[:23]:<24}{original / 1024:>13.1f}{size / 1024:>14.1f}{thumbnail_size / 1024:>10.1f}"
+            f"{1 - size / original:>8.0%}{statistics.median(timings):>9.1f}{p95:>9.1f}{upload_saved:>16.2f}"
+        )
+
+    if total_original:
+        saved = total_original - total_processed
+        click.echo(f"\ntotal: {saved / 1024:.1f} KB saved ({saved / total_original:.0%}), {saved / bytes_per_second:.2f} s of upload at {uplink_mbps:g} Mbps")
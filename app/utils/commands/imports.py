@@ -0,0 +1,74 @@
+'''
+This module contains the CLI command that profiles what the app imports when it boots.
+
+`flask profile-imports` runs `create_app()` under `python -X importtime` in a fresh interpreter and
+reports the import cost per package (and per subpackage of the app). It exits with an error when the
+total goes over the budget or a module that should be lazy-loaded is imported at boot, so it can run in CI.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import os, sys, subprocess, resource
+from collections import defaultdict
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+# Heavy modules only some requests need. They must not be imported while the app boots.
+LAZY_MODULES = ("pandas", "reportlab", "qrcode", "cloudinary", "PIL", "openpyxl")
+
+PROFILE_SCRIPT = "import app; app.create_app()"
+
+
+def group_name(module: str) -> str:
+    """Groups `app.*` modules by subpackage (e.g. app.utils.helpers) and everything else by top-level package."""
+    parts = module.split(".")
+    if parts[0] == "app":
+        return ".".join(parts[:3]) if parts[1:2] == ["utils"] else ".".join(parts[:2])
+    return parts[0]
+
+
+def parse_importtime(output: str) -> dict[str, int]:
+    """Parses `-X importtime` output into self time in microseconds per module."""
+    timings = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, _cumulative, module = line[len("import time:"):].split("|")
+        timings[module.strip()] = int(self_time)
+    return timings
+
+
+@click.command("profile-imports")
+@click.option("--top", default=20, show_default=True, help="Packages to list.")
+@click.option("--budget-ms", type=float, default=None, help="Fail if the total import time goes over this. Defaults to IMPORT_TIME_BUDGET_MS.")
+@with_appcontext
+def profile_imports(top, budget_ms):
+    """Reports import time per package when the app boots."""
+    budget_ms = budget_ms if budget_ms is not None else current_app.config.get("IMPORT_TIME_BUDGET_MS")
+    project_root = os.path.dirname(current_app.root_path)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", PROFILE_SCRIPT], cwd=project_root, capture_output=True, text=True)
+    if result.returncode != 0:
+        click.echo(result.stderr[-2000:], err=True)
+        raise click.ClickException("The app failed to start")
+
+    timings = parse_importtime(result.stderr)
+    groups = defaultdict(int)
+    for module, self_time in timings.items():
+        groups[group_name(module)] += self_time
+
+    total_ms = sum(timings.values()) / 1000
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024 # kilobytes on Linux
+
+    click.echo(f"{'package':<40}{'ms':>10}")
+    for name, self_time in sorted(groups.items(), key=lambda item: item[1], reverse=True)[:top]:
+        click.echo(f"{name:<40}{self_time / 1000:>10.1f}")
+    click.echo(f"\n{len(timings)} modules, {total_ms:.0f} ms total, peak RSS {peak_rss_mb:.0f} MB")
+
+    eager = sorted({module.split(".")[0] for module in timings} & set(LAZY_MODULES))
+    if eager:
+        raise click.ClickException(f"Modules that should be lazy-loaded were imported at boot: {', '.join(eager)}")
+
+    if budget_ms is not None and total_ms > budget_ms:
+        raise click.ClickException(f"Import time {total_ms:.0f} ms is over the {budget_ms:.0f} ms budget")
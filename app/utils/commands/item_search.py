@@ -0,0 +1,112 @@
+'''
+This module contains the CLI command that benchmarks the marketplace search.
+
+`flask benchmark-item-search --seed 1000000` bulk inserts fake items with a single
+INSERT ... SELECT from generate_series (run it once, against a scratch database), then
+times typical searches (filters, text search, deep keyset pages and facets). Remove the
+fake items with `--cleanup`.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import time, statistics
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import text
+from werkzeug.datastructures import MultiDict
+
+from ...extensions import db
+from ..helpers.db_helpers import statement_timeout
+from ..helpers.item_search_helpers import parse_search_args, search_items, get_facets
+
+BENCHMARK_BRAND = "benchmark-seed"
+
+SEED_SQL = text("""
+INSERT INTO item (item_type, name, description, price, category, brand_name, views_count, slug,
+                  country, state, city, created_at, updated_at, seller_id)
+SELECT
+    (ARRAY['product', 'service'])[1 + i % 2],
+    'Item ' || i || ' ' || (ARRAY['phone', 'laptop', 'shoe', 'bag', 'cake', 'repair', 'design'])[1 + i % 7],
+    'Seeded item number ' || i || ' for the search benchmark',
+    (random() * 1000000)::int,
+    (ARRAY['electronics', 'fashion', 'food', 'services', 'home', 'beauty'])[1 + i % 6],
+    :brand,
+    0,
+    'benchmark-seed-' || i,
+    'Nigeria',
+    (ARRAY['Lagos', 'Abuja', 'Rivers', 'Oyo', 'Kano', 'Enugu'])[1 + i % 6],
+    (ARRAY['Ikeja', 'Garki', 'Port Harcourt', 'Ibadan', 'Kano', 'Enugu'])[1 + i % 6],
+    now() - (i || ' seconds')::interval,
+    now(),
+    :seller_id
+FROM generate_series(1, :count) AS i
+""")
+
+QUERIES = {
+    "newest": {},
+    "category": {"category": "fashion"},
+    "location + price": {"state": "Lagos", "min_price": "10000", "max_price": "50000"},
+    "text search": {"q": "laptop"},
+    "text + category": {"q": "phone", "category": "electronics", "sort": "price_asc"},
+}
+
+
+def time_call(func, rounds: int) -> tuple[float, float]:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[max(int(len(timings) * 0.95) - 1, 0)]
+
+
+@click.command("benchmark-item-search")
+@click.option("--seed", "seed_count", type=int, default=0, help="Insert this many fake items first.")
+@click.option("--seller-id", type=int, default=None, help="Owner of the fake items. Defaults to the first user.")
+@click.option("--rounds", default=20, show_default=True, help="Times to run each query.")
+@click.option("--pages", default=50, show_default=True, help="Pages to walk for the deep pagination timing.")
+@click.option("--cleanup", is_flag=True, help="Delete the fake items and exit.")
+@with_appcontext
+def benchmark_item_search(seed_count, seller_id, rounds, pages, cleanup):
+    """Times marketplace searches, optionally on seeded data."""
+    if cleanup:
+        with statement_timeout(0):
+            deleted = db.session.execute(text("DELETE FROM item WHERE brand_name = :brand"), {"brand": BENCHMARK_BRAND}).rowcount
+        db.session.commit()
+        click.echo(f"deleted {deleted} fake items")
+        return
+
+    if seed_count:
+        seller_id = seller_id or db.session.execute(text("SELECT min(id) FROM trendit3_user")).scalar()
+        if seller_id is None:
+            raise click.ClickException("Create a user first, the fake items need a seller")
+
+        # Maintaining the search vector and every index over a million rows takes a while
+        start = time.perf_counter()
+        with statement_timeout(0):
+            db.session.execute(SEED_SQL, {"brand": BENCHMARK_BRAND, "seller_id": seller_id, "count": seed_count})
+        db.session.commit()
+        with statement_timeout(0):
+            db.session.execute(text("ANALYZE item"))
+        db.session.commit()
+        click.echo(f"seeded {seed_count} items in {time.perf_counter() - start:.1f} s")
+
+    click.echo(f"{'query':<20}{'page p50':>10}{'page p95':>10}{'facets p50':>12}{'facets p95':>12}")
+    for name, args in QUERIES.items():
+        params = parse_search_args(MultiDict({**args, "per_page": "20"}))
+        page_p50, page_p95 = time_call(lambda: search_items(params), rounds)
+        facets_p50, facets_p95 = time_call(lambda: get_facets(params), rounds)
+        click.echo(f"{name:<20}{page_p50:>10.1f}{page_p95:>10.1f}{facets_p50:>12.1f}{facets_p95:>12.1f}")
+
+    # Keyset pagination should cost the same on the last page as on the first
+    params = parse_search_args(MultiDict({"per_page": "20"}))
+    timings = []
+    for _ in range(pages):
+        start = time.perf_counter()
+        items, params["cursor"] = search_items(params)
+        timings.append((time.perf_counter() - start) * 1000)
+        if not params["cursor"]:
+            break
+    click.echo(f"\nkeyset pages: first {timings[0]:.1f} ms, last (page {len(timings)}) {timings[-1]:.1f} ms")
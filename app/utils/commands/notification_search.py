@@ -0,0 +1,86 @@
+'''
+This module contains the CLI command that benchmarks the notification search.
+
+`flask benchmark-notification-search --seed 1000000` bulk inserts fake activity notifications
+for one user with a single INSERT ... SELECT from generate_series (run it once, against a
+scratch database), then times searches through the indexed search_vector next to the
+unindexed ILIKE scan it replaced. Remove the fake notifications with `--cleanup`.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import time
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import text
+
+from ...extensions import db
+from ...models.notification import Notification, NotificationType
+from ..helpers.db_helpers import statement_timeout
+from ..helpers.user_helpers import search_notifications
+from .item_search import time_call
+
+BENCHMARK_TITLE = "benchmark-seed"
+
+SEED_SQL = text("""
+INSERT INTO notification (notification_type, created_at, updated_at, title, body, read, recipient_id)
+SELECT
+    'ACTIVITY',
+    now() - (i || ' seconds')::interval,
+    now(),
+    :title,
+    (ARRAY['Your task was approved', 'Payment received for your task', 'Withdrawal completed',
+           'New follower on Instagram', 'Your advert is live', 'Referral bonus credited',
+           'Task submission rejected'])[1 + i % 7] || ' (activity ' || i || ')',
+    false,
+    :recipient_id
+FROM generate_series(1, :count) AS i
+""")
+
+QUERIES = ["approved", "payment received", "referral bonus", "withdrawal -completed", "nothing matches this"]
+
+
+@click.command("benchmark-notification-search")
+@click.option("--seed", "seed_count", type=int, default=0, help="Insert this many fake notifications first.")
+@click.option("--user-id", type=int, default=None, help="Recipient of the fake notifications. Defaults to the first user.")
+@click.option("--rounds", default=20, show_default=True, help="Times to run each query.")
+@click.option("--cleanup", is_flag=True, help="Delete the fake notifications and exit.")
+@with_appcontext
+def benchmark_notification_search(seed_count, user_id, rounds, cleanup):
+    """Times notification searches, optionally on seeded data."""
+    if cleanup:
+        with statement_timeout(0):
+            deleted = db.session.execute(text("DELETE FROM notification WHERE title = :title"), {"title": BENCHMARK_TITLE}).rowcount
+        db.session.commit()
+        click.echo(f"deleted {deleted} fake notifications")
+        return
+
+    user_id = user_id or db.session.execute(text("SELECT min(id) FROM trendit3_user")).scalar()
+    if user_id is None:
+        raise click.ClickException("Create a user first, the fake notifications need a recipient")
+
+    if seed_count:
+        # Postgres computes the search vector and maintains the GIN index for every row
+        start = time.perf_counter()
+        with statement_timeout(0):
+            db.session.execute(SEED_SQL, {"title": BENCHMARK_TITLE, "recipient_id": user_id, "count": seed_count})
+        db.session.commit()
+        with statement_timeout(0):
+            db.session.execute(text("ANALYZE notification"))
+        db.session.commit()
+        click.echo(f"seeded {seed_count} notifications in {time.perf_counter() - start:.1f} s")
+
+    def ilike_page(query):
+        # What global_search used to run, limited to one page so the timing isn't all serialization
+        return Notification.query.filter(
+            Notification.notification_type == NotificationType.ACTIVITY,
+            Notification.body.ilike(f"%{query}%"),
+        ).limit(10).all()
+
+    click.echo(f"{'query':<24}{'matches':>10}{'search p50':>12}{'search p95':>12}{'ilike p50':>12}{'ilike p95':>12}")
+    for query in QUERIES:
+        matches = search_notifications(user_id, query).total
+        search_p50, search_p95 = time_call(lambda: search_notifications(user_id, query), rounds)
+        ilike_p50, ilike_p95 = time_call(lambda: ilike_page(query), rounds)
+        click.echo(f"{query:<24}{matches:>10}{search_p50:>12.1f}{search_p95:>12.1f}{ilike_p50:>12.1f}{ilike_p95:>12.1f}")
@@ -0,0 +1,33 @@
+'''
+This module contains CLI commands related to password hashing.
+
+Run `flask benchmark-password-hash` to see how many logins a single worker
+can verify per second at different hashing costs, before changing PASSWORD_HASH_METHOD.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import time
+import click
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+@click.command("benchmark-password-hash")
+@click.option("--method", "methods", multiple=True, help="werkzeug hashing method to test. Can be repeated.")
+@click.option("--rounds", default=20, show_default=True, help="Password checks to time per method.")
+def benchmark_password_hash(methods, rounds):
+    """Times password verification at different hashing costs."""
+    methods = methods or ("pbkdf2:sha256:260000", "pbkdf2:sha256:600000", "scrypt:16384:8:1", "scrypt:32768:8:1")
+    password = "benchmark-Password-123"
+
+    click.echo(f"{'method':<28}{'ms/check':>12}{'logins/s/worker':>18}")
+    for method in methods:
+        pwhash = generate_password_hash(password, method)
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            check_password_hash(pwhash, password)
+        per_check = (time.perf_counter() - start) / rounds
+
+        click.echo(f"{method:<28}{per_check * 1000:>12.1f}{1 / per_check:>18.1f}")
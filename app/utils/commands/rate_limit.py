@@ -0,0 +1,81 @@
+'''
+This module contains CLI commands related to rate limiting.
+
+Run `flask benchmark-rate-limit` to see how much time the limiter adds to each
+request with the configured storage (RATELIMIT_STORAGE_URI).
+
+Run `flask check-rate-limits` to check that the IP keyed policies in RATE_LIMIT_POLICIES
+answer 429 once their limit is used up. Each endpoint is called from a made up IP address
+with an empty JSON body, which the request hooks reject before the view runs, so the check
+has no side effects and doesn't use up real clients' limits.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import time, random, statistics
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from limits import parse, parse_many
+
+from ...extensions import limiter
+from ...rate_limits import RATE_LIMIT_POLICIES
+
+
+@click.command("benchmark-rate-limit")
+@click.option("--rounds", default=1000, show_default=True, help="Limit checks to time.")
+@with_appcontext
+def benchmark_rate_limit(rounds):
+    """Times the storage round trip the limiter makes for each limited request."""
+    limit = parse(f"{rounds * 10}/minute") # high enough that the benchmark never gets limited
+    key = f"benchmark:{time.time()}"
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        limiter.limiter.hit(limit, key)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    click.echo(f"checks: {rounds}")
+    click.echo(f"mean:   {statistics.mean(timings):.3f} ms")
+    click.echo(f"p50:    {timings[len(timings) // 2]:.3f} ms")
+    click.echo(f"p95:    {timings[int(len(timings) * 0.95) - 1]:.3f} ms")
+    click.echo(f"max:    {timings[-1]:.3f} ms")
+    click.echo("Multiply by the number of limits on an endpoint (a shared budget adds one more).")
+
+
+@click.command("check-rate-limits")
+@click.option("--endpoint", default=None, help="Only check this endpoint, e.g. api.login.")
+@with_appcontext
+def check_rate_limits(endpoint):
+    """Uses up the limit of each IP keyed endpoint and checks that the next request gets a 429."""
+    app = current_app._get_current_object()
+    client = app.test_client()
+    failures = 0
+
+    for policy_endpoint, policies in RATE_LIMIT_POLICIES.items():
+        if endpoint and policy_endpoint != endpoint:
+            continue
+
+        rule = next(app.url_map.iter_rules(policy_endpoint), None)
+        ip_policies = [policy for policy in policies if policy.key == "ip" and not policy.scope]
+        if rule is None or rule.arguments or not ip_policies:
+            continue
+
+        allowed = min(item.amount for policy in ip_policies for item in parse_many(policy.limit))
+        method = "POST" if "POST" in rule.methods else "GET"
+        remote_addr = f"10.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}"
+
+        statuses = [
+            client.open(rule.rule, method=method, json={}, environ_base={"REMOTE_ADDR": remote_addr}).status_code
+            for _ in range(allowed + 1)
+        ]
+        limited_early = 429 in statuses[:-1]
+        passed = statuses[-1] == 429 and not limited_early
+        failures += not passed
+        click.echo(f"{'ok  ' if passed else 'FAIL'} {policy_endpoint}: {allowed} allowed, then {statuses[-1]}")
+
+    if failures:
+        raise SystemExit(1)
@@ -0,0 +1,46 @@
+'''
+This module contains the CLI command that seeds the database with the app's default data.
+
+Seeding used to run on every boot of every web and Celery worker. It now runs once per deploy
+with `flask seed` (see the release step in the Procfile). Each seed has a version; a seed only
+runs again when its version is bumped, and every seed is safe to run more than once.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import click
+from flask.cli import with_appcontext
+
+from ...extensions import db
+from ...models import SeedVersion, create_roles, populate_task_options, backfill_comments_count, backfill_referral_stats
+
+# Bump a seed's version whenever its data changes
+SEEDS = {
+    "roles": (1, create_roles),
+    "task_options": (1, populate_task_options),
+    "comments_count": (1, backfill_comments_count),
+    "referral_stats": (1, backfill_referral_stats),
+}
+
+
+@click.command("seed")
+@click.option("--force", is_flag=True, help="Run every seed, even if its version was already applied.")
+@click.option("--only", "only", multiple=True, type=click.Choice(list(SEEDS)), help="Only run the given seed. Can be repeated.")
+@with_appcontext
+def seed(force, only):
+    """Seeds roles, task options and other default data."""
+    applied = {record.name: record.version for record in SeedVersion.query.all()}
+
+    for name, (version, run_seed) in SEEDS.items():
+        if only and name not in only:
+            continue
+
+        if not force and applied.get(name, 0) >= version:
+            click.echo(f"{name}: up to date (v{version})")
+            continue
+
+        run_seed()
+        db.session.merge(SeedVersion(name=name, version=version))
+        db.session.commit()
+        click.echo(f"{name}: applied v{version}")
@@ -0,0 +1,44 @@
+'''
+This module contains the CLI command that measures how long the app takes to start.
+
+Every gunicorn and Celery worker pays this cost on boot, so run `flask benchmark-startup`
+before and after changes to imports or `create_app` to keep cold starts in check.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import os, sys, subprocess, statistics
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+# Runs in a fresh interpreter, so nothing is already imported or cached
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app()
+created = time.perf_counter()
+print(imported - start, created - imported)
+"""
+
+
+@click.command("benchmark-startup")
+@click.option("--runs", default=5, show_default=True, help="Fresh interpreters to start.")
+@with_appcontext
+def benchmark_startup(runs):
+    """Times `import app` and `create_app()` in fresh interpreters."""
+    project_root = os.path.dirname(current_app.root_path)
+    import_times, create_times = [], []
+
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=project_root, capture_output=True, text=True, check=True)
+        import_time, create_time = map(float, result.stdout.strip().splitlines()[-1].split())
+        import_times.append(import_time * 1000)
+        create_times.append(create_time * 1000)
+
+    click.echo(f"runs:        {runs}")
+    click.echo(f"import app:  median {statistics.median(import_times):.0f} ms, max {max(import_times):.0f} ms")
+    click.echo(f"create_app:  median {statistics.median(create_times):.0f} ms, max {max(create_times):.0f} ms")
@@ -0,0 +1,86 @@
+'''
+This module contains the CLI command that checks unique slug generation under concurrency.
+
+`flask check-unique-slugs --seller-id 1` creates many items with the same name from
+several threads at once, so their slugs collide on the unique constraint and have to be
+retried by `save_with_unique_value`. It then renames all of them to another shared name the
+same way, which covers updates of existing rows. It reports how many items were saved,
+whether every slug is distinct, and how long each save took, then deletes the items again.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import time
+from concurrent.futures import ThreadPoolExecutor
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import delete
+
+from ...extensions import db
+from ...models.item import Item
+from ..helpers.basic_helpers import slug_candidates, save_with_unique_value
+
+CHECK_BRAND = "unique-slug-check"
+
+
+@click.command("check-unique-slugs")
+@click.option("--seller-id", required=True, type=int, help="User the test items are created for.")
+@click.option("--items", default=50, show_default=True, help="Items to create, all with the same name.")
+@click.option("--concurrency", default=10, show_default=True, help="Threads creating items at the same time.")
+@with_appcontext
+def check_unique_slugs(seller_id, items, concurrency):
+    """Creates and renames items with colliding slugs concurrently and checks that every slug is unique."""
+    app = current_app._get_current_object()
+    name = f"Unique slug check {int(time.time())}"
+    new_name = f"{name} renamed"
+
+    def timed_save(make_item, slug_name, changes=None):
+        with app.app_context():
+            start = time.perf_counter()
+            try:
+                item = make_item()
+                save_with_unique_value(item, "slug", slug_candidates(slug_name), changes=changes)
+                return item.id, item.slug, (time.perf_counter() - start) * 1000
+            except Exception as e:
+                db.session.rollback()
+                return None, e, None
+
+    def create_item(_):
+        return timed_save(lambda: Item(seller_id=seller_id, name=name, price=0, brand_name=CHECK_BRAND), name)
+
+    def rename_item(item_id):
+        return timed_save(lambda: db.session.get(Item, item_id), new_name, changes={"name": new_name})
+
+    failed = False
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            created = list(executor.map(create_item, range(items)))
+        failed |= report("created", created, items)
+
+        item_ids = [item_id for item_id, _slug, elapsed in created if elapsed is not None]
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            renamed = list(executor.map(rename_item, item_ids))
+        failed |= report("renamed", renamed, len(item_ids))
+    finally:
+        db.session.execute(delete(Item).where(Item.brand_name == CHECK_BRAND))
+        db.session.commit()
+
+    if failed:
+        raise SystemExit(1)
+
+
+def report(action: str, results: list[tuple], expected: int) -> bool:
+    """Prints the outcome of one phase of the check. Returns whether it failed."""
+    slugs = [slug for _item_id, slug, elapsed in results if elapsed is not None]
+    failures = [error for _item_id, error, elapsed in results if elapsed is None]
+    timings = sorted(elapsed for _item_id, _slug, elapsed in results if elapsed is not None)
+
+    click.echo(f"{action} {len(slugs)}/{expected} items, {len(set(slugs))} distinct slugs")
+    if timings:
+        click.echo(f"save time: p50 {timings[len(timings) // 2]:.1f} ms, max {timings[-1]:.1f} ms")
+    for error in failures[:5]:
+        click.echo(f"failed: {error}")
+
+    return bool(failures) or len(set(slugs)) != len(slugs)
@@ -8,12 +8,14 @@ related to Trendit³ API Health checks.
 @package: Trendit³
 '''
 
+import time
 from flask import Flask, request, current_app
 from sqlalchemy import text
 
 from . import debugger
 from ...utils.helpers.response_helpers import error_response, success_response
 from ...utils.helpers.basic_helpers import log_exception, console_log
+from ...utils.helpers.db_helpers import get_pool_status
 from config import Config
 
 from ...extensions import db
@@ -29,14 +31,22 @@ def health_check():
 def db_health_check():
     try:
         # Ping the database to check the connection status
-        result = db.session.execute(text('SELECT 1'))
-        current_app.logger.debug(result)
-        console_log('Ping', result)
+        start = time.perf_counter()
+        db.session.execute(text('SELECT 1'))
         db.session.commit()
-        return success_response('Okay: Database is reachable', 200)
+        ping_ms = round((time.perf_counter() - start) * 1000, 2)
+        
+        pool_status = get_pool_status()
+        extra_data = {"ping_ms": ping_ms, "pool": pool_status}
+        
+        saturation = pool_status.get("saturation")
+        if saturation is not None and saturation >= current_app.config.get("DB_POOL_SATURATION_WARNING", 0.8):
+            return success_response('Degraded: Database connection pool is nearly exhausted', 200, extra_data)
+        
+        return success_response('Okay: Database is reachable', 200, extra_data)
     except Exception as e:
         log_exception('error', e)
-        return error_response(f'Error: {str(e)}', 500)
+        return error_response(f'Error: {str(e)}', 500, {"pool": get_pool_status()})
 
 
 # External Service Health Check Endpoint
@@ -2,8 +2,8 @@
 This module defines helper functions for handling 
 authorization and authentication in the Trendit³ Flask application.
 
-These functions assist with tasks such as code generation, 
-saving password reset token, and saving 2FA token
+These functions assist with tasks such as code generation
+and sending 2FA codes. One-time codes are stored by `otp_helpers`.
 
 @author: Emmanuel Olowu
 @link: https://github.com/zeddyemy
@@ -20,7 +20,7 @@ from config import Config
 from ...extensions import db
 from .loggers import console_log, log_exception
 from .mail_helpers import send_code_to_email
-from ...models import Trendit3User, TempUser, OneTimeToken
+from ...models import Trendit3User, TempUser
 
 
 class EmailType(Enum):
@@ -56,43 +56,3 @@ def send_2fa_code(user, two_factor_method, six_digit_code):
     
     else:
         pass
-
-
-def save_pwd_reset_token(reset_token, user=None):
-    try:
-        if user is None:
-            return None
-        
-        pwd_reset_token = OneTimeToken.query.filter(OneTimeToken.trendit3_user_id == user.id).first()
-        if pwd_reset_token:
-            pwd_reset_token.update(token=reset_token, used=False)
-            return pwd_reset_token
-        else:
-            new_pwd_reset_token = OneTimeToken.create_token(token=reset_token, trendit3_user_id=user.id)
-            return new_pwd_reset_token
-    except Exception as e:
-        console_log('RESET EXCEPTION', str(e))
-        current_app.logger.error(f"An error occurred saving Reset token in the database: {str(e)}")
-        db.session.rollback()
-        db.session.close()
-        return None
-
-
-def save_2fa_token(two_FA_token, user=None):
-    try:
-        if user is None:
-            return None
-        
-        two_fa_token = OneTimeToken.query.filter(OneTimeToken.trendit3_user_id == user.id).first()
-        if two_fa_token:
-            two_fa_token.update(token=two_FA_token, used=False)
-            return two_fa_token
-        else:
-            new_two_fa_token = OneTimeToken.create_token(token=two_FA_token, trendit3_user_id=user.id)
-            return new_two_fa_token
-    except Exception as e:
-        console_log('2FA EXCEPTION', str(e))
-        current_app.logger.error(f"An error occurred saving the 2FA token in the database: {str(e)}")
-        db.session.rollback()
-        db.session.close()
-        return None
\ No newline at end of file
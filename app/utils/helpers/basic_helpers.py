@@ -10,10 +10,12 @@ These functions perform common tasks that are used throughout the application.
 import random, string, logging, time
 from flask import current_app, abort, request
 from slugify import slugify
-from typing import Any
+from sqlalchemy.exc import IntegrityError
+from typing import Any, Callable
 
-from ...models.item import Item
+from ...extensions import db
 from ...exceptions import UniqueSlugError
+from .loggers import console_log, log_exception # kept importable from here for older modules
 
 
 def paginate_results(request, results, result_per_page=10):
@@ -135,85 +137,59 @@ def get_object_by_slug(model: object, slug: str):
     """
     return model.query.filter_by(slug=slug).first()
 
-def generate_slug(name: str, type: str, existing_obj=None) -> str:
+def slug_candidates(name: str):
     """
-    Generates a unique slug for a given name based on the type of object.
-
-    Parameters:
-    name (str): The name to generate a slug for.
-    type (str): The type of object to generate a slug for (either 'product' or 'category').
-    existing_obj (object): (Optional) The existing object to compare against to ensure uniqueness.
-    
-
-    Returns:
-    str: The unique slug for the object.
-
-    Usage:
-    Call this function passing in the name and type of object you want to generate a slug for. 
-    Optionally, you can pass in an existing object to compare against to ensure uniqueness.
+    Returns a function giving the slug to try on each attempt: the plain slug of the name first,
+    then the slug with a random suffix. For use with `save_with_unique_value`.
     """
     base_slug = slugify(name)
-    slug = base_slug
-    timestamp = str(int(time.time() * 1000))
-    counter = 1
-    max_attempts = 4  # maximum number of attempts to create a unique slug
-    
-    # when updating, Check existing obj name is the same
-    if existing_obj:
-        if existing_obj.name == name:
-            return existing_obj.slug
-
-    model_mapping = {
-        'item': Item,
-        # Add more mappings for other types as needed
-        # 'product': Product,
-        # 'task': Task,
-    }
-    
-    # Check if slug already exists in database
-    # Use the helper function with the dynamically determined model type
-    is_obj = get_object_by_slug(model_mapping.get(type), slug)
-    
-    while is_obj:
-        if counter > max_attempts:
-            raise UniqueSlugError(name, type, msg=f"Unable to create a unique item slug after {max_attempts} attempts.")
-        
-        suffix = generate_random_string(5)
-        slug = f"{base_slug}-{suffix}-{timestamp}" if counter == 2 else f"{base_slug}-{suffix}"
+    return lambda attempt: base_slug if attempt == 0 else f"{base_slug}-{generate_random_string(5)}"
 
-        # Check if the combination of slug and suffix is also taken
-        # Use the helper function with the dynamically determined model type
-        is_obj = get_object_by_slug(model_mapping.get(type), slug)
-        
-        counter += 1
 
-    return slug
+def is_unique_violation(error: IntegrityError, column: str) -> bool:
+    """Checks if an IntegrityError was raised by the unique constraint or index on `column`."""
+    if getattr(error.orig, "pgcode", None) != "23505":
+        return False
+    constraint = getattr(getattr(error.orig, "diag", None), "constraint_name", None) or ""
+    return constraint.endswith(f"_{column}_key") or constraint.endswith(f"_{column}")
 
 
-def console_log(label: str ="INFO", data: Any =None) -> None:
+def save_with_unique_value(obj, field: str, make_value: Callable[[int], str], changes: dict | None = None, max_attempts: int = 5):
     """
-    Print a formatted message to the console for visual clarity.
-
-    Args:
-        label (str, optional): A label for the message, centered and surrounded by dashes. Defaults to 'Label'.
-        data: The data to be printed. Can be of any type. Defaults to None.
-    """
-    
-    app = current_app
-    logger = app.logger
-    print(f"\n\n{label:-^50}\n {data} \n{'//':-^50}\n\n")
-    logger.info(f"\n\n{label:-^50}\n {data} \n{'//':-^50}\n\n", stacklevel=2)
+    Saves an object whose `field` must be unique, letting the database's unique constraint
+    catch collisions instead of checking with a SELECT first.
 
-
-def log_exception(label: str ="EXCEPTION", data: Any = "Nothing") -> None:
-    """
-    Log an exception with details to a logging handler for debugging.
+    Each attempt sets the field to `make_value(attempt)` and flushes inside a savepoint. If the
+    value is taken, only the savepoint is rolled back and the next value is tried. Other pending
+    changes are flushed before the first savepoint, and the attributes are only set inside it,
+    so a collision never escapes the savepoint and aborts the whole transaction.
 
     Args:
-        label (str, optional): A label for the exception, centered and surrounded by dashes. Defaults to 'EXCEPTION'.
-        data: Additional data to be logged along with the exception. Defaults to 'Nothing'.
-    """
+        obj: The new or existing model instance.
+        field (str): The unique column, e.g. 'slug'.
+        make_value (Callable[[int], str]): Returns the value to try on the given attempt (starting at 0).
+        changes (dict, optional): Other attributes to set on the object. They are set again on every
+            attempt, since rolling back a savepoint expires them.
+        max_attempts (int, optional): Defaults to 5.
 
-    app = current_app
-    logger = app.logger
-    logger.exception(f"\n\n{label:-^50}\n {str(data)} \n {'//':-^50}\n\n", stacklevel=2)
\ No newline at end of file
+    Raises:
+        UniqueSlugError: If no unique value was found after `max_attempts`.
+    """
+    db.session.flush() # begin_nested() flushes pending changes before its SAVEPOINT, outside of it
+
+    for attempt in range(max_attempts):
+        try:
+            with db.session.begin_nested():
+                for key, value in (changes or {}).items():
+                    setattr(obj, key, value)
+                setattr(obj, field, make_value(attempt))
+                db.session.add(obj)
+        except IntegrityError as e:
+            if not is_unique_violation(e, field):
+                raise
+            continue
+
+        db.session.commit()
+        return obj
+
+    raise UniqueSlugError(getattr(obj, field), type(obj).__name__, msg=f"Unable to create a unique {field} after {max_attempts} attempts.")
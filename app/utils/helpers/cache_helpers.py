@@ -0,0 +1,156 @@
+'''
+This module defines the response cache of the catalog endpoints of the Trendit³ Flask application.
+
+Catalog endpoints (task options, pricing, task counts, banks, countries, religions and social
+platforms) return the same payload to everyone, or to everyone with the same currency or
+country. Their serialized responses are cached in Redis, keyed by namespace, path, query args
+and that variant, and sent with an ETag, so clients revalidating with If-None-Match get an
+empty 304 instead of the payload.
+
+Every namespace has a version number that is part of its keys. Committing a write to a model
+a namespace is built from bumps its version, so older entries are never read again and just
+expire. A response built before the bump is stored under the old version, which keeps a slow
+request from caching stale data over a fresh write.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import hashlib
+from typing import Callable
+from flask import Response, current_app, make_response, request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from .loggers import log_exception
+from .principal_helpers import get_current_principal
+from ...extensions import redis_client
+from ...metrics import RESPONSE_CACHE_LOOKUPS, RESPONSE_CACHE_NOT_MODIFIED
+from ...models.task import Task, TaskStatus, TaskPaymentStatus
+from ...models.task_option import TaskOption
+from ...models.pricing import Pricing
+
+RESPONSE_CACHE_KEY = "response_cache:{namespace}:v{version}:{digest}"
+RESPONSE_CACHE_VERSION_KEY = "response_cache:{namespace}:version"
+
+
+def is_counted_task(task: Task) -> bool:
+    return task.payment_status == TaskPaymentStatus.COMPLETE and task.status == TaskStatus.APPROVED
+
+
+def task_counts_changed(task: Task, session: Session) -> bool:
+    """
+    Task counts only include paid and approved tasks, so most task writes leave them as they are.
+
+    They are grouped by any task column (platform, goal...), so any change to a counted task matters.
+    """
+    if task in session.new or task in session.deleted:
+        return is_counted_task(task)
+    state = inspect(task)
+    if state.attrs.status.history.has_changes() or state.attrs.payment_status.history.has_changes():
+        return True
+    return is_counted_task(task) and any(state.attrs[column.key].history.has_changes() for column in state.mapper.column_attrs)
+
+
+# Models whose writes change cached responses: the namespace they invalidate, and
+# optionally a check of whether a given write matters to it
+CACHE_SOURCES = [
+    (Task, "task_counts", task_counts_changed),
+    (TaskOption, "task_options", None),
+    (Pricing, "pricing", None),
+]
+
+
+def get_namespace_version(namespace: str) -> int:
+    return int(redis_client.get(RESPONSE_CACHE_VERSION_KEY.format(namespace=namespace)) or 0)
+
+
+def invalidate_namespace(namespace: str) -> None:
+    """Makes every cached response of the namespace stale."""
+    try:
+        redis_client.incr(RESPONSE_CACHE_VERSION_KEY.format(namespace=namespace))
+    except Exception as e:
+        log_exception(f"Could not invalidate the {namespace} response cache", e)
+
+
+def response_cache_key(namespace: str, version: int, variant: str | None) -> str:
+    args = "&".join(f"{name}={value}" for name, value in sorted(request.args.items(multi=True)))
+    digest = hashlib.sha256(f"{request.path}?{args}|{variant or ''}".encode("utf-8")).hexdigest()[:32]
+    return RESPONSE_CACHE_KEY.format(namespace=namespace, version=version, digest=digest)
+
+
+def serve_cached(namespace: str, build: Callable[[], Response], variant: str | None = None, private: bool = False) -> Response:
+    """
+    Returns the cached response for the current request, or builds and caches it.
+
+    Only 200 responses are cached. Responses carry an ETag and Cache-Control, and a matching
+    If-None-Match gets a 304. If Redis is unreachable, the response is built every time.
+    """
+    key = etag = body = None
+    try:
+        key = response_cache_key(namespace, get_namespace_version(namespace), variant)
+        etag, body = redis_client.hmget(key, "etag", "body")
+    except Exception as e:
+        log_exception(f"Could not read the {namespace} response cache", e)
+
+    if etag is not None:
+        RESPONSE_CACHE_LOOKUPS.labels(namespace, "hit").inc()
+        response = Response(body, mimetype="application/json")
+    else:
+        RESPONSE_CACHE_LOOKUPS.labels(namespace, "miss").inc()
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+
+        etag = hashlib.sha256(response.get_data()).hexdigest()[:32]
+        if key:
+            try:
+                pipeline = redis_client.pipeline(transaction=False)
+                pipeline.hset(key, mapping={"etag": etag, "body": response.get_data(as_text=True)})
+                pipeline.expire(key, current_app.config["CATALOG_CACHE_TTL"])
+                pipeline.execute()
+            except Exception as e:
+                log_exception(f"Could not cache the {namespace} response", e)
+
+    if etag in request.if_none_match:
+        RESPONSE_CACHE_NOT_MODIFIED.labels(namespace).inc()
+        response = Response(status=304)
+
+    response.set_etag(etag)
+    response.cache_control.max_age = current_app.config["CATALOG_MAX_AGE"]
+    if private:
+        response.cache_control.private = True
+        response.vary.add("Authorization")
+    else:
+        response.cache_control.public = True
+    return response
+
+
+def current_user_currency() -> str | None:
+    user = get_current_principal()
+    return user.wallet.currency_code if user and user.wallet else None
+
+
+def current_user_country() -> str | None:
+    user = get_current_principal()
+    return (user.address.country or "Nigeria") if user and user.address else None
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changed_namespaces(session, flush_context, instances):
+    changed_namespaces = session.info.setdefault("response_cache_changed", set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        for model, namespace, is_relevant in CACHE_SOURCES:
+            if isinstance(instance, model) and (is_relevant is None or is_relevant(instance, session)):
+                changed_namespaces.add(namespace)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_namespaces(session):
+    for namespace in session.info.pop("response_cache_changed", set()):
+        invalidate_namespace(namespace)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_namespaces(session):
+    session.info.pop("response_cache_changed", None)
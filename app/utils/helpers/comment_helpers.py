@@ -0,0 +1,108 @@
+'''
+This module defines helper functions for the comment threads of marketplace items.
+
+Threads are read newest first with keyset pagination on (item_id, created_at, id), so
+long threads are never loaded in full. The first page of each thread, which most readers
+never go past, is cached in Redis under a per-item version that is bumped whenever a comment
+is added. A page read before the bump is cached under the old version, so a slow read can't
+cache a stale page over a new comment. Each item keeps
+its comment count in `Item.comments_count`, incremented in the same transaction as the new
+comment instead of being recounted.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import base64, json
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import select, update, tuple_
+from sqlalchemy.orm import joinedload
+
+from .loggers import log_exception
+from ...extensions import db, redis_client
+from ...models.item import Item, Comment
+
+FIRST_PAGE_CACHE_KEY = "item:{item_id}:comments:v{version}:first_page"
+COMMENTS_VERSION_KEY = "item:{item_id}:comments:version"
+COMMENTS_PER_PAGE = 20
+MAX_COMMENTS_PER_PAGE = 50
+
+
+def encode_comment_cursor(comment: Comment) -> str:
+    return base64.urlsafe_b64encode(json.dumps([comment.created_at.isoformat(), comment.id]).encode()).decode()
+
+
+def decode_comment_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, comment_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(comment_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def load_comments_page(item_id: int, cursor: str | None, per_page: int) -> dict:
+    query = (
+        select(Comment)
+        .options(joinedload(Comment.trendit3_user))
+        .where(Comment.item_id == item_id)
+    )
+    if cursor:
+        query = query.where(tuple_(Comment.created_at, Comment.id) < tuple_(*decode_comment_cursor(cursor)))
+
+    comments = db.session.scalars(query.order_by(Comment.created_at.desc(), Comment.id.desc()).limit(per_page + 1)).all()
+    next_cursor = encode_comment_cursor(comments[per_page - 1]) if len(comments) > per_page else None
+
+    return {
+        "comments": [comment.to_dict() for comment in comments[:per_page]],
+        "next_cursor": next_cursor,
+    }
+
+
+def get_comments_page(item: Item, cursor: str | None = None, per_page: int = COMMENTS_PER_PAGE) -> dict:
+    """
+    Returns a page of the item's comments, newest first, and the cursor of the next page.
+
+    The first page at the default page size is served from the cache when possible.
+
+    Raises:
+        ValueError: If the cursor is invalid.
+    """
+    per_page = max(1, min(per_page, MAX_COMMENTS_PER_PAGE))
+    is_first_page = cursor is None and per_page == COMMENTS_PER_PAGE
+    cache_key = None
+
+    if is_first_page:
+        try:
+            version = int(redis_client.get(COMMENTS_VERSION_KEY.format(item_id=item.id)) or 0)
+            cache_key = FIRST_PAGE_CACHE_KEY.format(item_id=item.id, version=version)
+            cached = redis_client.get(cache_key)
+            if cached is not None:
+                return {**json.loads(cached), "total_comments": item.comments_count}
+        except Exception as e:
+            log_exception("Could not read cached comments", e)
+
+    page = load_comments_page(item.id, cursor, per_page)
+
+    if cache_key:
+        try:
+            redis_client.setex(cache_key, current_app.config["COMMENTS_CACHE_TTL"], current_app.json.dumps(page))
+        except Exception as e:
+            log_exception("Could not cache comments", e)
+
+    return {**page, "total_comments": item.comments_count}
+
+
+def add_item_comment(item: Item, user_id: int, text: str) -> Comment:
+    """Adds a comment, bumps the item's comment count in the same transaction and makes the cached first page stale."""
+    comment = Comment(user_id=user_id, item_id=item.id, text=text)
+    db.session.add(comment)
+    db.session.execute(update(Item).where(Item.id == item.id).values(comments_count=Item.comments_count + 1))
+    db.session.commit()
+
+    try:
+        redis_client.incr(COMMENTS_VERSION_KEY.format(item_id=item.id))
+    except Exception as e:
+        log_exception("Could not invalidate cached comments", e)
+
+    return comment
@@ -0,0 +1,59 @@
+'''
+This module defines helper functions for working with the database connection pool
+and transaction settings in the Trendit³ Flask application.
+
+Statements run while handling a web request are cancelled after DB_STATEMENT_TIMEOUT_MS, so a
+slow query can't hold a connection (and a worker) for long. The timeout is set with SET LOCAL
+when each transaction begins, and only inside a request: Celery jobs, `flask seed`,
+migrations and the benchmark commands run without it.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from contextlib import contextmanager
+from flask import current_app, has_request_context
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from ...extensions import db
+
+
+@contextmanager
+def statement_timeout(milliseconds: int):
+    """
+    Overrides the statement timeout for the current transaction only.
+
+    Use it around queries that are expected to run long, such as exports, or that must
+    be bounded outside a request. Pass 0 to disable the timeout. The setting is dropped
+    when the transaction commits or rolls back.
+    """
+    db.session.execute(text(f"SET LOCAL statement_timeout = {int(milliseconds)}"))
+    yield
+
+
+@event.listens_for(Session, "after_begin")
+def _set_request_statement_timeout(session, transaction, connection):
+    if has_request_context():
+        connection.execute(text(f"SET LOCAL statement_timeout = {int(current_app.config['DB_STATEMENT_TIMEOUT_MS'])}"))
+
+
+def get_pool_status() -> dict:
+    """Returns how many connections the pool holds and how close it is to running out."""
+    pool = db.engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {"pool": type(pool).__name__}
+
+    max_overflow = current_app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}).get("max_overflow", 0)
+    capacity = pool.size() + max(max_overflow, 0)
+    checked_out = pool.checkedout()
+
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "saturation": round(checked_out / capacity, 2) if capacity else None,
+    }
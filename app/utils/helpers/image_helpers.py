@@ -0,0 +1,92 @@
+'''
+This module defines helper functions for processing images before they are uploaded in the Trendit³ Flask application.
+
+Images are normalized in one pass: orientation is applied and EXIF metadata dropped,
+they are downsized to the configured maximum dimensions, re-encoded at the target
+quality and a thumbnail is generated alongside.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import os
+from io import BytesIO
+from flask import current_app
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .loggers import log_exception
+
+# Formats Pillow can't round-trip without losing something (vector data or animation frames)
+SKIP_EXTENSIONS = {'.svg', '.gif'}
+
+FORMAT_EXTENSIONS = {"WEBP": ".webp", "JPEG": ".jpg"}
+
+
+def _encode_image(image: Image.Image, image_format: str, quality: int) -> BytesIO:
+    """Encode a Pillow image into an in-memory buffer, without any metadata."""
+    if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    elif image.mode not in ("RGB", "RGBA", "L"):
+        # palette images keep their transparency in info rather than in an alpha band
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, quality=quality, optimize=True)
+    buffer.name = f"image{FORMAT_EXTENSIONS[image_format]}" # storage backends read the extension from here
+    buffer.seek(0)
+    return buffer
+
+
+def normalize_image(media_file, filename: str) -> dict | None:
+    """
+    Normalizes an image for upload and generates its thumbnail.
+
+    Args:
+        media_file: A readable binary file object.
+        filename (str): The original file name, used to detect the type.
+
+    Returns:
+        dict | None: The processed image and thumbnail buffers with their metadata,
+            or None if the file isn't an image that should be processed.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in SKIP_EXTENSIONS:
+        return None
+
+    config = current_app.config
+    image_format = str(config.get("MEDIA_IMAGE_FORMAT", "WEBP")).upper()
+    image_format = image_format if image_format in FORMAT_EXTENSIONS else "WEBP"
+    quality = int(config.get("MEDIA_IMAGE_QUALITY", 80))
+    max_dimension = int(config.get("MEDIA_MAX_DIMENSION", 1920))
+    thumbnail_dimension = int(config.get("MEDIA_THUMBNAIL_DIMENSION", 320))
+
+    try:
+        media_file.seek(0, os.SEEK_END)
+        original_size = media_file.tell()
+        media_file.seek(0)
+
+        with Image.open(media_file) as image:
+            image = ImageOps.exif_transpose(image) # apply orientation before the EXIF data is dropped
+            image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+            processed = _encode_image(image, image_format, quality)
+
+            thumbnail_image = image.copy()
+            thumbnail_image.thumbnail((thumbnail_dimension, thumbnail_dimension), Image.LANCZOS)
+            thumbnail = _encode_image(thumbnail_image, image_format, quality)
+
+            width, height = image.size
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        log_exception(f"Could not process image {filename}, uploading original", e)
+        media_file.seek(0)
+        return None
+
+    return {
+        "file": processed,
+        "thumbnail": thumbnail,
+        "extension": FORMAT_EXTENSIONS[image_format],
+        "width": width,
+        "height": height,
+        "size": processed.getbuffer().nbytes,
+        "original_size": original_size,
+    }
@@ -0,0 +1,270 @@
+'''
+This module defines the interaction counters of the marketplace items (views, likes and shares).
+
+Interactions are not written to Postgres in the request. Views are counted with HINCRBY in a
+Redis hash, and likes and shares are deduplicated per user with a Redis set for each item, which
+expires after MEMBERS_TTL without new likes or shares and is reloaded from the database. The
+`flush_item_counters` Celery job then writes the aggregated deltas to `Item`, `LikeLog` and
+`Share` in batches, at most ITEM_COUNTER_FLUSH_INTERVAL seconds after the first pending
+interaction. The database can only lag by that much, and `get_item_counts` adds whatever
+is still pending, so the counts shown to users are always current.
+
+Flushes can be retried safely. Likes and shares are inserted with ON CONFLICT DO NOTHING on
+their (item_id, user_id) constraint, and each batch of views records its id in
+`ItemCounterFlush` in the same transaction as the update, so a batch that was committed but
+not removed from Redis is skipped on retry instead of counted twice.
+
+If Redis is unreachable, interactions are written straight to the database instead.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from datetime import datetime, timedelta
+from uuid import uuid4
+from sqlalchemy import update, select, delete, func, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from config import Config
+from .loggers import console_log, log_exception
+from ...extensions import db, redis_client
+from ...models.item import Item, LikeLog, Share, ItemCounterFlush
+
+PENDING_VIEWS_KEY = "item_counters:views" # hash of item id -> views not yet in the database
+PENDING_KEY = "item_counters:{kind}" # set of "item_id:user_id" pairs not yet in the database
+MEMBERS_KEY = "item:{item_id}:{kind}" # set of every user who liked/shared the item
+MEMBERS_TTL = 86400 # seconds an idle members set is kept, it is reloaded from the database after
+FLUSHING_SUFFIX = ":flushing"
+BATCH_ID_SUFFIX = ":batch_id"
+FLUSH_MARKER_RETENTION = timedelta(days=7) # how long applied batch ids are kept
+FLUSH_SCHEDULED_KEY = "item_counters:flush_scheduled"
+
+# Marks a members set as loaded from the database, so items without likes still have a key
+MEMBERS_SENTINEL = "-"
+
+INTERACTION_MODELS = {
+    "likes": LikeLog,
+    "shares": Share,
+}
+
+# Adds a user to the item's members set and, if they weren't in it, to the pending set, and
+# renews the members set's expiry.
+# Returns 1 if added, 0 if already there, and -1 if the members set hasn't been loaded yet.
+RECORD_SCRIPT = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+local added = redis.call('SADD', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+if added == 1 then
+    redis.call('SADD', KEYS[2], ARGV[2])
+end
+return added
+""")
+
+
+def schedule_flush() -> None:
+    """Schedules a flush unless one is already pending."""
+    interval = Config.ITEM_COUNTER_FLUSH_INTERVAL
+    if redis_client.set(FLUSH_SCHEDULED_KEY, 1, nx=True, ex=interval * 6):
+        from app.celery.jobs.tasks import flush_item_counters
+        try:
+            flush_item_counters.apply_async(countdown=interval)
+        except Exception:
+            redis_client.delete(FLUSH_SCHEDULED_KEY)
+            raise
+
+
+def record_view(item_id: int) -> None:
+    try:
+        redis_client.hincrby(PENDING_VIEWS_KEY, item_id, 1)
+        schedule_flush()
+    except Exception as e:
+        log_exception(f"Could not count view of item {item_id} in redis, writing it to the database", e)
+        db.session.execute(update(Item).where(Item.id == item_id).values(views_count=func.coalesce(Item.views_count, 0) + 1))
+        db.session.commit()
+
+
+def load_members(kind: str, item_id: int) -> None:
+    """Loads the users who already liked/shared the item from the database into its members set."""
+    model = INTERACTION_MODELS[kind]
+    user_ids = db.session.scalars(select(model.user_id).where(model.item_id == item_id)).all()
+    key = MEMBERS_KEY.format(item_id=item_id, kind=kind)
+    pipeline = redis_client.pipeline()
+    pipeline.sadd(key, MEMBERS_SENTINEL, *user_ids)
+    pipeline.expire(key, MEMBERS_TTL)
+    pipeline.execute()
+
+
+def record_unique_interaction(kind: str, item_id: int, user_id: int) -> bool:
+    """
+    Records a like or share once per user.
+
+    Returns:
+        bool: False if the user had already liked/shared the item.
+    """
+    try:
+        keys = [MEMBERS_KEY.format(item_id=item_id, kind=kind), PENDING_KEY.format(kind=kind)]
+        args = [user_id, f"{item_id}:{user_id}", MEMBERS_TTL]
+
+        added = RECORD_SCRIPT(keys=keys, args=args)
+        if added == -1:
+            load_members(kind, item_id)
+            added = RECORD_SCRIPT(keys=keys, args=args)
+
+        if added == 1:
+            schedule_flush()
+        return added == 1
+    except Exception as e:
+        log_exception(f"Could not record {kind} of item {item_id} in redis, writing it to the database", e)
+        return insert_interactions(kind, [{"item_id": item_id, "user_id": user_id}]) == 1
+
+
+def record_like(item_id: int, user_id: int) -> bool:
+    return record_unique_interaction("likes", item_id, user_id)
+
+
+def record_share(item_id: int, user_id: int) -> bool:
+    return record_unique_interaction("shares", item_id, user_id)
+
+
+def get_item_counts(item_ids: list[int]) -> dict[int, dict]:
+    """
+    Returns the pending views and the current like and share counts of the items, in one round trip.
+
+    Like and share counts are None for items whose members set isn't loaded; use the database count for those.
+    """
+    counts = {}
+    if not item_ids:
+        return counts
+
+    try:
+        pipeline = redis_client.pipeline(transaction=False)
+        for item_id in item_ids:
+            pipeline.hget(PENDING_VIEWS_KEY, item_id)
+            pipeline.hget(PENDING_VIEWS_KEY + FLUSHING_SUFFIX, item_id)
+            for kind in INTERACTION_MODELS:
+                pipeline.scard(MEMBERS_KEY.format(item_id=item_id, kind=kind))
+        results = pipeline.execute()
+    except Exception as e:
+        log_exception("Could not read item counters from redis", e)
+        return counts
+
+    per_item = 2 + len(INTERACTION_MODELS)
+    for index, item_id in enumerate(item_ids):
+        pending, flushing, *members = results[index * per_item:(index + 1) * per_item]
+        counts[item_id] = {"pending_views": int(pending or 0) + int(flushing or 0)}
+        for kind, size in zip(INTERACTION_MODELS, members):
+            counts[item_id][kind] = size - 1 if size else None # don't count the sentinel
+
+    return counts
+
+
+def apply_item_counts(item_dicts: list[dict]) -> list[dict]:
+    """Updates serialized items with the interactions that haven't been flushed to the database yet."""
+    counts = get_item_counts([item["id"] for item in item_dicts])
+    for item in item_dicts:
+        item_counts = counts.get(item["id"])
+        if not item_counts:
+            continue
+
+        item["views_count"] = (item.get("views_count") or 0) + item_counts["pending_views"]
+        for kind in INTERACTION_MODELS:
+            if item_counts[kind] is not None:
+                item[f"total_{kind}"] = item_counts[kind]
+    return item_dicts
+
+
+def take_pending(key: str) -> str | None:
+    """
+    Moves a pending key aside so new interactions go to a fresh key while it is flushed.
+
+    A key left over from a failed flush is returned again, so nothing is lost.
+    """
+    flushing_key = key + FLUSHING_SUFFIX
+    if redis_client.exists(flushing_key):
+        return flushing_key
+    try:
+        redis_client.renamenx(key, flushing_key)
+    except Exception:
+        return None # nothing pending
+    return flushing_key
+
+
+def insert_interactions(kind: str, rows: list[dict]) -> int:
+    """Inserts like/share rows, skipping those already in the database, and commits. Returns how many were new."""
+    model = INTERACTION_MODELS[kind]
+    inserted = db.session.execute(
+        pg_insert(model).values(rows)
+        .on_conflict_do_nothing(index_elements=[model.item_id, model.user_id])
+        .returning(model.id)
+    ).all()
+    db.session.commit()
+    return len(inserted)
+
+
+def get_batch_id(flushing_key: str) -> str:
+    """Returns the id of a batch being flushed. A batch keeps its id across retries."""
+    batch_id_key = flushing_key + BATCH_ID_SUFFIX
+    redis_client.set(batch_id_key, uuid4().hex, nx=True)
+    return redis_client.get(batch_id_key)
+
+
+def flush_views() -> int:
+    flushing_key = take_pending(PENDING_VIEWS_KEY)
+    if not flushing_key:
+        return 0
+
+    deltas = [{"item_id": int(item_id), "delta": int(delta)} for item_id, delta in redis_client.hgetall(flushing_key).items()]
+    if deltas:
+        # The batch id is recorded with the update, so a batch already applied is skipped
+        batch_id = get_batch_id(flushing_key)
+        is_new_batch = db.session.execute(
+            pg_insert(ItemCounterFlush).values(batch_id=batch_id, flushed_at=datetime.utcnow())
+            .on_conflict_do_nothing(index_elements=[ItemCounterFlush.batch_id])
+            .returning(ItemCounterFlush.batch_id)
+        ).first()
+
+        if is_new_batch:
+            table = Item.__table__
+            db.session.execute(
+                update(table).where(table.c.id == bindparam("item_id")).values(views_count=func.coalesce(table.c.views_count, 0) + bindparam("delta")),
+                deltas,
+            )
+        db.session.execute(delete(ItemCounterFlush).where(ItemCounterFlush.flushed_at < datetime.utcnow() - FLUSH_MARKER_RETENTION))
+        db.session.commit()
+    redis_client.delete(flushing_key, flushing_key + BATCH_ID_SUFFIX)
+    return sum(delta["delta"] for delta in deltas)
+
+
+def flush_interactions(kind: str) -> int:
+    flushing_key = take_pending(PENDING_KEY.format(kind=kind))
+    if not flushing_key:
+        return 0
+
+    pairs = {tuple(map(int, member.split(":"))) for member in redis_client.smembers(flushing_key)}
+    if pairs:
+        # Skip items deleted since; pairs already in the database (written by the fallback path
+        # or by an earlier attempt at this batch) are skipped by the insert
+        item_ids = set(db.session.scalars(select(Item.id).where(Item.id.in_({item_id for item_id, _user_id in pairs}))).all())
+        rows = [{"item_id": item_id, "user_id": user_id} for item_id, user_id in pairs if item_id in item_ids]
+        if rows:
+            insert_interactions(kind, rows)
+    redis_client.delete(flushing_key)
+    return len(pairs)
+
+
+def flush_item_counters() -> dict:
+    """Writes pending views, likes and shares to the database. Returns how many of each were flushed."""
+    redis_client.delete(FLUSH_SCHEDULED_KEY) # interactions recorded from now on schedule a new flush
+
+    flushed = {"views": flush_views()}
+    for kind in INTERACTION_MODELS:
+        flushed[kind] = flush_interactions(kind)
+
+    # Interactions recorded while a leftover batch was retried are still waiting
+    if redis_client.exists(PENDING_VIEWS_KEY, *[PENDING_KEY.format(kind=kind) for kind in INTERACTION_MODELS]):
+        schedule_flush()
+
+    console_log("item counters flushed", flushed)
+    return flushed
@@ -1,15 +1,20 @@
 import sys
 from flask import request, jsonify, current_app
 from werkzeug.exceptions import BadRequestKeyError
-from sqlalchemy import or_
+from sqlalchemy import or_, select, func
+from sqlalchemy.orm import joinedload
 from flask_jwt_extended import get_jwt_identity
 
 from app.extensions import db
-from app.models.item import Item
+from app.models.item import Item, LikeLog, Share
 from app.exceptions import UniqueSlugError
-from app.utils.helpers.basic_helpers import generate_slug
+from app.utils.helpers.basic_helpers import slug_candidates, save_with_unique_value
 from .loggers import console_log, log_exception
 from app.utils.helpers.media_helpers import save_media
+from app.utils.helpers.item_counter_helpers import apply_item_counts
+
+# Loads the image and seller of a page of items in the same query as the items
+ITEM_LISTING_OPTIONS = (joinedload(Item.media), joinedload(Item.seller))
 
 
 def item_check(item_id):
@@ -82,17 +87,18 @@ def save_item(data, item_id_slug=None):
         else:
             item_img_id = None
         
+        changes = dict(item_type=item_type, name=name, description=description, item_img_id=item_img_id, price=price, category=category, brand_name=brand_name, size=size, color=color, material=material, phone=phone, country=country, state=state, city=city)
+        
         if item:
-            slug = generate_slug(name, 'item', item)
+            if item.name == name:
+                item.update(**changes)
+                return item
             
-            item.update(item_type=item_type, name=name, description=description, item_img_id=item_img_id, price=price, category=category, brand_name=brand_name, slug=slug, size=size, color=color, material=material, phone=phone, country=country, state=state, city=city)
-            
-            return item
+            # The slug follows the name; the unique constraint on slug catches collisions
+            return save_with_unique_value(item, "slug", slug_candidates(name), changes=changes)
         else:
-            slug = generate_slug(name, 'item')
-            new_item = Item.create_item(item_type=item_type, name=name, description=description, price=price, category=category, brand_name=brand_name, size=size, color=color, material=material, phone=phone, item_img_id=item_img_id, country=country, state=state, city=city, slug=slug, seller_id=user_id)
-            
-            return new_item
+            new_item = Item(seller_id=user_id, **changes)
+            return save_with_unique_value(new_item, "slug", slug_candidates(name))
     except BadRequestKeyError as e:
         # Handle the case where 'item_img' is not present in the request
         current_app.logger.error(f"An error occurred while saving item ==> Missing item_img field in the request: {str(e)}")
@@ -132,3 +138,35 @@ def fetch_item(item_id_slug):
         return item
     else:
         return None
+
+
+def load_engagement_counts(item_ids: list[int]) -> dict[int, dict]:
+    """Counts the likes and shares of many items with one grouped query, along with their comment counts."""
+    def count_by_item(model):
+        return select(model.item_id, func.count().label("total")).where(model.item_id.in_(item_ids)).group_by(model.item_id).subquery()
+
+    # Comments are counted on the item itself (Item.comments_count)
+    likes, shares = count_by_item(LikeLog), count_by_item(Share)
+    query = (
+        select(Item.id, func.coalesce(likes.c.total, 0), func.coalesce(shares.c.total, 0), Item.comments_count)
+        .outerjoin(likes, likes.c.item_id == Item.id)
+        .outerjoin(shares, shares.c.item_id == Item.id)
+        .where(Item.id.in_(item_ids))
+    )
+    return {
+        item_id: {"likes": total_likes, "shares": total_shares, "comments": total_comments}
+        for item_id, total_likes, total_shares, total_comments in db.session.execute(query)
+    }
+
+
+def serialize_items(items: list[Item]) -> list[dict]:
+    """
+    Serializes a page of items with a constant number of queries, whatever the page size.
+
+    Load the items with ITEM_LISTING_OPTIONS so their image and seller are already there.
+    """
+    if not items:
+        return []
+
+    counts = load_engagement_counts([item.id for item in items])
+    return apply_item_counts([item.to_dict(counts=counts.get(item.id)) for item in items])
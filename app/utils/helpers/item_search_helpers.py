@@ -0,0 +1,149 @@
+'''
+This module defines the marketplace search of the Trendit³ Flask application.
+
+Items can be filtered by category, type, location and price range, and searched by text
+over their name, brand and description (through the `search_vector` column). Results use
+keyset pagination: the cursor carries the sort values of the last item, so deep pages cost
+the same as the first one. Facet counts for category, type, state and price bucket are
+computed in a single GROUPING SETS query over the same filters.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import base64, json
+from datetime import datetime
+from sqlalchemy import select, func, case, tuple_, literal_column
+
+from ...extensions import db
+from ...models.item import Item
+from .item_helpers import ITEM_LISTING_OPTIONS
+
+MAX_PER_PAGE = 50
+
+# Upper bounds of the price buckets, in Naira. The last bucket has no upper bound.
+PRICE_BUCKETS = (5_000, 20_000, 50_000, 100_000, 500_000)
+
+# Sort name -> (column, descending)
+SORTS = {
+    "newest": (Item.created_at, True),
+    "price_asc": (Item.price, False),
+    "price_desc": (Item.price, True),
+}
+
+FILTER_FIELDS = ("category", "item_type", "country", "state", "city")
+
+
+class InvalidSearchError(ValueError):
+    pass
+
+
+def price_bucket_expression():
+    # Rendered as literals, not bound parameters, so the same CASE can be matched in GROUP BY
+    lower = 0
+    whens = []
+    for upper in PRICE_BUCKETS:
+        whens.append((Item.price < literal_column(str(upper)), literal_column(f"'{lower}-{upper}'")))
+        lower = upper
+    return case(*whens, else_=literal_column(f"'{lower}+'"))
+
+
+def parse_search_args(args) -> dict:
+    """Reads the search parameters from the query string."""
+    params = {field: args.get(field) for field in FILTER_FIELDS if args.get(field)}
+    params["q"] = (args.get("q") or "").strip()
+    params["min_price"] = args.get("min_price", type=int)
+    params["max_price"] = args.get("max_price", type=int)
+    params["sort"] = args.get("sort") or "newest"
+    params["cursor"] = args.get("cursor")
+    params["per_page"] = max(1, min(args.get("per_page", 10, type=int), MAX_PER_PAGE))
+    params["facets"] = args.get("facets", "true").lower() != "false"
+
+    if params["sort"] not in SORTS:
+        raise InvalidSearchError(f"sort must be one of: {', '.join(SORTS)}")
+    return params
+
+
+def build_filters(params: dict) -> list:
+    filters = [getattr(Item, field) == params[field] for field in FILTER_FIELDS if params.get(field)]
+
+    if params.get("min_price") is not None:
+        filters.append(Item.price >= params["min_price"])
+    if params.get("max_price") is not None:
+        filters.append(Item.price <= params["max_price"])
+    if params.get("q"):
+        filters.append(Item.search_vector.op("@@")(func.websearch_to_tsquery("english", params["q"])))
+    return filters
+
+
+def encode_cursor(sort: str, item: Item) -> str:
+    column, _descending = SORTS[sort]
+    value = getattr(item, column.key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([value, item.id]).encode()).decode()
+
+
+def decode_cursor(sort: str, cursor: str) -> tuple:
+    try:
+        value, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if SORTS[sort][0] is Item.created_at:
+            value = datetime.fromisoformat(value)
+        return value, int(item_id)
+    except (ValueError, TypeError):
+        raise InvalidSearchError("Invalid cursor")
+
+
+def search_items(params: dict) -> tuple[list[Item], str | None]:
+    """Returns a page of items matching the filters and the cursor of the next page (None on the last page)."""
+    column, descending = SORTS[params["sort"]]
+    query = select(Item).options(*ITEM_LISTING_OPTIONS).where(*build_filters(params))
+
+    if params.get("cursor"):
+        # (column, id) tuples compare row-wise, which Postgres can serve from the composite indexes
+        last_value, last_id = decode_cursor(params["sort"], params["cursor"])
+        position, last_position = tuple_(column, Item.id), tuple_(last_value, last_id)
+        query = query.where(position < last_position if descending else position > last_position)
+
+    order = (column.desc(), Item.id.desc()) if descending else (column.asc(), Item.id.asc())
+    per_page = params["per_page"]
+    items = db.session.scalars(query.order_by(*order).limit(per_page + 1)).all()
+
+    next_cursor = encode_cursor(params["sort"], items[per_page - 1]) if len(items) > per_page else None
+    return items[:per_page], next_cursor
+
+
+def get_facets(params: dict) -> dict:
+    """Counts the matching items per category, type, state and price bucket in one aggregate query."""
+    price_bucket = price_bucket_expression().label("price_bucket")
+    facet_columns = {
+        "category": Item.category,
+        "item_type": Item.item_type,
+        "state": Item.state,
+        "price": price_bucket,
+    }
+
+    query = (
+        select(
+            *facet_columns.values(),
+            *[func.grouping(column).label(f"grouping_{name}") for name, column in facet_columns.items()],
+            func.count().label("count"),
+        )
+        .where(*build_filters(params))
+        .group_by(func.grouping_sets(*[tuple_(column) for column in facet_columns.values()], tuple_()))
+    )
+
+    facets = {name: {} for name in facet_columns}
+    facets["total"] = 0
+    for row in db.session.execute(query).mappings():
+        grouped = [name for name in facet_columns if row[f"grouping_{name}"] == 0]
+        if not grouped:
+            facets["total"] = row["count"] # the empty grouping set
+            continue
+
+        name = grouped[0]
+        value = row[name if name != "price" else "price_bucket"]
+        if value is not None:
+            facets[name][value] = row["count"]
+
+    return facets
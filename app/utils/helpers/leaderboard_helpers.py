@@ -0,0 +1,187 @@
+'''
+This module defines the leaderboards of the Trendit³ Flask application.
+
+There are two boards: `earners`, ranked by the rewards earned from performed tasks, and
+`advertisers`, ranked by what they paid for their tasks. Each board has a daily, weekly and
+all-time version, for all platforms together and for each platform. Every one of them is a
+Redis sorted set of user id -> score, so reading the top of a board or a user's rank never
+touches Postgres.
+
+Scores are incremented when a task performance is credited and when a task's payment
+completes. `rebuild_leaderboards` recomputes every board from the database on a schedule
+(LEADERBOARD_REBUILD_INTERVAL), which fixes any increment lost while Redis was unreachable.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy import select, func
+
+from .loggers import console_log, log_exception
+from ...extensions import db, redis_client
+from ...models.user import Trendit3User
+from ...models.task import Task, TaskPerformance, TaskPaymentStatus
+
+BOARDS = ("earners", "advertisers")
+PERIODS = ("daily", "weekly", "alltime")
+ALL_PLATFORMS = "all"
+MAX_LEADERBOARD_SIZE = 100
+
+BOARD_KEY = "leaderboard:{board}:{platform}:{period}"
+
+# Past daily and weekly boards are kept a little while, then left to expire
+PERIOD_TTLS = {
+    "daily": int(timedelta(days=3).total_seconds()),
+    "weekly": int(timedelta(days=15).total_seconds()),
+    "alltime": None,
+}
+
+
+def period_key(period: str, when: datetime) -> str:
+    if period == "daily":
+        return f"daily:{when:%Y%m%d}"
+    if period == "weekly":
+        year, week, _ = when.isocalendar()
+        return f"weekly:{year}W{week:02d}"
+    return "alltime"
+
+
+def period_start(period: str, now: datetime) -> datetime | None:
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "daily":
+        return midnight
+    if period == "weekly":
+        return midnight - timedelta(days=now.weekday())
+    return None
+
+
+def board_key(board: str, period: str, platform: str | None = None, when: datetime | None = None) -> str:
+    return BOARD_KEY.format(
+        board=board,
+        platform=(platform or ALL_PLATFORMS).lower(),
+        period=period_key(period, when or datetime.utcnow()),
+    )
+
+
+def add_to_boards(board: str, user_id: int, amount, platform: str, when: datetime | None = None) -> None:
+    """Adds to the user's score on every period of the board, overall and for the platform. Never raises."""
+    if not amount:
+        return
+
+    now = when or datetime.utcnow()
+    try:
+        pipeline = redis_client.pipeline(transaction=False)
+        for board_platform in {ALL_PLATFORMS, platform.lower()}:
+            for period in PERIODS:
+                key = board_key(board, period, board_platform, now)
+                pipeline.zincrby(key, float(amount), user_id)
+                if PERIOD_TTLS[period]:
+                    pipeline.expire(key, PERIOD_TTLS[period])
+        pipeline.execute()
+    except Exception as e:
+        log_exception(f"Could not update the {board} leaderboards for user {user_id}", e)
+
+
+def record_task_earning(user_id: int, amount, platform: str) -> None:
+    add_to_boards("earners", user_id, amount, platform)
+
+
+def record_task_spend(task: Task) -> None:
+    add_to_boards("advertisers", task.trendit3_user_id, task.fee_paid or task.fee, task.platform, task.date_paid)
+
+
+def get_leaderboard(board: str, period: str, platform: str | None = None, limit: int = 10) -> list[dict]:
+    """Returns the top of a board, highest score first, with the users' usernames."""
+    limit = max(1, min(limit, MAX_LEADERBOARD_SIZE))
+    entries = redis_client.zrevrange(board_key(board, period, platform), 0, limit - 1, withscores=True)
+    user_ids = [int(user_id) for user_id, _score in entries]
+
+    usernames = dict(db.session.execute(
+        select(Trendit3User.id, Trendit3User.username).where(Trendit3User.id.in_(user_ids))
+    ).all()) if user_ids else {}
+
+    return [
+        {"rank": rank, "user_id": user_id, "username": usernames.get(user_id), "score": score}
+        for rank, (user_id, (_member, score)) in enumerate(zip(user_ids, entries), start=1)
+    ]
+
+
+def get_user_rank(board: str, period: str, user_id: int, platform: str | None = None) -> dict:
+    """Returns the user's rank (None if they aren't on the board) and score."""
+    pipeline = redis_client.pipeline(transaction=False)
+    key = board_key(board, period, platform)
+    pipeline.zrevrank(key, user_id)
+    pipeline.zscore(key, user_id)
+    rank, score = pipeline.execute()
+    return {"rank": rank + 1 if rank is not None else None, "score": score or 0}
+
+
+def earner_totals(since: datetime | None):
+    query = (
+        select(TaskPerformance.user_id, Task.platform, func.sum(TaskPerformance.reward_money))
+        .join(Task, Task.id == TaskPerformance.task_id)
+        .where(TaskPerformance.status == "completed")
+        .group_by(TaskPerformance.user_id, Task.platform)
+    )
+    if since:
+        query = query.where(TaskPerformance.date_completed >= since)
+    return db.session.execute(query).all()
+
+
+def advertiser_totals(since: datetime | None):
+    # Windowed on when the task was paid, like the increments in record_task_spend.
+    # Tasks paid before date_paid existed fall back to their creation date.
+    paid_at = func.coalesce(Task.date_paid, Task.date_created)
+    query = (
+        select(Task.trendit3_user_id, Task.platform, func.sum(func.coalesce(Task.fee_paid, Task.fee)))
+        .where(Task.payment_status == TaskPaymentStatus.COMPLETE)
+        .group_by(Task.trendit3_user_id, Task.platform)
+    )
+    if since:
+        query = query.where(paid_at >= since)
+    return db.session.execute(query).all()
+
+
+BOARD_TOTALS = {
+    "earners": earner_totals,
+    "advertisers": advertiser_totals,
+}
+
+
+def rebuild_leaderboards() -> int:
+    """
+    Recomputes the current period of every board from the database. Returns the number of boards written.
+
+    Each board is written to a temporary key and renamed over the live one, so readers never
+    see a half-built board. Boards with no scores left are deleted.
+    """
+    now = datetime.utcnow()
+    written = 0
+
+    for board, totals in BOARD_TOTALS.items():
+        for period in PERIODS:
+            scores = defaultdict(lambda: defaultdict(float))
+            for user_id, platform, total in totals(period_start(period, now)):
+                for board_platform in {ALL_PLATFORMS, platform.lower()}:
+                    scores[board_key(board, period, board_platform, now)][user_id] += float(total or 0)
+
+            pipeline = redis_client.pipeline()
+            for key, user_scores in scores.items():
+                building_key = f"{key}:rebuilding"
+                pipeline.delete(building_key)
+                pipeline.zadd(building_key, user_scores)
+                pipeline.rename(building_key, key)
+                if PERIOD_TTLS[period]:
+                    pipeline.expire(key, PERIOD_TTLS[period])
+
+            stale_keys = [key for key in redis_client.scan_iter(match=board_key(board, period, "*", now)) if key not in scores]
+            if stale_keys:
+                pipeline.delete(*stale_keys)
+            pipeline.execute()
+            written += len(scores)
+
+    db.session.close()
+    console_log("leaderboards rebuilt", f"{written} boards")
+    return written
@@ -10,8 +10,9 @@ These functions assist with tasks such as:
 @link: https://github.com/zeddyemy
 @package: Trendit³
 '''
-import requests, logging
-from flask import jsonify, json
+import requests, logging, json, gzip, hashlib
+from functools import cache
+from flask import Response, request
 
 from config import Config
 from app.utils import AppJSON
@@ -65,5 +66,31 @@ def get_currency_code(country):
     return None  # Return None if there was an error
 
 
-def get_naija_states_lga():
-    return jsonify(AppJSON.naija_states)
+@cache
+def get_naija_states_payload() -> dict[str, tuple[bytes, str]]:
+    """Serializes and gzips the states/LGA dataset once per process. Returns the body and ETag of each encoding."""
+    body = json.dumps(AppJSON.naija_states, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    etag = hashlib.sha256(body).hexdigest()[:32]
+    return {
+        "identity": (body, etag),
+        "gzip": (gzip.compress(body, compresslevel=9, mtime=0), f"{etag}-gzip"),
+    }
+
+
+def get_naija_states_lga() -> Response:
+    """Serves the whole states/LGA dataset, gzipped when the client accepts it, with an ETag and long cache headers."""
+    encoding = "gzip" if "gzip" in request.accept_encodings else "identity"
+    body, etag = get_naija_states_payload()[encoding]
+    
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype="application/json")
+        if encoding == "gzip":
+            response.headers["Content-Encoding"] = "gzip"
+    
+    response.set_etag(etag)
+    response.vary.add("Accept-Encoding")
+    response.cache_control.public = True
+    response.cache_control.max_age = Config.LOCATION_DATA_MAX_AGE
+    return response
@@ -1,19 +1,100 @@
-import logging
-from flask import current_app
+'''
+This module defines the logging helpers of the Trendit³ Flask application.
+
+`console_log` and `log_exception` format their message only when the record will actually be
+emitted. `JSONFormatter` writes one JSON object per line, with the request id and any extra
+fields (method, path, status, latency) attached by the request hooks. Headers and payloads
+pass through `redact` before they are logged, so secrets never reach the logs.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import json, logging
+from datetime import datetime, timezone
+from flask import current_app, g, has_request_context
 from typing import Any
 
+REDACTED = "[REDACTED]"
+
+# Header and payload keys whose values must never be logged (compared in lower case)
+SENSITIVE_KEYS = {
+    "authorization", "cookie", "set-cookie", "x-bot-secret", "verif-hash", "x-paystack-signature",
+    "password", "new_password", "old_password", "token", "access_token", "reset_token", "signup_token",
+    "two_fa_token", "payout_token", "entered_code", "otp", "secret", "secret_key", "card", "cvv", "pin",
+}
+
+# Attributes every LogRecord has. Anything else on a record was passed through `extra`.
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+def redact(data: Any) -> Any:
+    """Returns a copy of headers, dicts or lists with the values of sensitive keys replaced."""
+    if hasattr(data, "items"):
+        return {key: REDACTED if str(key).lower() in SENSITIVE_KEYS else redact(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [redact(item) for item in data]
+    return data
+
+
+class RequestContextFilter(logging.Filter):
+    """Attaches the id of the current request to every record logged while handling it."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if has_request_context() and not hasattr(record, "request_id"):
+            record.request_id = g.get("request_id")
+        return True
+
+
+class _Banner:
+    """Defers building console_log's banner until a handler actually formats the record."""
+
+    def __init__(self, label, data):
+        self.label = label
+        self.data = data
+
+    def __str__(self):
+        return f"\n\n{self.label:-^50}\n {self.data} \n{'//':-^50}\n\n"
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects, including any extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        if record.args and isinstance(record.args[0], _Banner):
+            message = f"{record.args[0].label}: {record.args[0].data}" # no banner decoration in JSON
+        else:
+            message = record.getMessage()
+        
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": message,
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES})
+
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, default=str)
+
+
 def console_log(label: str ="INFO", data: Any =None) -> None:
     """
     Print a formatted message to the console for visual clarity.
 
+    Logged at DEBUG level, so it costs nothing when debug logging is off.
+
     Args:
         label (str, optional): A label for the message, centered and surrounded by dashes. Defaults to 'Label'.
         data: The data to be printed. Can be of any type. Defaults to None.
     """
-    
-    app = current_app
-    logger = app.logger
-    logger.info(f"\n\n{label:-^50}\n {data} \n{'//':-^50}\n\n", stacklevel=2)
+
+    logger = current_app.logger
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s", _Banner(label, data), extra={"label": label}, stacklevel=2)
 
 
 def log_exception(label: str ="EXCEPTION", data: Any = "Nothing") -> None:
@@ -25,6 +106,5 @@ def log_exception(label: str ="EXCEPTION", data: Any = "Nothing") -> None:
         data: Additional data to be logged along with the exception. Defaults to 'Nothing'.
     """
 
-    app = current_app
-    logger = app.logger
-    logger.exception(f"\n\n{label:-^50}\n {str(data)} \n {'//':-^50}\n\n", stacklevel=2)
\ No newline at end of file
+    logger = current_app.logger
+    logger.exception("%s", _Banner(label, data), extra={"label": label}, stacklevel=2)
@@ -2,9 +2,10 @@ from flask import Flask
 from threading import Thread
 from flask import render_template, current_app
 from flask_mail import Message
+from sqlalchemy.orm import joinedload
 from enum import Enum
 
-from app import mail
+from app import mail, db
 from config import Config
 from ...utils.payments.rates import convert_amount
 from .loggers import console_log, log_exception
@@ -66,6 +67,7 @@ def send_code_async_email(app, user_email:str, six_digit_code:int | str, code_ty
                 user=user,
                 firstname=firstname)
             msg = Message(subject, sender=Config.MAIL_ALIAS, recipients=[user_email], html=template)
+        db.session.close() # release the connection before the slow SMTP call
         try:
             mail.send(msg)
         except Exception as e:
@@ -197,6 +199,7 @@ def send_async_other_email(app, user_email, email_type, task_type, task_time, ta
             msg = Message(subject, sender=Config.MAIL_ALIAS, recipients=[user_email], html=template)
 
         
+        db.session.close() # release the connection before the slow SMTP call
         try:
             mail.send(msg)
         except Exception as e:
@@ -244,6 +247,7 @@ def send_async_transaction_alert_email(app: Flask, tx_type: str, user_email: str
         
         msg = Message(subject, sender=Config.MAIL_ALIAS, recipients=[user_email], html=template)
         
+        db.session.close() # release the connection before the slow SMTP call
         try:
             mail.send(msg)
         except Exception as e:
@@ -277,6 +281,7 @@ def send_async_social_profile_status_email(app: Flask, user_email, platform, sta
         
         msg = Message(subject, sender=Config.MAIL_ALIAS, recipients=[user_email], html=template)
         
+        db.session.close() # release the connection before the slow SMTP call
         try:
             mail.send(msg)
         except Exception as e:
@@ -300,10 +305,53 @@ def send_social_profile_status_email(user_email, platform, status=SocialLinkStat
 
 
 
+def send_social_profile_review_emails(profile_ids: list[int]) -> int:
+    '''
+    Emails the owners of reviewed social profiles the decision, over a single SMTP connection.
+
+    Runs in the Celery worker after a batch of profiles is approved or rejected.
+
+    Args:
+        profile_ids (list[int]): The reviewed social profiles.
+
+    Returns:
+        int: The number of emails sent.
+    '''
+    profiles: list[SocialMediaProfile] = SocialMediaProfile.query \
+        .options(joinedload(SocialMediaProfile.trendit3_user)) \
+        .filter(SocialMediaProfile.id.in_(profile_ids)).all()
+    
+    messages = []
+    for social_profile in profiles:
+        user: Trendit3User = social_profile.trendit3_user
+        approved = social_profile.status == SocialLinkStatus.VERIFIED
+        template = render_template(
+            "mail/social-approval.html" if approved else "mail/social-rejection.html",
+            user=user,
+            user_email=user.email,
+            social_profile=social_profile
+        )
+        subject = "Social Profile Approved" if approved else "Social Profile Rejected"
+        messages.append(Message(subject, sender=Config.MAIL_ALIAS, recipients=[user.email], html=template))
+    
+    db.session.close() # release the connection before the slow SMTP calls
+    
+    sent = 0
+    with mail.connect() as connection:
+        for msg in messages:
+            try:
+                connection.send(msg)
+                sent += 1
+            except Exception as e:
+                log_exception(f"EXCEPTION SENDING SOCIAL PROFILE REVIEW MAIL TO {msg.recipients}", e)
+    
+    return sent
+
+
 
 def send_async_task_performance_email(app: Flask, pt_id):
     with app.app_context():
-        performed_task: TaskPerformance = TaskPerformance.query.filter_by(id=pt_id)
+        performed_task: TaskPerformance = TaskPerformance.query.filter_by(id=pt_id).first()
         user: Trendit3User = performed_task.trendit3_user
         user_email = user.email
         
@@ -325,6 +373,7 @@ def send_async_task_performance_email(app: Flask, pt_id):
         
         msg = Message(subject, sender=Config.MAIL_ALIAS, recipients=[user_email], html=template)
         
+        db.session.close() # release the connection before the slow SMTP call
         try:
             mail.send(msg)
         except Exception as e:
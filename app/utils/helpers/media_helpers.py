@@ -2,31 +2,51 @@
 This module defines helper functions for handling media operations in the Trendit³ Flask application.
 
 These functions assist with tasks such as saving media files to Cloudinary and adding media properties to the database.
+They also implement the media upload pipeline: uploaded files are copied to private staging
+storage in the request, then a background job on the worker uploads them concurrently and
+attaches them to their owner.
 
 @author: Emmanuel Olowu
 @link: https://github.com/zeddyemy
 @package: Trendit³
 '''
-import os
-from io import BufferedReader
-import tempfile
+import os, json, shutil, hashlib
+import requests
+from io import BufferedReader, BytesIO
+from uuid import uuid4
+from threading import Thread
 from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from flask import current_app
 from werkzeug.utils import secure_filename
 from werkzeug.datastructures import FileStorage
-import cloudinary
-import cloudinary.uploader
 
-from app.extensions import db
+from app.extensions import db, redis_client
+from app.metrics import track_outbound
 from app.models import Media
 from config import Config
 from .basic_helpers import generate_random_string
 from .loggers import console_log, log_exception
 
-cloudinary.config( 
-    cloud_name = Config.CLOUDINARY_CLOUD_NAME, 
-    api_key = Config.CLOUDINARY_API_KEY, 
-    api_secret = Config.CLOUDINARY_API_SECRET 
-)
+
+@cache
+def get_cloudinary_uploader():
+    """Imports and configures Cloudinary the first time an upload needs it, instead of when the app boots."""
+    import cloudinary
+    import cloudinary.uploader
+    
+    cloudinary.config( 
+        cloud_name = Config.CLOUDINARY_CLOUD_NAME, 
+        api_key = Config.CLOUDINARY_API_KEY, 
+        api_secret = Config.CLOUDINARY_API_SECRET 
+    )
+    return cloudinary.uploader
+
+
+STAGING_FOLDER = "staging"
+STAGED_UPLOAD_KEY = "media:staged:{location}:upload"
+STAGED_UPLOAD_TTL = 3600 # longer than the upload job's retry window
 
 # Constants for file type validation
 IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.svg'}
@@ -50,21 +70,56 @@ def validate_file_extension(extension):
 def upload_to_cloudinary(media_file: FileStorage, new_media_name, folder_path, resource_type):
     """Upload the media file to Cloudinary."""
     try:
-        return cloudinary.uploader.upload(
-            media_file,
-            resource_type=resource_type,
-            public_id=new_media_name,
-            folder=folder_path,
-        )
+        with track_outbound("cloudinary"):
+            return get_cloudinary_uploader().upload(
+                media_file,
+                resource_type=resource_type,
+                public_id=new_media_name,
+                folder=folder_path,
+            )
     except Exception as e:
         log_exception("Cloudinary upload failed", e)
         raise e
     
 
-def save_media_to_db(media_name: str, original_media_path: str):
+def upload_to_local_storage(media_file, new_media_name, folder_path, resource_type):
+    """
+    Store the media file in the app's uploads directory.
+    
+    Used in place of Cloudinary when MEDIA_STORAGE is set to "local" (development and tests).
+    Returns a dict shaped like Cloudinary's upload result.
+    """
+    source_name = getattr(media_file, "filename", None) or getattr(media_file, "name", "")
+    extension = os.path.splitext(source_name)[1].lower()
+    
+    uploads_dir = current_app.config["UPLOADS_DIR"]
+    dest_dir = os.path.join(uploads_dir, folder_path)
+    os.makedirs(dest_dir, exist_ok=True)
+    
+    dest_filename = f"{new_media_name}{extension}"
+    with open(os.path.join(dest_dir, dest_filename), "wb") as dest:
+        shutil.copyfileobj(media_file, dest)
+    
+    api_domain = current_app.config["API_DOMAIN_NAME"]
+    static_path = os.path.relpath(dest_dir, current_app.config["STATIC_DIR"]).replace(os.sep, "/")
+    return {
+        "secure_url": f"{api_domain}/static/{static_path}/{dest_filename}",
+        "resource_type": resource_type,
+    }
+
+
+def upload_media(media_file, new_media_name, folder_path, resource_type):
+    """Upload the media file to the configured storage backend."""
+    if current_app.config.get("MEDIA_STORAGE") == "local":
+        return upload_to_local_storage(media_file, new_media_name, folder_path, resource_type)
+    
+    return upload_to_cloudinary(media_file, new_media_name, folder_path, resource_type)
+
+
+def save_media_to_db(media_name: str, original_media_path: str, **kwargs):
     """Save the media record to the database."""
     try:
-        new_media = Media(filename=media_name, media_path=original_media_path)
+        new_media = Media(filename=media_name, media_path=original_media_path, **kwargs)
         db.session.add(new_media)
         db.session.commit()
         return new_media
@@ -74,11 +129,73 @@ def save_media_to_db(media_name: str, original_media_path: str):
         raise e
 
 
+def hash_media_file(media_file, chunk_size: int = 64 * 1024) -> str:
+    """Returns the SHA-256 hex digest of a file object, read in chunks. The file is rewound afterwards."""
+    sha256 = hashlib.sha256()
+    media_file.seek(0)
+    for chunk in iter(lambda: media_file.read(chunk_size), b""):
+        sha256.update(chunk)
+    media_file.seek(0)
+    return sha256.hexdigest()
+
+
+def get_media_by_hash(content_hash: str) -> Media | None:
+    """Returns an already uploaded Media with the same content, if any."""
+    return Media.query.filter_by(content_hash=content_hash).order_by(Media.id).first()
+
+
+def upload_media_file(media_file, filename: str, content_hash: str | None = None) -> dict:
+    """
+    Normalizes (for images) and uploads a media file, without touching the database.
+
+    Args:
+        media_file: A readable binary file object.
+        filename (str): The original file name.
+        content_hash (str, optional): The file's SHA-256. When given, it names the upload, so
+            uploading the same file again overwrites the earlier upload instead of adding one.
+
+    Returns:
+        dict: The media properties to record: filename, media_path, thumbnail_path, width, height and size.
+
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    media_name = secure_filename(filename)
+    the_media_name, the_media_ext = os.path.splitext(os.path.basename(media_name)) # get the file name and extension
+    new_media_name = f"{the_media_name}-{content_hash[:16] if content_hash else generate_random_string(8)}"
+    
+    folder_path = get_folder_path() # create the path were image will be stored
+    resource_type = validate_file_extension(the_media_ext) # Check the file type and set the resource_type accordingly
+    
+    media_props = {"filename": media_name, "thumbnail_path": None, "width": None, "height": None, "size": None}
+    
+    from .image_helpers import normalize_image # Pillow is only loaded by workers that process images
+    
+    processed = normalize_image(media_file, media_name) if resource_type == "image" else None
+    if processed:
+        media_props.update(filename=f"{the_media_name}{processed['extension']}", width=processed["width"], height=processed["height"], size=processed["size"])
+        
+        upload_result = upload_media(processed["file"], new_media_name, folder_path, resource_type)
+        thumbnail_result = upload_media(processed["thumbnail"], f"{new_media_name}-thumb", folder_path, resource_type)
+        media_props["thumbnail_path"] = thumbnail_result['secure_url']
+    else:
+        upload_result = upload_media(media_file, new_media_name, folder_path, resource_type)
+        media_props["size"] = upload_result.get("bytes")
+        media_props["width"] = upload_result.get("width")
+        media_props["height"] = upload_result.get("height")
+    
+    media_props["media_path"] = upload_result['secure_url'] # Get the URL of the uploaded media
+    return media_props
+
+
 def save_media(media_file, filename=None) -> Media:
     """
     Saves a media file (image or video) to Cloudinary and the database.
     and then return the media instance after adding the media to Media Table
 
+    Images are normalized and thumbnailed before upload, see `normalize_image`.
+    Files whose content was uploaded before are not uploaded again, the returned Media points at the earlier upload.
+
     Args:
         media_file (werkzeug.datastructures.FileStorage): The media file object to be uploaded.
 
@@ -91,49 +208,286 @@ def save_media(media_file, filename=None) -> Media:
     
     console_log("media_file", media_file)
     
+    # Reuse the existing record if this exact file was uploaded before
+    content_hash = hash_media_file(media_file)
+    existing_media = get_media_by_hash(content_hash)
+    if existing_media:
+        console_log("reusing media", existing_media)
+        media = reuse_media(existing_media)
+        db.session.add(media)
+        db.session.commit()
+        return media
     
-    # Generate a random string and append it to the original file name
-    rand_string = generate_random_string(8)
-    media_name = secure_filename(filename) if filename else secure_filename(media_file.filename) # Grab file name of the selected media
-    the_media_name, the_media_ext = os.path.splitext(os.path.basename(media_name)) # get the file name and extension
-    new_media_name = f"{the_media_name}-{rand_string}"
+    media_props = upload_media_file(media_file, filename or media_file.filename, content_hash)
+    console_log("upload result", media_props)
     
+    # Add the media properties to database
+    new_media = save_media_to_db(media_props.pop("filename"), media_props.pop("media_path"), content_hash=content_hash, **media_props)
     
-    folder_path = get_folder_path() # create the path were image will be stored
-    resource_type = validate_file_extension(the_media_ext) # Check the file type and set the resource_type accordingly
+    console_log("new_media", new_media.get_path())
     
-    # Upload the media to Cloudinary
-    upload_result = upload_to_cloudinary(media_file, new_media_name, folder_path, resource_type)
-    console_log("Cloudinary upload_result", upload_result)
+    return new_media
+
+
+def stage_media_files(media_files) -> list[dict]:
+    """
+    Stages uploaded files so they can be uploaded outside the request.
     
-    original_media_path = upload_result['secure_url'] # Get the URL of the uploaded media
+    The upload job runs on the worker, which doesn't share the web process's disk, so the files
+    are copied as-is to private staging storage both can reach (see `stage_file`). Only their
+    references go to the job, the bytes never pass through Redis.
+
+    Args:
+        media_files (FileStorage | list[FileStorage]): The uploaded file(s).
+
+    Returns:
+        list[dict]: The staged files: their name, content hash and staging location.
+    """
+    media_files = media_files if isinstance(media_files, list) else [media_files]
+    media_files = [media_file for media_file in media_files if isinstance(media_file, FileStorage) and media_file.filename]
     
-    # Add the media properties to database
-    new_media = save_media_to_db(media_name, original_media_path)
+    batch_id = uuid4().hex
+    staged_media = []
+    for index, media_file in enumerate(media_files):
+        staged = {
+            "filename": secure_filename(media_file.filename),
+            "content_hash": hash_media_file(media_file),
+            "location": f"{batch_id}-{index}",
+        }
+        stage_file(media_file, staged["location"])
+        staged_media.append(staged)
     
-    console_log("new_media", new_media.get_path())
+    return staged_media
+
+
+def stage_file(media_file, location: str) -> None:
+    """
+    Copies a file to staging storage.
+
+    With Cloudinary, files are staged as private raw uploads, which only signed URLs can read.
+    With local storage (development, where web and worker share a disk), they go to MEDIA_STAGING_DIR.
+    """
+    if current_app.config.get("MEDIA_STORAGE") == "local":
+        staging_dir = current_app.config["MEDIA_STAGING_DIR"]
+        os.makedirs(staging_dir, exist_ok=True)
+        with open(os.path.join(staging_dir, location), "wb") as dest:
+            shutil.copyfileobj(media_file, dest)
+        return
     
-    return new_media
+    with track_outbound("cloudinary"):
+        get_cloudinary_uploader().upload(media_file, resource_type="raw", type="private", public_id=f"{STAGING_FOLDER}/{location}")
 
 
-def save_media_files_to_temp(media_files):
-    temp_dir = tempfile.mkdtemp()
-    media_file_paths = []
+def load_staged_media(staged: dict) -> bytes:
+    """Reads a staged file's bytes back from staging storage."""
+    if current_app.config.get("MEDIA_STORAGE") == "local":
+        with open(os.path.join(current_app.config["MEDIA_STAGING_DIR"], staged["location"]), "rb") as staged_file:
+            return staged_file.read()
     
-    console_log("media files", media_files)
-    if isinstance(media_files, list):
+    import cloudinary.utils
+    get_cloudinary_uploader() # configures the credentials the URL is signed with
+    url = cloudinary.utils.private_download_url(f"{STAGING_FOLDER}/{staged['location']}", "", resource_type="raw", type="private")
+    with track_outbound("cloudinary"):
+        response = requests.get(url, timeout=current_app.config["MEDIA_STAGING_TIMEOUT"])
+    response.raise_for_status()
+    return response.content
+
+
+def discard_staged_media(staged_media: list[dict]) -> None:
+    """Deletes staged files from staging storage. Never raises."""
+    for staged in staged_media:
+        try:
+            if current_app.config.get("MEDIA_STORAGE") == "local":
+                os.remove(os.path.join(current_app.config["MEDIA_STAGING_DIR"], staged["location"]))
+            else:
+                with track_outbound("cloudinary"):
+                    get_cloudinary_uploader().destroy(f"{STAGING_FOLDER}/{staged['location']}", resource_type="raw", type="private")
+        except Exception as e:
+            log_exception(f"Could not discard staged file {staged['location']}", e)
+
+
+def get_noted_upload(staged: dict) -> dict | None:
+    """Returns the upload result noted for a staged file, if it was uploaded by an earlier attempt."""
+    try:
+        noted = redis_client.get(STAGED_UPLOAD_KEY.format(location=staged["location"]))
+        return json.loads(noted) if noted else None
+    except Exception as e:
+        log_exception("Could not read the noted upload", e)
+        return None
+
+
+def note_upload(staged: dict, media_props: dict) -> None:
+    """Notes a staged file's upload result, so a retry doesn't upload it again. Best effort."""
+    try:
+        redis_client.setex(STAGED_UPLOAD_KEY.format(location=staged["location"]), STAGED_UPLOAD_TTL, json.dumps(media_props))
+    except Exception as e:
+        log_exception("Could not note the upload", e)
+
+
+def upload_staged_file(app, staged: dict) -> dict:
+    """
+    Uploads a single staged file to storage without touching the database,
+    so it is safe to run from worker threads.
+
+    The upload result is noted in Redis, so if attaching it fails afterwards,
+    the retry reuses the upload instead of uploading it again.
+    """
+    with app.app_context():
+        media_props = get_noted_upload(staged)
+        if media_props is None:
+            media_file = BytesIO(load_staged_media(staged))
+            media_file.name = staged["filename"]
+            media_props = upload_media_file(media_file, staged["filename"], staged["content_hash"])
+            note_upload(staged, media_props)
         
-        for media_file in media_files:
-            filename = secure_filename(media_file.filename)
-            file_path = os.path.join(temp_dir, filename)
-            media_file.save(file_path)
-            media_file_paths.append(file_path)
+        return {"location": staged["location"], "content_hash": staged["content_hash"], **media_props}
+
+
+def upload_staged_files(staged_media: list[dict]) -> tuple[list[dict], list[dict]]:
+    """
+    Uploads staged files concurrently, bounded by MEDIA_UPLOAD_CONCURRENCY.
+
+    Args:
+        staged_media (list[dict]): The staged files, as returned by `stage_media_files`.
+
+    Returns:
+        tuple: the upload results (in the order of staged_media) and the staged files that failed.
+    """
+    app = current_app._get_current_object()
+    max_workers = max(1, min(int(app.config.get("MEDIA_UPLOAD_CONCURRENCY", 4)), len(staged_media)))
+    
+    uploaded, failed = [], []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [(staged, executor.submit(upload_staged_file, app, staged)) for staged in staged_media]
+        for staged, future in futures:
+            try:
+                uploaded.append(future.result())
+            except Exception as e:
+                log_exception(f"Uploading staged file {staged['location']} failed", e)
+                failed.append(staged)
+    
+    return uploaded, failed
+
+
+def attach_media(target: str, target_id: int, media: list[Media]) -> None:
+    """Attaches uploaded media to the object they were uploaded for."""
+    from app.models import Task, TaskPerformance, Pricing, Profile
+    
+    if target == "task":
+        task = Task.query.get(target_id)
+        if task is None:
+            raise LookupError(f"Task {target_id} not found")
+        task.media.extend(media)
+    elif target == "profile_picture":
+        profile = Profile.query.filter_by(trendit3_user_id=target_id).first()
+        if profile is None:
+            raise LookupError(f"Profile for user {target_id} not found")
+        profile.profile_picture = media[-1]
+    elif target == "pricing_icon":
+        pricing = Pricing.query.get(target_id)
+        if pricing is None:
+            raise LookupError(f"Pricing {target_id} not found")
+        pricing.price_icon = media[-1]
+    elif target == "proof_screenshot":
+        performed_task = TaskPerformance.query.get(target_id)
+        if performed_task is None:
+            raise LookupError(f"Performed task {target_id} not found")
+        performed_task.proof_screenshot = media[-1]
     else:
-        media_file = media_files
-        if not isinstance(media_file, str):
-            filename = secure_filename(media_file.filename)
-            file_path = os.path.join(temp_dir, filename)
-            media_file.save(file_path)
-            media_file_paths.append(file_path)
-
-    return media_file_paths
\ No newline at end of file
+        raise ValueError(f"Unknown media target: {target}")
+
+
+def reuse_media(media: Media) -> Media:
+    """
+    Returns a new Media record pointing at the upload of an existing one.
+
+    Only the upload is shared. Records belong to whatever they are attached to, and a task's
+    media are deleted with it, so sharing a record would let one owner delete another's media.
+    """
+    return Media(filename=media.filename, media_path=media.media_path, thumbnail_path=media.thumbnail_path, width=media.width, height=media.height, size=media.size, content_hash=media.content_hash)
+
+
+def process_staged_media(target: str, target_id: int, staged_media: list[dict]) -> list[dict]:
+    """
+    Uploads staged files, records them in the Media table and attaches them to their target.
+    
+    Files whose content was uploaded before are not uploaded again, and identical files in
+    the batch are attached once. Files that were uploaded and recorded are removed from staging,
+    so calling this again with the files it returns only retries what is left.
+
+    Returns:
+        list[dict]: The staged files that still need to be uploaded.
+    """
+    if not staged_media:
+        return []
+    
+    hashes = {staged["content_hash"] for staged in staged_media}
+    known_media = {media.content_hash: media for media in Media.query.filter(Media.content_hash.in_(hashes)).order_by(Media.id.desc())}
+    
+    # Only upload the first file of each unknown content
+    to_upload, seen = [], set()
+    for staged in staged_media:
+        if staged["content_hash"] not in known_media and staged["content_hash"] not in seen:
+            seen.add(staged["content_hash"])
+            to_upload.append(staged)
+    
+    uploaded, failed = upload_staged_files(to_upload) if to_upload else ([], [])
+    for result in uploaded:
+        new_media = Media(**{key: value for key, value in result.items() if key != "location"})
+        db.session.add(new_media)
+        known_media[result["content_hash"]] = new_media
+    
+    done = [staged for staged in staged_media if staged["content_hash"] in known_media]
+    if not done:
+        return failed
+    
+    try:
+        media = []
+        for content_hash in dict.fromkeys(staged["content_hash"] for staged in done):
+            the_media = known_media[content_hash]
+            media.append(reuse_media(the_media) if the_media.id else the_media)
+        
+        db.session.add_all(media)
+        attach_media(target, target_id, media)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    
+    discard_staged_media(done)
+    return [staged for staged in staged_media if staged not in done]
+
+
+def queue_media_upload(target: str, target_id: int, staged_media: list[dict]) -> None:
+    """
+    Hands staged files to the background upload job.
+
+    The job only gets the files' references. If the Celery broker can't be reached,
+    the files are uploaded in a local thread instead, from the same staging storage.
+    """
+    if not staged_media:
+        return
+    
+    from app.celery.jobs.tasks import upload_staged_media
+    
+    try:
+        upload_staged_media.delay(target, target_id, staged_media)
+    except Exception as e:
+        log_exception("Could not queue media upload, uploading in a thread instead", e)
+        Thread(target=async_process_staged_media, args=(current_app._get_current_object(), target, target_id, staged_media)).start()
+
+
+def async_process_staged_media(app, target: str, target_id: int, staged_media: list[dict]) -> None:
+    with app.app_context():
+        failed = staged_media
+        try:
+            failed = process_staged_media(target, target_id, staged_media)
+        except Exception as e:
+            log_exception("An exception occurred processing staged media", e)
+        finally:
+            db.session.close()
+        
+        if failed:
+            # There is no retry in a thread, so give up on them
+            log_exception("Some staged media could not be uploaded", [staged["location"] for staged in failed])
+            discard_staged_media(failed)
@@ -0,0 +1,154 @@
+'''
+This module defines the one-time code store of the Trendit³ Flask application.
+
+Codes for signup verification, 2FA, password reset, email change, payouts and admin login
+live in Redis with a native TTL, so nothing is written to Postgres and expired codes clean
+themselves up. Each code allows a limited number of wrong guesses (counted atomically), and
+a new code can't be sent to the same identity more than once per OTP_RESEND_INTERVAL.
+
+Only a hash of each code is stored. A code can also be bound to a value it was issued for
+(e.g. the new address of an email change), which is hashed with it, so the code only
+verifies together with that same value.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import secrets, hashlib
+from enum import Enum
+from flask import current_app
+
+from ...extensions import redis_client
+from ...exceptions import OTPError, OTPThrottledError
+
+
+class OTPPurpose(Enum):
+    SIGNUP = 'signup'
+    TWO_FA = '2fa'
+    PWD_RESET = 'pwd_reset'
+    EMAIL_CHANGE = 'email_change'
+    PAYOUT = 'payout'
+    ADMIN_LOGIN = 'admin_login'
+
+
+# How long codes for each purpose stay valid, in seconds
+OTP_TTLS = {
+    OTPPurpose.SIGNUP: 30 * 60,
+    OTPPurpose.TWO_FA: 15 * 60,
+    OTPPurpose.PWD_RESET: 15 * 60,
+    OTPPurpose.EMAIL_CHANGE: 30 * 60,
+    OTPPurpose.PAYOUT: 10 * 60,
+    OTPPurpose.ADMIN_LOGIN: 15 * 60,
+}
+
+OTP_KEY = "otp:{purpose}:{identity}"
+RESEND_KEY = "otp:resend:{purpose}:{identity}"
+
+# Checks a code and counts the attempt in one round trip, so parallel guesses can't skip the limit.
+# Returns 1 if the code matches, 0 if it doesn't, -1 if there is no code and -2 if it has been burned.
+VERIFY_SCRIPT = redis_client.register_script("""
+local stored = redis.call('HGET', KEYS[1], 'code')
+if not stored then
+    return -1
+end
+if stored == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+    return -2
+end
+return 0
+""")
+
+
+def _hash_code(purpose: OTPPurpose, identity, code, bound_to=None) -> str:
+    bound_to = f":{bound_to}" if bound_to is not None else ""
+    return hashlib.sha256(f"{purpose.value}:{identity}:{code}{bound_to}".encode()).hexdigest()
+
+
+def generate_otp_code(length: int = 6) -> str:
+    """Generates a random numeric code that doesn't start with 0."""
+    return str(secrets.randbelow(9 * 10 ** (length - 1)) + 10 ** (length - 1))
+
+
+def check_resend_throttle(purpose: OTPPurpose, identity) -> None:
+    """
+    Reserves the resend slot of an identity for OTP_RESEND_INTERVAL seconds.
+
+    Raises:
+        OTPThrottledError: If a code was sent to this identity too recently.
+    """
+    resend_key = RESEND_KEY.format(purpose=purpose.value, identity=identity)
+    if not redis_client.set(resend_key, 1, nx=True, ex=current_app.config["OTP_RESEND_INTERVAL"]):
+        raise OTPThrottledError(retry_after=max(redis_client.ttl(resend_key), 1))
+
+
+def issue_otp(purpose: OTPPurpose, identity, code: str | None = None, length: int = 6, throttle: bool = True, bound_to=None) -> str:
+    """
+    Issues a new code for an identity, replacing any code it already has for that purpose.
+
+    Args:
+        purpose (OTPPurpose): What the code is for.
+        identity: Who the code is for, e.g. an email or user id.
+        code (str, optional): The code to store. A numeric code is generated when not given.
+        length (int): Digits in the generated code.
+        throttle (bool): Whether to enforce OTP_RESEND_INTERVAL for this identity.
+        bound_to (optional): A value the code is only valid with, passed again to `verify_otp`.
+
+    Returns:
+        str: The code, to be sent to the user.
+
+    Raises:
+        OTPThrottledError: If a code was issued to this identity too recently.
+    """
+    if throttle:
+        check_resend_throttle(purpose, identity)
+
+    code = str(code) if code is not None else generate_otp_code(length)
+    key = OTP_KEY.format(purpose=purpose.value, identity=identity)
+
+    pipe = redis_client.pipeline()
+    pipe.delete(key)
+    pipe.hset(key, mapping={"code": _hash_code(purpose, identity, code, bound_to), "attempts": 0})
+    pipe.expire(key, OTP_TTLS[purpose])
+    pipe.execute()
+
+    return code
+
+
+def verify_otp(purpose: OTPPurpose, identity, code, bound_to=None) -> None:
+    """
+    Verifies and consumes a code. A code issued with `bound_to` only matches with the same value.
+
+    Raises:
+        OTPError: If the code is wrong, expired, or has had too many wrong guesses.
+    """
+    if code is None or str(code).strip() == "":
+        raise OTPError("A verification code is required.", 400)
+
+    key = OTP_KEY.format(purpose=purpose.value, identity=identity)
+    result = VERIFY_SCRIPT(keys=[key], args=[_hash_code(purpose, identity, str(code).strip(), bound_to), current_app.config["OTP_MAX_ATTEMPTS"]])
+
+    if result == -1:
+        raise OTPError("The code has expired or has already been used. Please request a new one.", 401)
+    if result == -2:
+        raise OTPError("Too many incorrect attempts. Please request a new code.", 429)
+    if result != 1:
+        raise OTPError("The code provided is incorrect.", 400)
+
+
+def issue_link_token(purpose: OTPPurpose, value) -> str:
+    """Issues a random single-use token (e.g. for emailed links) that resolves to `value`."""
+    token = secrets.token_urlsafe(16)
+    redis_client.set(OTP_KEY.format(purpose=purpose.value, identity=token), str(value), ex=OTP_TTLS[purpose])
+    return token
+
+
+def consume_link_token(purpose: OTPPurpose, token: str) -> str | None:
+    """Returns the value a link token resolves to and deletes it, or None if it's invalid, expired or used."""
+    if not token:
+        return None
+    return redis_client.getdel(OTP_KEY.format(purpose=purpose.value, identity=token))
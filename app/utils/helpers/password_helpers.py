@@ -0,0 +1,78 @@
+'''
+This module defines the password hashing policy of the Trendit³ Flask application.
+
+The hashing method and its cost are read from the config (PASSWORD_HASH_METHOD), so they can be
+tuned without a code change. Hashes made with older parameters are upgraded the next time the user
+logs in successfully.
+
+Verification can be run in a bounded thread pool (PASSWORD_HASH_WORKERS) so a burst of logins
+can't keep every CPU busy hashing at once.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = Lock()
+
+
+def get_hash_method() -> str:
+    """
+    Returns the werkzeug hashing method from the config, e.g. `pbkdf2:sha256:600000` or `scrypt:32768:8:1`.
+
+    Missing cost parameters are filled in with werkzeug's defaults, so the method always
+    matches the prefix werkzeug writes into the hash.
+    """
+    method = current_app.config.get("PASSWORD_HASH_METHOD") or "pbkdf2:sha256:600000"
+    parts = method.split(":")
+    if parts[0] == "scrypt" and len(parts) == 1:
+        method = "scrypt:32768:8:1"
+    elif parts[0] == "pbkdf2" and len(parts) < 3:
+        method = f"pbkdf2:{parts[1] if len(parts) == 2 else 'sha256'}:600000"
+
+    return method
+
+
+def hash_password(password: str) -> str:
+    """Hashes a password with the configured method."""
+    return generate_password_hash(password, get_hash_method())
+
+
+def needs_rehash(pwhash: str) -> bool:
+    """Checks if a hash was made with different parameters from the configured method."""
+    return pwhash.split("$", 1)[0] != get_hash_method()
+
+
+def _get_executor() -> ThreadPoolExecutor | None:
+    global _executor
+    workers = int(current_app.config.get("PASSWORD_HASH_WORKERS") or 0)
+    if workers <= 0:
+        return None
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+    return _executor
+
+
+def verify_password_hash(pwhash: str, password: str) -> bool:
+    """
+    Checks a password against its hash.
+
+    When PASSWORD_HASH_WORKERS is set, the check runs in the shared thread pool. hashlib
+    releases the GIL while hashing, so threaded and gevent workers keep serving other
+    requests while a login waits its turn.
+    """
+    if not pwhash or password is None:
+        return False
+
+    executor = _get_executor()
+    if executor is None:
+        return check_password_hash(pwhash, password)
+
+    return executor.submit(check_password_hash, pwhash, password).result()
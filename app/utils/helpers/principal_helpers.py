@@ -0,0 +1,90 @@
+'''
+This module defines helper functions for resolving the current user (the principal) in the Trendit³ Flask application.
+
+The principal is loaded once per request, with the relationships the auth decorators and most
+controllers need, and kept on `flask.g`. Role sets are also cached in Redis for a short time, so
+`roles_required` usually costs no query at all.
+
+Once the principal is loaded, `Trendit3User.query.get(user_id)` in the same request is served from
+the session's identity map without another query.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import json
+from flask import g, current_app
+from sqlalchemy.orm import joinedload, selectinload
+from flask_jwt_extended import get_jwt_identity
+
+from ...extensions import db, redis_client
+from ...models.role import Role, user_roles
+from ...models.user import Trendit3User
+from .loggers import log_exception
+
+ROLE_CACHE_KEY = "principal:roles:{user_id}"
+
+
+def get_current_principal() -> Trendit3User | None:
+    """
+    Returns the current user with roles, membership, wallet and profile eager loaded.
+
+    The user is fetched once per request and cached on `g`.
+    """
+    if "principal" not in g:
+        user_id = get_jwt_identity()
+        g.principal = Trendit3User.query.options(
+            selectinload(Trendit3User.roles),
+            joinedload(Trendit3User.membership),
+            joinedload(Trendit3User.wallet),
+            joinedload(Trendit3User.profile),
+        ).filter(Trendit3User.id == int(user_id)).first() if user_id else None
+    
+    return g.principal
+
+
+def get_user_role_names(user_id: int | str) -> set[str]:
+    """
+    Returns the names of the roles a user has.
+
+    Looks in the request cache, then the shared Redis cache, then the database.
+    """
+    user_id = int(user_id)
+    request_cache = g.setdefault("role_names", {})
+    if user_id in request_cache:
+        return request_cache[user_id]
+    
+    cache_key = ROLE_CACHE_KEY.format(user_id=user_id)
+    role_names = None
+    try:
+        cached = redis_client.get(cache_key)
+        if cached is not None:
+            role_names = set(json.loads(cached))
+    except Exception as e:
+        log_exception("Could not read cached roles", e)
+    
+    if role_names is None:
+        principal = g.get("principal")
+        if principal is not None and principal.id == user_id:
+            role_names = set(principal.role_names)
+        else:
+            rows = db.session.query(Role.name).join(user_roles, user_roles.c.role_id == Role.id).filter(user_roles.c.user_id == user_id).all()
+            role_names = {role_name.value for (role_name,) in rows}
+        
+        try:
+            redis_client.setex(cache_key, current_app.config["PRINCIPAL_ROLE_CACHE_TTL"], json.dumps(sorted(role_names)))
+        except Exception as e:
+            log_exception("Could not cache roles", e)
+    
+    request_cache[user_id] = role_names
+    return role_names
+
+
+def invalidate_user_roles(user_id: int | str) -> None:
+    """Drops the cached role set of a user. Call this whenever a user's roles change."""
+    user_id = int(user_id)
+    g.get("role_names", {}).pop(user_id, None)
+    try:
+        redis_client.delete(ROLE_CACHE_KEY.format(user_id=user_id))
+    except Exception as e:
+        log_exception("Could not invalidate cached roles", e)
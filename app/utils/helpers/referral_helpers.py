@@ -0,0 +1,215 @@
+'''
+This module defines the referral system of the Trendit³ Flask application.
+
+`ReferralHistory` is the referrer -> referee edge table. Each row links the referrer to the
+account created from the referral (`referee_id`) once it exists. Every referrer also has a
+`ReferralStats` row of running counters (invited, registered, paid, earned). The counters
+are bumped with an upsert in the same transaction as the event that changes them, so
+dashboards and top-referrer lists read one row instead of counting the history.
+
+Multi-level attribution (the referrer's referrer, and so on) walks the edge table with
+recursive CTEs over the indexed referrer and referee columns.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from datetime import datetime
+from sqlalchemy import select, update, func, literal, or_, and_
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from .loggers import console_log, log_exception
+from ..payments.wallet import credit_wallet
+from ...extensions import db
+from ...models.user import Trendit3User, TempUser, ReferralHistory, ReferralStats, REFERRAL_REWARD
+
+# ReferralHistory.status values
+REFERRAL_PENDING = "pending"
+REFERRAL_REGISTERED = "registered"
+REFERRAL_COMPLETED = "completed" # the referee paid the membership fee
+
+MAX_ATTRIBUTION_LEVELS = 5
+
+
+def bump_referral_stats(referrer_id: int, invited: int = 0, registered: int = 0, paid: int = 0, earned: int = 0) -> None:
+    """Adds to the referrer's counters in the current transaction, without reading them first. Doesn't commit."""
+    stmt = pg_insert(ReferralStats).values(
+        trendit3_user_id=referrer_id,
+        invited=invited,
+        registered=registered,
+        paid=paid,
+        earned=earned,
+        updated_at=datetime.utcnow(),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ReferralStats.trendit3_user_id],
+        set_={
+            "invited": ReferralStats.invited + stmt.excluded.invited,
+            "registered": ReferralStats.registered + stmt.excluded.registered,
+            "paid": ReferralStats.paid + stmt.excluded.paid,
+            "earned": ReferralStats.earned + stmt.excluded.earned,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.session.execute(stmt)
+
+
+def record_referral_invite(temp_user: TempUser) -> None:
+    """Counts a verified email that came with a referral code. Doesn't commit."""
+    if temp_user.referrer_id:
+        bump_referral_stats(temp_user.referrer_id, invited=1)
+
+
+def record_referral_signup(new_user: Trendit3User, referrer: Trendit3User | None = None) -> ReferralHistory | None:
+    """
+    Records that a referred user completed their registration. Doesn't commit.
+
+    With `referrer`, the referral edge is created; otherwise a pending referral for the
+    user's email is looked up and marked as registered.
+    """
+    if referrer:
+        referral = ReferralHistory(
+            email=new_user.email,
+            username=new_user.username,
+            status=REFERRAL_REGISTERED,
+            date_joined=new_user.date_joined,
+            trendit3_user=referrer,
+            referee=new_user,
+        )
+        db.session.add(referral)
+        referrer_id = referrer.id
+    else:
+        referral = ReferralHistory.query.filter_by(email=new_user.email, status=REFERRAL_PENDING, referee_id=None) \
+            .order_by(ReferralHistory.date_joined.desc(), ReferralHistory.id.desc()).first()
+        if not referral:
+            return None
+        referral.username = new_user.username
+        referral.status = REFERRAL_REGISTERED
+        referral.date_joined = new_user.date_joined
+        referral.referee = new_user
+        referrer_id = referral.trendit3_user_id
+
+    bump_referral_stats(referrer_id, registered=1)
+    return referral
+
+
+def record_referral_payment(user: Trendit3User) -> None:
+    """
+    Completes the user's referral when they pay the membership fee, and rewards the referrer.
+
+    Never raises: the membership is already paid. If the referral can't be completed now,
+    it is retried by a Celery job.
+    """
+    try:
+        complete_referral(user.id)
+    except Exception as e:
+        log_exception(f"Could not complete the referral of user {user.id}, retrying in the background", e)
+        from app.celery.jobs.tasks import complete_referral_payment
+        try:
+            complete_referral_payment.delay(user.id)
+        except Exception as e:
+            log_exception(f"Could not queue the referral completion of user {user.id}", e)
+
+
+def complete_referral(user_id: int) -> int | None:
+    """
+    Marks the user's referral as completed and credits the referrer, in one transaction.
+
+    The status is switched with a conditional UPDATE, so a payment confirmed twice (callback
+    and webhook) rewards the referrer only once. The referral linked to the user is used, or
+    else the newest unlinked one for their email. If crediting the referrer fails, the status
+    change and counters are rolled back too, so calling this again retries the whole thing.
+
+    Returns:
+        int | None: The referrer's id, or None if there was no referral left to complete.
+    """
+    user = db.session.get(Trendit3User, user_id)
+    if not user:
+        return None
+
+    referral_id = (
+        select(ReferralHistory.id)
+        .where(or_(
+            ReferralHistory.referee_id == user.id,
+            and_(ReferralHistory.referee_id.is_(None), ReferralHistory.email == user.email),
+        ))
+        .order_by((ReferralHistory.referee_id == user.id).desc(), ReferralHistory.date_joined.desc(), ReferralHistory.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    completed = db.session.execute(
+        update(ReferralHistory)
+        .where(ReferralHistory.id == referral_id, ReferralHistory.status != REFERRAL_COMPLETED)
+        .values(status=REFERRAL_COMPLETED, referee_id=user.id)
+        .returning(ReferralHistory.trendit3_user_id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if not completed:
+        db.session.rollback()
+        return None
+
+    referrer_id = completed.trendit3_user_id
+    bump_referral_stats(referrer_id, paid=1, earned=REFERRAL_REWARD)
+    try:
+        credit_wallet(referrer_id, REFERRAL_REWARD, "referral", record_txt=True) # its commit saves the status and counters too
+    except Exception:
+        db.session.rollback()
+        raise
+
+    console_log("referral completed", f"referrer {referrer_id} credited for user {user.id}")
+    return referrer_id
+
+
+def get_referral_stats(user_id: int) -> dict:
+    stats = db.session.get(ReferralStats, user_id)
+    return stats.to_dict() if stats else {"invited": 0, "registered": 0, "paid": 0, "earned": 0.0}
+
+
+def get_top_referrers(limit: int = 10) -> list[dict]:
+    """Returns the referrers with the most registered referees, read from the stats index."""
+    rows = db.session.execute(
+        select(ReferralStats, Trendit3User.username)
+        .join(Trendit3User, Trendit3User.id == ReferralStats.trendit3_user_id)
+        .order_by(ReferralStats.registered.desc())
+        .limit(limit)
+    ).all()
+    return [{"user_id": stats.trendit3_user_id, "username": username, **stats.to_dict()} for stats, username in rows]
+
+
+def get_referral_upline(user_id: int, levels: int = 3) -> list[dict]:
+    """Returns the user's referrer, their referrer, and so on, up to `levels` levels."""
+    levels = min(levels, MAX_ATTRIBUTION_LEVELS)
+    upline = (
+        select(ReferralHistory.trendit3_user_id.label("referrer_id"), literal(1).label("level"))
+        .where(ReferralHistory.referee_id == user_id)
+        .cte("upline", recursive=True)
+    )
+    parent = aliased(ReferralHistory)
+    upline = upline.union_all(
+        select(parent.trendit3_user_id, upline.c.level + 1)
+        .where(parent.referee_id == upline.c.referrer_id, upline.c.level < levels)
+    )
+
+    rows = db.session.execute(select(upline.c.referrer_id, upline.c.level).order_by(upline.c.level)).all()
+    return [{"level": row.level, "referrer_id": row.referrer_id} for row in rows]
+
+
+def get_downline_counts(user_id: int, levels: int = 3) -> dict[int, int]:
+    """Counts the users the user referred directly (level 1), those they referred (level 2), and so on."""
+    levels = min(levels, MAX_ATTRIBUTION_LEVELS)
+    downline = (
+        select(ReferralHistory.referee_id, literal(1).label("level"))
+        .where(ReferralHistory.trendit3_user_id == user_id, ReferralHistory.referee_id.isnot(None))
+        .cte("downline", recursive=True)
+    )
+    child = aliased(ReferralHistory)
+    downline = downline.union_all(
+        select(child.referee_id, downline.c.level + 1)
+        .where(child.trendit3_user_id == downline.c.referee_id, child.referee_id.isnot(None), downline.c.level < levels)
+    )
+
+    rows = db.session.execute(select(downline.c.level, func.count()).group_by(downline.c.level)).all()
+    counts = {level: 0 for level in range(1, levels + 1)}
+    counts.update({level: count for level, count in rows})
+    return counts
@@ -10,15 +10,13 @@ update security preference, and updating UI appearance preference.
 @package: Trendit³
 '''
 from sqlalchemy.exc import ( DataError, DatabaseError )
-from werkzeug.security import generate_password_hash
 from flask_jwt_extended import get_jwt_identity
-from PIL import Image
-
-import pyotp, qrcode, io, base64
+import pyotp, io, base64
 
 from ...extensions import db
 from ...models import Trendit3User, UserSettings, SecuritySetting
 from ...exceptions import InvalidTwoFactorMethod
+from .password_helpers import hash_password
 
 def set_2fa_method(method=None, user_id=None):
     try:
@@ -136,7 +134,7 @@ def update_user_security_settings(security_setting: SecuritySetting, data: dict)
         
         if new_password:
             current_user = Trendit3User.query.get(int(get_jwt_identity()))
-            hashed_pwd = generate_password_hash(new_password, "pbkdf2:sha256")
+            hashed_pwd = hash_password(new_password)
             current_user.update(thePassword=hashed_pwd)
         
         if two_factor_method:
@@ -180,6 +178,8 @@ def generate_google_authenticator_qr_code(secret_key, user_email):
     """
     Generates a QR code for Google Authenticator setup.
     """
+    import qrcode # only needed when a user sets up an authenticator app
+    
     # Use the QRCode library to generate the QR code data URI 
     # following Google Authenticator URI format.
     uri = pyotp.TOTP(secret_key).provisioning_uri(
@@ -0,0 +1,180 @@
+'''
+This module defines the review queue of the social media profiles users submit for verification.
+
+Pending profiles are listed oldest first with their owner eagerly loaded. An admin claims a
+batch before reviewing it, which reserves those profiles for SOCIAL_PROFILE_CLAIM_TTL seconds
+so two admins (or an admin and the Telegram bot) never review the same profile. Claims use
+SELECT ... FOR UPDATE SKIP LOCKED, so concurrent claims get different profiles instead of
+waiting on each other.
+
+Decisions for a whole batch are applied in one transaction, and the emails to the profile
+owners are sent afterwards by a single Celery job.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, or_
+from sqlalchemy.orm import joinedload
+
+from config import Config
+from .loggers import log_exception
+from ...extensions import db
+from ...models.user import Trendit3User
+from ...models.social import SocialMediaProfile, SocialLinkStatus
+from ...models.notification import Notification, NotificationType
+
+MAX_REVIEW_BATCH = 100
+
+REVIEW_DECISIONS = {
+    "approve": SocialLinkStatus.VERIFIED,
+    "reject": SocialLinkStatus.REJECTED,
+}
+
+
+def review_queue_query():
+    return (
+        select(SocialMediaProfile)
+        .options(joinedload(SocialMediaProfile.trendit3_user).joinedload(Trendit3User.profile))
+        .where(SocialMediaProfile.status == SocialLinkStatus.PENDING)
+    )
+
+
+def is_claimable_by(admin_id: int, now: datetime):
+    """Profiles that are unclaimed, whose claim expired, or that the admin already holds."""
+    return or_(
+        SocialMediaProfile.claimed_until.is_(None),
+        SocialMediaProfile.claimed_until < now,
+        SocialMediaProfile.claimed_by_id == admin_id,
+    )
+
+
+def get_review_queue(after_id: int | None = None, per_page: int = 20, admin_id: int | None = None) -> tuple[list[SocialMediaProfile], int | None]:
+    """
+    Returns a page of pending profiles, oldest first, and the id to pass as `after_id` for the next page.
+
+    When `admin_id` is given, profiles claimed by other admins are left out.
+    """
+    per_page = max(1, min(per_page, MAX_REVIEW_BATCH))
+    query = review_queue_query()
+    if after_id:
+        query = query.where(SocialMediaProfile.id > after_id)
+    if admin_id is not None:
+        query = query.where(is_claimable_by(admin_id, datetime.utcnow()))
+
+    profiles = db.session.scalars(query.order_by(SocialMediaProfile.id).limit(per_page + 1)).unique().all()
+    next_after_id = profiles[per_page - 1].id if len(profiles) > per_page else None
+    return profiles[:per_page], next_after_id
+
+
+def claim_profiles(admin_id: int, limit: int = 20) -> list[SocialMediaProfile]:
+    """Reserves up to `limit` pending profiles for the admin and returns them with their owners."""
+    now = datetime.utcnow()
+    claimable_ids = (
+        select(SocialMediaProfile.id)
+        .where(SocialMediaProfile.status == SocialLinkStatus.PENDING, is_claimable_by(admin_id, now))
+        .order_by(SocialMediaProfile.id)
+        .limit(max(1, min(limit, MAX_REVIEW_BATCH)))
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    claimed_ids = db.session.scalars(
+        update(SocialMediaProfile)
+        .where(SocialMediaProfile.id.in_(claimable_ids))
+        .values(claimed_by_id=admin_id, claimed_until=now + timedelta(seconds=Config.SOCIAL_PROFILE_CLAIM_TTL))
+        .returning(SocialMediaProfile.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.session.commit()
+
+    if not claimed_ids:
+        return []
+    query = review_queue_query().where(SocialMediaProfile.id.in_(claimed_ids)).order_by(SocialMediaProfile.id)
+    return db.session.scalars(query).unique().all()
+
+
+def parse_review_decisions(data: dict) -> dict[int, SocialLinkStatus]:
+    """
+    Reads `{"approve": [ids], "reject": [ids]}` into a map of profile id to new status.
+
+    Raises:
+        ValueError: If an id is not an integer, appears under both decisions, or the batch is too large.
+    """
+    decisions = {}
+    for decision, status in REVIEW_DECISIONS.items():
+        profile_ids = data.get(decision) or []
+        if not isinstance(profile_ids, list):
+            raise ValueError(f"{decision} must be a list of profile ids")
+
+        for profile_id in profile_ids:
+            try:
+                profile_id = int(profile_id)
+            except (ValueError, TypeError):
+                raise ValueError(f"Invalid profile id: {profile_id}")
+            if decisions.get(profile_id, status) != status:
+                raise ValueError(f"Profile {profile_id} can't be both approved and rejected")
+            decisions[profile_id] = status
+
+    if not decisions:
+        raise ValueError("No profiles to approve or reject")
+    if len(decisions) > MAX_REVIEW_BATCH:
+        raise ValueError(f"At most {MAX_REVIEW_BATCH} profiles can be reviewed at once")
+    return decisions
+
+
+def review_profiles(admin_id: int, decisions: dict[int, SocialLinkStatus]) -> dict:
+    """
+    Approves or rejects a batch of profiles in one transaction and queues the owners' emails.
+
+    Profiles that are no longer pending, or are claimed by another admin, are skipped.
+
+    Returns:
+        dict: The ids of the profiles that were `reviewed` and of those `skipped`.
+    """
+    now = datetime.utcnow()
+    profiles = db.session.scalars(
+        select(SocialMediaProfile)
+        .where(
+            SocialMediaProfile.id.in_(decisions),
+            SocialMediaProfile.status == SocialLinkStatus.PENDING,
+            is_claimable_by(admin_id, now),
+        )
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    notifications = []
+    for profile in profiles:
+        profile.status = decisions[profile.id]
+        profile.reviewed_by_id = admin_id
+        profile.reviewed_at = now
+        profile.claimed_by_id = None
+        profile.claimed_until = None
+
+        outcome = "approved" if profile.status == SocialLinkStatus.VERIFIED else "rejected"
+        notifications.append(Notification(
+            recipient_id=profile.trendit3_user_id,
+            body=f"Your {profile.platform.capitalize()} verification request has been {outcome}",
+            notification_type=NotificationType.NOTIFICATION,
+        ))
+
+    reviewed_ids = [profile.id for profile in profiles] # read before the commit expires them
+    db.session.add_all(notifications)
+    db.session.commit()
+
+    if reviewed_ids:
+        queue_review_emails(reviewed_ids)
+
+    return {
+        "reviewed": reviewed_ids,
+        "skipped": sorted(set(decisions) - set(reviewed_ids)),
+    }
+
+
+def queue_review_emails(profile_ids: list[int]) -> None:
+    """Hands the emails of reviewed profiles to Celery. Never raises: the decisions are already saved."""
+    from app.celery.jobs.tasks import send_social_profile_review_emails
+    try:
+        send_social_profile_review_emails.delay(profile_ids)
+    except Exception as e:
+        log_exception(f"Could not queue review emails for social profiles {profile_ids}", e)
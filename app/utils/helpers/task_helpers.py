@@ -1,6 +1,5 @@
 import sys, os
 from decimal import Decimal
-from threading import Thread
 from flask import request, current_app
 from sqlalchemy import func
 from sqlalchemy.exc import ( DataError, DatabaseError, )
@@ -10,7 +9,7 @@ from datetime import datetime, timedelta
 from ...extensions import db
 from ...models import Task, AdvertTask, EngagementTask, TaskStatus, TaskPaymentStatus, TaskPerformance, RoleNames
 from .loggers import console_log, log_exception
-from ...utils.helpers.media_helpers import save_media, save_media_files_to_temp
+from ...utils.helpers.media_helpers import stage_media_files, queue_media_upload, validate_file_extension
 from ...exceptions import PendingTaskError, NoUnassignedTaskError
 from .user_helpers import add_user_role
 
@@ -208,31 +207,11 @@ def get_task_by_key(task_key) -> Task | AdvertTask | EngagementTask:
     return task
 
 
-def async_save_task_media_files(app, task_id_key: str | int, media_file_paths):
-    with app.app_context():
-        try:
-            console_log("saving media", f"starting... {media_file_paths}")
-            task = fetch_task(task_id_key)
-            
-            #save media files
-            if media_file_paths:
-                for media_file_path in media_file_paths:
-                    filename = os.path.basename(media_file_path)
-                    with open(media_file_path, 'rb') as media_file:
-                        media = save_media(media_file, filename)
-                        task.media.append(media)
-                    
-            elif not media_file_paths and task:
-                task.media = task.media
-            
-            db.session.commit()
-            console_log("end of saving...", "...")
-        except Exception as e:
-            log_exception("an exception occurred saving task media", e)
-            raise e
-
-def save_task_media_files(task_id_key: str | int, media_file_paths):
-    Thread(target=async_save_task_media_files, args=(current_app._get_current_object(), task_id_key, media_file_paths)).start()
+def save_task_media_files(task_id_key: str | int, staged_media):
+    """Queues the staged media files of a task for upload."""
+    task = fetch_task(task_id_key)
+    if task:
+        queue_media_upload("task", task.id, staged_media)
 
 def save_task(data, task_id_key=None, payment_status=TaskPaymentStatus.PENDING):
     try:
@@ -270,17 +249,17 @@ def save_task(data, task_id_key=None, payment_status=TaskPaymentStatus.PENDING):
         # Get multiple media files
         media_files = request.files.getlist('media')
         
-        # Save media files to temp directory and get paths
-        media_file_paths = save_media_files_to_temp(media_files)
-        console_log("media_file_paths", media_file_paths)
+        # Stage media files for upload
+        staged_media = stage_media_files(media_files)
+        console_log("staged_media", staged_media)
         
         
         if task_type == 'advert':
             if task:
                 task.update(trendit3_user_id=user_id, task_type=task_type, platform=platform, fee_paid=fee_paid, fee=fee, payment_status=payment_status, posts_count=posts_count, target_country=target_country, target_state=target_state, gender=gender, religion=religion, caption=caption, hashtags=hashtags, reward_money=reward_money)
                 
-                console_log("saving media files with celery...", "save_task_media_files sent to celery")
-                save_task_media_files(task_id_key=task.id, media_file_paths=media_file_paths) #save media files
+                console_log("queueing media files for upload...", "save_task_media_files sent to celery")
+                save_task_media_files(task_id_key=task.id, staged_media=staged_media) #save media files
                 
                 return task
             else:
@@ -288,8 +267,8 @@ def save_task(data, task_id_key=None, payment_status=TaskPaymentStatus.PENDING):
 
                 add_user_role(RoleNames.ADVERTISER, user_id)
                 
-                console_log("saving media files with celery...", "save_task_media_files sent to celery")
-                save_task_media_files(task_id_key=new_task.id, media_file_paths=media_file_paths) #save media files
+                console_log("queueing media files for upload...", "save_task_media_files sent to celery")
+                save_task_media_files(task_id_key=new_task.id, staged_media=staged_media) #save media files
                 
                 return new_task
             
@@ -350,10 +329,11 @@ def update_performed_task(data, pt_id=None, status='pending'):
         if task.task_type == "engagement" and screenshot == '':
             raise ValueError("No screenshot provided.")
         
-        proof_screenshot = None
+        staged_screenshot = []
         if screenshot and screenshot.filename != '':
             try:
-                proof_screenshot = save_media(screenshot)
+                validate_file_extension(os.path.splitext(screenshot.filename)[1])
+                staged_screenshot = stage_media_files(screenshot) # uploaded after the response is sent
             except ValueError as e:
                 current_app.logger.error(f"An error occurred while saving Screenshot: {str(e)}")
                 raise ValueError(f"{e}")
@@ -361,13 +341,8 @@ def update_performed_task(data, pt_id=None, status='pending'):
                 current_app.logger.error(f"An error occurred while saving Screenshot: {str(e)}")
                 raise Exception("Error saving Screenshot.")
         elif screenshot == '' and task:
-            if performed_task.proof_screenshot_id:
-                proof_screenshot = performed_task.proof_screenshot
-            else:
-                if task.task_type == "engagement":
-                    raise Exception("No screenshot provided.")
-                else:
-                    pass
+            if not performed_task.proof_screenshot_id and task.task_type == "engagement":
+                raise Exception("No screenshot provided.")
         else:
             if task.task_type == "engagement":
                 raise Exception("No screenshot provided.")
@@ -375,13 +350,13 @@ def update_performed_task(data, pt_id=None, status='pending'):
                 pass
         
         if performed_task:
-            performed_task.update(user_id=user_id, task_id=task_id, task_type=task_type, proof_screenshot=proof_screenshot, account_name=account_name, post_link=post_link, status=status)
-            
-            return performed_task
+            performed_task.update(user_id=user_id, task_id=task_id, task_type=task_type, account_name=account_name, post_link=post_link, status=status)
         else:
-            new_performed_task = TaskPerformance.create_task_performance(user_id=user_id, task_id=task_id, task_type=task_type, reward_money=reward_money, proof_screenshot=proof_screenshot, account_name=account_name, post_link=post_link, status=status)
-            
-            return new_performed_task
+            performed_task = TaskPerformance.create_task_performance(user_id=user_id, task_id=task_id, task_type=task_type, reward_money=reward_money, proof_screenshot=None, account_name=account_name, post_link=post_link, status=status)
+        
+        queue_media_upload("proof_screenshot", performed_task.id, staged_screenshot)
+        
+        return performed_task
     except Exception as e:
         log_exception("An exception occurred trying to save performed task", e)
         db.session.rollback()
@@ -1,7 +1,28 @@
+'''
+This module defines helper functions for notifying the Trendit³ admins on Telegram.
+
+Notifications are not sent from the request. The `notify_telegram_admins_*` functions only
+push the kind and ID of the object to a Redis outbox and make sure a flush is scheduled.
+The `flush_telegram_outbox` Celery job then renders the messages, coalesces bursts of the
+same kind into digests (which keep each item's action buttons), and sends them while
+respecting Telegram's rate limits.
+
+Only one flush runs at a time. A flush moves each batch to a processing list and removes it
+only once its messages are sent, so a flush that dies midway leaves the batch to be sent by
+the next one instead of losing it.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import json, time
 import requests
+from redis.exceptions import LockError
+from sqlalchemy import inspect
 
 from config import Config
 from .loggers import console_log, log_exception
+from ...extensions import redis_client
 from ...models import Withdrawal
 from ...models.user import Trendit3User, Profile
 from ...models.task import Task, AdvertTask, EngagementTask, TaskPerformance
@@ -11,12 +32,67 @@ from ...models.social import SocialMediaPlatform, SocialMediaProfile
 
 send_msg_url = Config.TELEGRAM_SEND_MSG_URL
 
+OUTBOX_KEY = "telegram:outbox"
+PROCESSING_KEY = "telegram:outbox:processing"
+PROCESSING_ATTEMPTS_KEY = "telegram:outbox:processing:attempts"
+DEAD_LETTER_KEY = "telegram:outbox:dead_letter"
+FLUSH_SCHEDULED_KEY = "telegram:outbox:flush_scheduled"
+FLUSH_LOCK_KEY = "telegram:outbox:flush_lock"
+FLUSH_LOCK_TIMEOUT = 300 # renewed after every message sent
+OUTBOX_BATCH_SIZE = 200
+DIGEST_MAX_ITEMS = 25 # items per digest message, keeping the text and keyboard within Telegram's limits
+MAX_BATCH_ATTEMPTS = 3 # a batch that still fails after this many flushes is moved to the dead letter list
+DEAD_LETTER_MAX_ITEMS = 1000
+
+
+def _object_id(obj) -> int:
+    """Returns the primary key of a model instance without refreshing it from the database."""
+    identity = inspect(obj).identity
+    return identity[0] if identity else obj.id
+
+
+def queue_telegram_notification(kind: str, object_id: int) -> None:
+    """
+    Pushes a notification to the Telegram outbox and schedules a flush if none is pending.
+
+    Never raises: admin notifications must not break the request that triggered them.
+    """
+    try:
+        redis_client.rpush(OUTBOX_KEY, json.dumps({"kind": kind, "id": object_id}))
+
+        window = Config.TELEGRAM_DIGEST_WINDOW
+        if redis_client.set(FLUSH_SCHEDULED_KEY, 1, nx=True, ex=window * 6):
+            from app.celery.jobs.tasks import flush_telegram_outbox
+            try:
+                flush_telegram_outbox.apply_async(countdown=window)
+            except Exception:
+                redis_client.delete(FLUSH_SCHEDULED_KEY)
+                raise
+    except Exception as e:
+        log_exception(f"Could not queue telegram notification {kind} {object_id}", e)
+
+
 def notify_telegram_admins_new_task(task: Task | AdvertTask | EngagementTask):
+    queue_telegram_notification("new_task", _object_id(task))
+
+def notify_telegram_admins_new_performed_task(performed_task: TaskPerformance):
+    queue_telegram_notification("new_performed_task", _object_id(performed_task))
+
+def notify_telegram_admins_new_profile(social_profile : SocialMediaProfile):
+    queue_telegram_notification("new_profile", _object_id(social_profile))
+
+def notify_telegram_admins_new_withdraw(withdrawal : Withdrawal):
+    queue_telegram_notification("new_withdraw", _object_id(withdrawal))
+
+
+# Message builders. These run in the worker.
+
+def build_new_task_message(task: Task | AdvertTask | EngagementTask) -> dict:
     label = f"A New Task Was Just Created"
-    
+
     # get task data
     data = task.to_dict()
-    
+
     task_id = data.get("id")
     task_type = data.get("task_type")
     payment_status = data.get("payment_status")
@@ -28,9 +104,9 @@ def notify_telegram_admins_new_task(task: Task | AdvertTask | EngagementTask):
     location = f"{target_state}, {target_country}"
     date_created = data.get("date_created")
     account_link = data.get("account_link")
-    
+
     requested_count = data.get("posts_count", data.get("engagements_count", 0))
-    
+
 
     count = "No of posts" if data.get("posts_count") else "No of Engagements"
     link = f"• Link: {account_link} \n" if account_link else ""
@@ -38,11 +114,11 @@ def notify_telegram_admins_new_task(task: Task | AdvertTask | EngagementTask):
     data_msg = (
         f"• Task Type: {task_type} \n • Payment Status: {payment_status} \n • Platform: {platform} \n • Amount Paid: {fee_paid} \n • Location: {location} \n • {count}: {requested_count} \n {link} • Status: {status} \n • Date Created: {date_created}"
         )
-    
+
     formatted_data = data_msg
-    
+
     message = f"\n\n{label:-^12}\n\n {formatted_data} \n{'//':-^12}\n\n"
-    
+
     payload = {
         'chat_id': Config.TELEGRAM_CHAT_ID,
         'text': message,
@@ -58,44 +134,39 @@ def notify_telegram_admins_new_task(task: Task | AdvertTask | EngagementTask):
             ]
         }
     }
-    response = requests.post(send_msg_url, json=payload)
-    console_log("response", response)
-    console_log("response_data", response.json())
+    return payload
 
-def notify_telegram_admins_new_performed_task(performed_task: TaskPerformance):
+def build_new_performed_task_message(performed_task: TaskPerformance) -> dict:
     user: Trendit3User = performed_task.trendit3_user
     user_profile: Profile = user.profile
     username = user.username
     full_name = f"{user_profile.firstname} {user_profile.lastname}"
-    
+
     performed_task_id = performed_task.id
     performed_task_key = performed_task.key
     task_type = performed_task.task_type
     status = performed_task.status
-    task = performed_task.get_task
     reward_money = performed_task.reward_money
-    
+
     post_link = performed_task.post_link
     image_url = performed_task.get_proof_screenshot()
-    
+
     date_started = performed_task.started_at
     date_completed = performed_task.date_completed
-    
-    console_log(data="constructing message...")
-    
+
     label = f"{username} Just performed a task, and is expecting a review:"
-    
+
     screenshot_txt = F"• Proof Screenshot: {image_url}" if performed_task.proof_screenshot_id else ""
     data = (f"• Full Name: {full_name} \n • Task ID: {performed_task_id} \n • Task Type: {task_type} \n • Date Started: {date_started} \n • Date Completed: {date_completed} \n • Status: {status} \n\n • Amount to be earned: {reward_money} {screenshot_txt}")
-    
+
     formatted_data = data + f"\n\n "
-    
+
     message = f"\n\n{label:-^12}\n\n {formatted_data} \n{'//':-^12}\n\n "
-    
+
     view_link_button = None  # Initialize as None
     if post_link and post_link.strip():  # Check if post_link exists and is not empty
         view_link_button = {'text': 'View link', 'url': f'{post_link}'}
-    
+
     inline_keyboard = [
         [
             {'text': 'Accept', 'callback_data': f'accept_performedTask_{performed_task_id}'},
@@ -105,7 +176,7 @@ def notify_telegram_admins_new_performed_task(performed_task: TaskPerformance):
 
     if view_link_button:  # Add the button only if it's not None
         inline_keyboard.append([view_link_button])
-    
+
     payload = {
         'chat_id': Config.TELEGRAM_CHAT_ID,
         'text': message,
@@ -113,30 +184,27 @@ def notify_telegram_admins_new_performed_task(performed_task: TaskPerformance):
             'inline_keyboard': inline_keyboard
         }
     }
-    console_log(data="sending message...")
-    response = requests.post(send_msg_url, json=payload)
-    console_log("response", response)
-    console_log("response_data", response.json())
+    return payload
 
-def notify_telegram_admins_new_profile(social_profile : SocialMediaProfile):
+def build_new_profile_message(social_profile : SocialMediaProfile) -> dict:
     user: Trendit3User = social_profile.trendit3_user
     user_profile: Profile = user.profile
     username = user.username
     full_name = f"{user_profile.firstname} {user_profile.lastname}"
-    
+
     profile_id = social_profile.id
     profile_link = social_profile.link
     platform = social_profile.platform
     status = social_profile.status.value
-    
+
     label = f"{username} Just submitted a New Social Media Profile for review:"
-    
+
     data = (f"• Full Name: {full_name} \n • Profile ID: {profile_id} \n • Platform: {platform} \n • Profile Link: {profile_link} \n • Status: {status}")
-    
+
     formatted_data = data
-    
+
     message = f"\n\n{label:-^12}\n\n {formatted_data} \n{'//':-^12}\n\n"
-    
+
     payload = {
         'chat_id': Config.TELEGRAM_CHAT_ID,
         'text': message,
@@ -152,35 +220,206 @@ def notify_telegram_admins_new_profile(social_profile : SocialMediaProfile):
             ]
         }
     }
-    response = requests.post(send_msg_url, json=payload)
-    console_log("response", response)
-    console_log("response_data", response.json())
+    return payload
 
 
-
-def notify_telegram_admins_new_withdraw(withdrawal : Withdrawal):
+def build_new_withdraw_message(withdrawal : Withdrawal) -> dict:
     user: Trendit3User = withdrawal.trendit3_user
     user_profile: Profile = user.profile
     username = user.username
     full_name = f"{user_profile.firstname} {user_profile.lastname}"
-    
+
     amount = withdrawal.amount
     date = withdrawal.created_at
     status = withdrawal.status
-    
+
     label = f"{username} Just withdrew ₦ {amount} from their wallet:"
-    
+
     data = (f"• Full Name: {full_name} \n • Amount: ₦ {amount} \n • Date: {date} \n • Status: {status}")
-    
+
     formatted_data = data
-    
+
     message = f"\n\n{label:-^12}\n\n {formatted_data} \n{'//':-^12}\n\n"
-    
+
     payload = {
         'chat_id': Config.TELEGRAM_CHAT_ID,
         'text': message,
     }
-    response = requests.post(send_msg_url, json=payload)
-    console_log("response", response)
-    console_log("response_data", response.json())
+    return payload
+
+
+# kind: (model, single message builder, digest title, digest line builder, digest buttons builder)
+NOTIFICATION_KINDS = {
+    "new_task": (Task, build_new_task_message, "New Tasks Awaiting Approval",
+                lambda task: f"• Task {task.id}: {task.task_type} on {task.platform}, paid {task.fee_paid}",
+                lambda task: [
+                    {'text': f'Approve {task.id}', 'callback_data': f'approve_task_{task.id}'},
+                    {'text': f'Reject {task.id}', 'callback_data': f'reject_task_{task.id}'},
+                ]),
+    "new_performed_task": (TaskPerformance, build_new_performed_task_message, "Performed Tasks Awaiting Review",
+                lambda pt: f"• Performed Task {pt.id}: {pt.task_type}, reward {pt.reward_money}",
+                lambda pt: [
+                    {'text': f'Accept {pt.id}', 'callback_data': f'accept_performedTask_{pt.id}'},
+                    {'text': f'Reject {pt.id}', 'callback_data': f'reject_performedTask_{pt.id}'},
+                ]),
+    "new_profile": (SocialMediaProfile, build_new_profile_message, "Social Profiles Awaiting Review",
+                lambda profile: f"• Profile {profile.id}: {profile.platform} {profile.link}",
+                lambda profile: [
+                    {'text': f'Approve {profile.id}', 'callback_data': f'accept_profile_{profile.id}'},
+                    {'text': f'Reject {profile.id}', 'callback_data': f'reject_profile_{profile.id}'},
+                ]),
+    "new_withdraw": (Withdrawal, build_new_withdraw_message, "New Withdrawals",
+                lambda withdrawal: f"• Withdrawal {withdrawal.id}: ₦ {withdrawal.amount}, {withdrawal.status}",
+                None),
+}
+
+
+def build_digest_messages(kind: str, objects: list) -> list[dict]:
+    """
+    Renders a burst of one kind as digests of up to DIGEST_MAX_ITEMS items, each with a row of action buttons per item.
+
+    Items that fail to render are skipped, like in the single message path.
+    """
+    model, _, title, line_builder, buttons_builder = NOTIFICATION_KINDS[kind]
+
+    rendered = []
+    for obj in objects:
+        try:
+            rendered.append((line_builder(obj), buttons_builder(obj) if buttons_builder else None))
+        except Exception as e:
+            log_exception(f"Could not build telegram digest line for {kind} {_object_id(obj)}", e)
+
+    messages = []
+    for start in range(0, len(rendered), DIGEST_MAX_ITEMS):
+        chunk = rendered[start:start + DIGEST_MAX_ITEMS]
+        lines = "\n ".join(line for line, _ in chunk)
+        message = f"\n\n{f'{len(chunk)} {title}':-^12}\n\n {lines} \n{'//':-^12}\n\n"
+
+        payload = {'chat_id': Config.TELEGRAM_CHAT_ID, 'text': message}
+        if buttons_builder:
+            payload['reply_markup'] = {'inline_keyboard': [buttons for _, buttons in chunk]}
+        messages.append(payload)
+
+    return messages
+
+
+def claim_outbox_batch() -> list[dict]:
+    """
+    Moves up to OUTBOX_BATCH_SIZE notifications to the processing list and returns them.
+
+    A batch left in the processing list by a flush that died is returned first, so it is sent
+    again instead of lost. After MAX_BATCH_ATTEMPTS it is moved to the dead letter list
+    instead, so one batch that can't be sent doesn't hold up the outbox for good.
+    Call `complete_outbox_batch` once the batch is sent.
+    """
+    items = redis_client.lrange(PROCESSING_KEY, 0, -1)
+    if items and redis_client.incr(PROCESSING_ATTEMPTS_KEY) > MAX_BATCH_ATTEMPTS:
+        log_exception("Moving a telegram outbox batch that keeps failing to the dead letter list", items)
+        dead_letter_outbox_batch(items)
+        items = []
+
+    if not items:
+        pipeline = redis_client.pipeline(transaction=False)
+        for _ in range(OUTBOX_BATCH_SIZE):
+            pipeline.lmove(OUTBOX_KEY, PROCESSING_KEY, "LEFT", "RIGHT")
+        pipeline.set(PROCESSING_ATTEMPTS_KEY, 1)
+        items = [item for item in pipeline.execute()[:-1] if item is not None]
+    return [json.loads(item) for item in items]
+
+
+def complete_outbox_batch() -> None:
+    redis_client.delete(PROCESSING_KEY, PROCESSING_ATTEMPTS_KEY)
+
+
+def dead_letter_outbox_batch(items: list[str]) -> None:
+    """Moves a batch to the dead letter list, which keeps the latest DEAD_LETTER_MAX_ITEMS items for inspection."""
+    pipeline = redis_client.pipeline()
+    pipeline.rpush(DEAD_LETTER_KEY, *items)
+    pipeline.ltrim(DEAD_LETTER_KEY, -DEAD_LETTER_MAX_ITEMS, -1)
+    pipeline.delete(PROCESSING_KEY, PROCESSING_ATTEMPTS_KEY)
+    pipeline.execute()
+
+
+def build_outbox_messages(items: list[dict]) -> list[dict]:
+    """Renders outbox items, one message each, or digests per kind when a burst exceeds the threshold."""
+    grouped_ids: dict[str, list[int]] = {}
+    for item in items:
+        ids = grouped_ids.setdefault(item["kind"], [])
+        if item["id"] not in ids:
+            ids.append(item["id"])
+
+    messages = []
+    for kind, ids in grouped_ids.items():
+        if kind not in NOTIFICATION_KINDS:
+            continue
+
+        model, message_builder, _, _, _ = NOTIFICATION_KINDS[kind]
+        objects = model.query.filter(model.id.in_(ids)).order_by(model.id).all()
+        if len(objects) > Config.TELEGRAM_DIGEST_THRESHOLD:
+            messages.extend(build_digest_messages(kind, objects))
+            continue
+
+        for obj in objects:
+            try:
+                messages.append(message_builder(obj))
+            except Exception as e:
+                log_exception(f"Could not build telegram message for {kind} {obj.id}", e)
+
+    return messages
+
+
+def send_telegram_message(payload: dict) -> bool:
+    """
+    Sends a single message, honouring Telegram's retry_after on 429 and
+    backing off exponentially on network or server errors.
+    """
+    for attempt in range(Config.TELEGRAM_MAX_RETRIES):
+        try:
+            response = requests.post(send_msg_url, json=payload, timeout=10)
+            if response.status_code == 429:
+                retry_after = response.json().get("parameters", {}).get("retry_after", 2 ** attempt)
+                time.sleep(retry_after)
+                continue
+            if response.status_code >= 500:
+                time.sleep(2 ** attempt)
+                continue
+
+            if not response.ok:
+                console_log("telegram response", response.text)
+            return response.ok
+        except requests.RequestException as e:
+            log_exception("Telegram request failed", e)
+            time.sleep(2 ** attempt)
+
+    return False
+
+
+def flush_telegram_outbox_messages() -> int | None:
+    """
+    Sends everything in the outbox. Returns the number of messages sent,
+    or None if another flush is running.
+    """
+    lock = redis_client.lock(FLUSH_LOCK_KEY, timeout=FLUSH_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return None
+
+    try:
+        redis_client.delete(FLUSH_SCHEDULED_KEY) # notifications queued from now on schedule a new flush
+
+        sent = 0
+        items = claim_outbox_batch()
+        while items:
+            for payload in build_outbox_messages(items):
+                if send_telegram_message(payload):
+                    sent += 1
+                lock.reacquire()
+                time.sleep(Config.TELEGRAM_MIN_SEND_INTERVAL)
+            complete_outbox_batch()
+            items = claim_outbox_batch()
 
+        return sent
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            pass # it expired, and another flush may hold it now
@@ -0,0 +1,140 @@
+'''
+This module defines helper functions for building the `user_data` returned by the Trendit³ API.
+
+The user is loaded in one query with every section of `Trendit3User.to_dict` eager loaded, so
+serializing costs no extra queries (apart from the social profiles, which are a dynamic relationship).
+The full view is cached per user in Redis and dropped whenever the user, their profile, address,
+wallet, bank accounts, membership, social profiles or settings are committed.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import json
+from flask import current_app, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from ...extensions import db, redis_client
+from ...models.user import Trendit3User, Profile, Address, BankAccount, USER_DATA_LEVELS
+from ...models.payment import Wallet
+from ...models.membership import Membership
+from ...models.social import SocialMediaProfile
+from ...models.settings import UserSettings, SecuritySetting
+from .loggers import log_exception
+
+USER_DATA_CACHE_KEY = "user_data:{user_id}"
+
+# Models whose changes show up in the user data, and how to get the user id from each
+USER_DATA_SOURCES = {
+    Trendit3User: lambda instance: instance.id,
+    Profile: lambda instance: instance.trendit3_user_id,
+    Address: lambda instance: instance.trendit3_user_id,
+    Wallet: lambda instance: instance.trendit3_user_id,
+    BankAccount: lambda instance: instance.trendit3_user_id,
+    Membership: lambda instance: instance.trendit3_user_id,
+    SocialMediaProfile: lambda instance: instance.trendit3_user_id,
+    UserSettings: lambda instance: instance.trendit3_user_id,
+    SecuritySetting: lambda instance: instance.user_settings.trendit3_user_id if instance.user_settings else None,
+}
+
+
+def load_user_for_data(user_id: int) -> Trendit3User | None:
+    """Loads a user with everything `Trendit3User.to_dict` reads eager loaded."""
+    return Trendit3User.query.options(
+        joinedload(Trendit3User.profile).joinedload(Profile.profile_picture),
+        joinedload(Trendit3User.address),
+        joinedload(Trendit3User.wallet),
+        joinedload(Trendit3User.membership),
+        joinedload(Trendit3User.primary_bank_account),
+        joinedload(Trendit3User.user_settings).joinedload(UserSettings.security_setting),
+        selectinload(Trendit3User.roles),
+    ).filter(Trendit3User.id == int(user_id)).first()
+
+
+def get_requested_level(default: str = "full") -> tuple[str, list[str] | None]:
+    """
+    Reads the user data level the client asked for.
+
+    Endpoints return the full user unless the client opts down with `?user_data=summary|standard`,
+    or picks specific sections with `?sections=wallet,profile`.
+    """
+    level = request.args.get("user_data", default)
+    level = level if level in USER_DATA_LEVELS else default
+
+    sections = request.args.get("sections")
+    sections = [section.strip() for section in sections.split(",") if section.strip() in USER_DATA_LEVELS["full"]] if sections else None
+
+    return level, sections or None
+
+
+def get_user_data(user: Trendit3User | int, level: str = "full", sections: list[str] | None = None) -> dict:
+    """
+    Returns the serialized user data at the given level.
+
+    The full view is served from the cache when possible. Other levels are cheap
+    enough to build directly from the eager loaded user.
+    """
+    user_id = user if isinstance(user, int) else user.id
+    is_full = not sections and level == "full"
+    cache_key = USER_DATA_CACHE_KEY.format(user_id=user_id)
+
+    if is_full:
+        try:
+            cached = redis_client.get(cache_key)
+            if cached is not None:
+                return json.loads(cached)
+        except Exception as e:
+            log_exception("Could not read cached user data", e)
+
+    if isinstance(user, int) or not is_user_data_loaded(user):
+        user = load_user_for_data(user_id)
+        if not user:
+            raise ValueError("User does not exist")
+
+    user_data = user.to_dict(level=level, sections=sections)
+
+    if is_full:
+        try:
+            # dump through the app's JSON provider so cached and fresh responses serialize identically
+            redis_client.setex(cache_key, current_app.config["USER_DATA_CACHE_TTL"], current_app.json.dumps(user_data))
+        except Exception as e:
+            log_exception("Could not cache user data", e)
+
+    return user_data
+
+
+def is_user_data_loaded(user: Trendit3User) -> bool:
+    """Checks if the relationships `to_dict` reads are already loaded on a user instance."""
+    unloaded = db.inspect(user).unloaded
+    return not unloaded.intersection({"profile", "address", "wallet", "membership", "primary_bank_account", "user_settings", "roles"})
+
+
+def invalidate_user_data(user_id: int | str) -> None:
+    """Drops the cached full view of a user."""
+    try:
+        redis_client.delete(USER_DATA_CACHE_KEY.format(user_id=int(user_id)))
+    except Exception as e:
+        log_exception("Could not invalidate cached user data", e)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changed_users(session, flush_context, instances):
+    changed_users = session.info.setdefault("user_data_changed", set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        get_user_id = USER_DATA_SOURCES.get(type(instance))
+        if get_user_id:
+            user_id = get_user_id(instance)
+            if user_id is not None:
+                changed_users.add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop("user_data_changed", set()):
+        invalidate_user_data(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("user_data_changed", None)
@@ -12,89 +12,37 @@ These functions assist with tasks such as:
 '''
 import os
 from enum import Enum
-from threading import Thread
 from flask import Flask, current_app
 from werkzeug.datastructures import FileStorage
+from sqlalchemy import func
 from sqlalchemy.exc import ( DataError, DatabaseError, SQLAlchemyError )
 
 from ...extensions import db
 from ...models.role import Role, RoleNames
 from ...models.user import Trendit3User, Address, Profile, ReferralHistory
 from ...models.pricing import Pricing
-from ...models.notification import MessageStatus, MessageType, UserMessageStatus, Notification
+from ...models.notification import MessageStatus, MessageType, UserMessageStatus, Notification, NotificationType
 from ...models.social import SocialMediaProfile
-from .media_helpers import save_media
 from .loggers import console_log, log_exception
+from .principal_helpers import invalidate_user_roles
+from .user_data_helpers import get_user_data
 from .basic_helpers import generate_random_string
-from .media_helpers import save_media_files_to_temp
-from ..payments.wallet import credit_wallet
-
-
-def async_save_profile_pic(app: Flask, user: Trendit3User, media_file_paths):
-    with app.app_context():
-        try:
-            user_profile: Profile = user.profile
-            console_log("user_profile", f"{user_profile}")
-            console_log("user_profile", f"ID: {user_profile.id} Pic path: {user_profile.profile_pic}")
-            
-            console_log("async media_file_paths", media_file_paths)
-            if media_file_paths:
-                for file_path in media_file_paths:
-                    filename = os.path.basename(file_path)
-                    console_log("filename", filename)
-                    with open(file_path, 'rb') as media_file:
-                        profile_picture = save_media(media_file, filename) # This saves image file, saves the path in db and return the Media instance
-                        profile_picture_id = profile_picture.id
-                        console_log("r profile_picture_id", profile_picture_id)
-            elif not media_file_paths and user:
-                if user_profile.profile_picture_id:
-                    profile_picture = user_profile.profile_picture
-                    profile_picture_id = profile_picture.id
-                else:
-                    profile_picture = None
-                    profile_picture_id = None
-            else:
-                profile_picture = None
-                profile_picture_id = None
-            
-            user_profile.update(profile_picture=profile_picture)
-        except Exception as e:
-            log_exception()
-            raise e
+from .media_helpers import stage_media_files, queue_media_upload
+from .referral_helpers import record_referral_payment
+
 
 def save_profile_pic(user: Trendit3User, media_file: FileStorage):
-    media_file_paths = save_media_files_to_temp(media_file)
-    console_log("media_file_paths", media_file_paths)
-    Thread(target=async_save_profile_pic, args=(current_app._get_current_object(), user, media_file_paths)).start()
+    """Stages the new profile picture and queues it for upload. Keeps the current picture if none was sent."""
+    staged_media = stage_media_files(media_file)
+    console_log("staged_media", staged_media)
+    queue_media_upload("profile_picture", user.id, staged_media)
 
 
 # for pricing icon
-def async_save_pricing_icon(app: Flask, price_id, media_file):
-    with app.app_context():
-        session = db.session()
-        try:
-            price = session.query(Pricing).get(price_id)
-            if price:
-                if isinstance(media_file, FileStorage) and media_file.filename != '':
-                    try:
-                        price_icon = save_media(media_file)  # This saves image file, saves the path in db and return the Media instance
-                    except Exception as e:
-                        log_exception(f"An error occurred saving pricing icon: {str(e)}")
-                        price_icon = None
-                else:
-                    price_icon = None
-
-                price.update(price_icon=price_icon)
-                session.commit()
-        except Exception as e:
-            session.rollback()
-            log_exception()
-            raise e
-        finally:
-            session.close()
-
 def save_pricing_icon(price_id, media_file: FileStorage):
-    Thread(target=async_save_pricing_icon, args=(current_app._get_current_object(), price_id, media_file)).start()
+    """Stages the pricing icon and queues it for upload."""
+    staged_media = stage_media_files(media_file)
+    queue_media_upload("pricing_icon", price_id, staged_media)
 
 
 def add_user_role(role_name: Enum, user_id: int):
@@ -110,6 +58,7 @@ def add_user_role(role_name: Enum, user_id: int):
         if role not in user.roles:
             user.roles.append(role)
             db.session.commit()
+            invalidate_user_roles(user_id)
         
     except Exception as e:
         raise e
@@ -120,11 +69,7 @@ def get_user_info(user_id: int) -> dict:
     if user_id is None:
         userInfo = {}
     else:
-        user: Trendit3User = Trendit3User.query.get(user_id)
-        if not user:
-            raise ValueError("User does not exist")
-        
-        userInfo = user.to_dict()
+        userInfo = get_user_data(int(user_id))
     
     for key in userInfo:
         if userInfo[key] is None:
@@ -277,15 +222,8 @@ def update_membership_payment(user_id) -> None:
         user.membership.membership_fee_paid = True
         db.session.commit()
         
-        # Update referral status
-        referral: ReferralHistory = ReferralHistory.query.filter_by(email=user.email).first()
-        if referral:
-            referral.update(status="completed")
-            
-            # Credit referrer's wallet
-            if referral.trendit3_user_id:
-                referrer: Trendit3User = referral.trendit3_user
-                credit_wallet(referrer.id, 500, "referral", record_txt=True)
+        # Complete the user's referral and reward the referrer
+        record_referral_payment(user)
 
 
 # @al-chris
@@ -321,6 +259,28 @@ def get_notifications(user_id:int, message_type=MessageType.NOTIFICATION):
     return userNotifications
 
 
+def search_notifications(user_id: int, query: str, page: int = 1, per_page: int = 10):
+    """
+    Searches the user's activity notifications, best matches first.
+
+    Matches against the GIN indexed `Notification.search_vector`, so the cost
+    depends on the matches, not on how many notifications exist.
+
+    Returns:
+        Pagination: A page of the matching notifications.
+    """
+    per_page = max(1, min(per_page, 50))
+    ts_query = func.websearch_to_tsquery('english', query)
+    rank = func.ts_rank_cd(Notification.search_vector, ts_query)
+    
+    return Notification.query.filter(
+        Notification.recipient_id == user_id,
+        Notification.notification_type == NotificationType.ACTIVITY,
+        Notification.search_vector.op('@@')(ts_query)
+    ).order_by(rank.desc(), Notification.created_at.desc()) \
+        .paginate(page=page, per_page=per_page, error_out=False)
+
+
 def mark_as_read(user_id, message_id):
     """
     Mark a message as read for a user.
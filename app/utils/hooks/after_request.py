@@ -1,6 +1,5 @@
 import time
-from flask import Flask, request, Response
-from ..helpers.loggers import console_log
+from flask import Flask, request, Response, current_app, g
 from ...extensions import db
 
 def set_access_control_allows(response: Response) -> Response:
@@ -33,7 +32,8 @@ def add_security_headers(response: Response) -> Response:
 def log_response(response: Response) -> Response:
     """
     Function to log details about the response.
-    Logs the response status and response time.
+    Logs one structured line with the method, path, status and latency.
+    Server errors and slow requests are always logged, the rest only when sampled.
     
     Args:
         response (Response): The response object.
@@ -41,8 +41,18 @@ def log_response(response: Response) -> Response:
     Returns:
         Response: The modified response object.
     """
-    response_time = time.time() - request.context['start_time']
-    console_log("Response INFO", data=f"Response Status: {response.status}, \nResponse Time: {response_time}")
+    # Requests rejected by an earlier before_request hook (e.g. the rate limiter) never ran setup_resources
+    start_time = getattr(request, "context", {}).get("start_time")
+    latency_ms = (time.perf_counter() - start_time) * 1000 if start_time is not None else 0.0
+    request_id = g.get("request_id")
+    if request_id:
+        response.headers['X-Request-ID'] = request_id
+    
+    if response.status_code >= 500 or latency_ms >= current_app.config.get("LOG_SLOW_REQUEST_MS", 1000) or g.get("log_sampled"):
+        current_app.logger.getChild("requests").info(
+            "%s %s %s %.1fms", request.method, request.path, response.status_code, latency_ms,
+            extra={"method": request.method, "path": request.path, "status": response.status_code, "latency_ms": round(latency_ms, 1)},
+        )
     return response
 
 def close_resources(response: Response) -> Response:
@@ -1,18 +1,21 @@
-import time
+import re, time, uuid, random
 import requests, socket
-from flask import request, abort, current_app
+from flask import request, abort, current_app, g
 
 from ..helpers import check_emerge, console_log
+from ..helpers.loggers import redact
 from ..helpers.response_helpers import error_response
 
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9-]{1,64}")
 
 
 def log_request() -> None:
     """
     Function to log details about the incoming request.
-    Logs the request path, method, and headers.
+    Logs the request path, method, and redacted headers for sampled requests only.
     """
-    console_log("Request INFO", f"Request Path: {request.path}, \nMethod: {request.method}, \nHeaders: {request.headers}")
+    if g.get("log_sampled"):
+        console_log("Request INFO", f"Request Path: {request.path}, \nMethod: {request.method}, \nHeaders: {redact(request.headers)}")
 
 
 def json_check() -> None:
@@ -27,10 +30,16 @@ def json_check() -> None:
 def setup_resources() -> None:
     """
     Function to set up resources before each request.
-    Initializes a context dictionary with the start time.
+    Initializes a context dictionary with the start time, assigns the request
+    an id and decides whether it is sampled for logging.
     """
     request.context = {}
-    request.context['start_time'] = time.time()
+    request.context['start_time'] = time.perf_counter()
+    
+    # client ids end up in logs and response headers, so only well-formed ones are kept
+    request_id = request.headers.get("X-Request-ID", "")
+    g.request_id = request_id if REQUEST_ID_PATTERN.fullmatch(request_id) else uuid.uuid4().hex
+    g.log_sampled = random.random() < current_app.config.get("LOG_REQUEST_SAMPLE_RATE", 1)
 
 
 def ping_url():
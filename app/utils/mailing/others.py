@@ -3,7 +3,7 @@ from threading import Thread
 from flask import render_template, current_app
 from flask_mail import Message
 
-from app import mail
+from app import mail, db
 from config import Config
 from ..helpers.loggers import console_log, log_exception
 from ...models import Trendit3User
@@ -119,6 +119,7 @@ def send_async_other_email(app: Flask, user_email: str, email_type: str, task_ty
             msg = Message(subject, sender=Config.MAIL_ALIAS, recipients=[user_email], html=template)
 
         
+        db.session.close() # release the connection before the slow SMTP call
         try:
             mail.send(msg)
         except Exception as e:
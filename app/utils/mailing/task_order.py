@@ -3,7 +3,7 @@ from threading import Thread
 from flask import render_template, current_app
 from flask_mail import Message
 
-from app import mail
+from app import mail, db
 from config import Config
 from ..helpers.loggers import console_log, log_exception
 from ...models import Trendit3User, Task
@@ -11,7 +11,7 @@ from ...models import Trendit3User, Task
 
 def send_async_task_order_review(app: Flask, task_id: int) -> None:
     with app.app_context():
-        task_order: Task = Task.query.filter_by(id=task_id)
+        task_order: Task = Task.query.filter_by(id=task_id).first()
         user: Trendit3User = task_order.trendit3_user
         user_email = user.email
         
@@ -24,6 +24,7 @@ def send_async_task_order_review(app: Flask, task_id: int) -> None:
         )
         msg = Message(subject, sender=Config.MAIL_ALIAS, recipients=[user_email], html=template)
         
+        db.session.close() # release the connection before the slow SMTP call
         try:
             mail.send(msg)
         except Exception as e:
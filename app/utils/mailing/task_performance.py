@@ -3,7 +3,7 @@ from threading import Thread
 from flask import render_template, current_app
 from flask_mail import Message
 
-from app import mail
+from app import mail, db
 from config import Config
 from ..helpers.loggers import console_log, log_exception
 from ...models import Trendit3User, TaskPerformance
@@ -11,7 +11,7 @@ from ...models import Trendit3User, TaskPerformance
 
 def send_async_task_performance_email(app: Flask, pt_id):
     with app.app_context():
-        performed_task: TaskPerformance = TaskPerformance.query.filter_by(id=pt_id)
+        performed_task: TaskPerformance = TaskPerformance.query.filter_by(id=pt_id).first()
         user: Trendit3User = performed_task.trendit3_user
         user_email = user.email
         
@@ -33,6 +33,7 @@ def send_async_task_performance_email(app: Flask, pt_id):
         
         msg = Message(subject, sender=Config.MAIL_ALIAS, recipients=[user_email], html=template)
         
+        db.session.close() # release the connection before the slow SMTP call
         try:
             mail.send(msg)
         except Exception as e:
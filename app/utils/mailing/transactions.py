@@ -3,7 +3,7 @@ from threading import Thread
 from flask import render_template, current_app
 from flask_mail import Message
 
-from app import mail
+from app import mail, db
 from config import Config
 from ...utils.payments.rates import convert_amount
 from ..helpers.loggers import console_log, log_exception
@@ -45,6 +45,7 @@ def send_async_transaction_alert_email(app: Flask, tx_type: str, user_email: str
         
         msg = Message(subject, sender=Config.MAIL_ALIAS, recipients=[user_email], html=template)
         
+        db.session.close() # release the connection before the slow SMTP call
         try:
             mail.send(msg)
         except Exception as e:
@@ -17,6 +17,8 @@ from ..helpers.task_helpers import get_task_by_key
 from ..helpers.mail_helpers import send_other_emails
 from ..helpers.telegram_bot import notify_telegram_admins_new_task
 from ..helpers.user_helpers import update_membership_payment
+from ..helpers.leaderboard_helpers import record_task_spend
+from ..helpers.user_data_helpers import get_user_data, get_requested_level
 from ..mailing import send_task_order_review_email
 from .exceptions import TransactionMissingError, CreditWalletError, SignatureError, FlutterwaveError
 from .wallet import credit_wallet
@@ -128,7 +130,7 @@ def verify_flutterwave_payment(data):
                         
                     # Update user"s membership status in the database
                     if payment_type == "membership-fee":
-                        trendit3_user.membership_fee(paid=True)
+                        update_membership_payment(trendit3_user.id)
                         membership_fee_paid = trendit3_user.membership.membership_fee_paid
                         msg = "Payment verified successfully and Account has been activated"
                         extra_data.update({"membership_fee_paid": membership_fee_paid})
@@ -136,7 +138,8 @@ def verify_flutterwave_payment(data):
                     elif payment_type == "task-creation":
                         task_key = response_data["data"]["meta"]["task_key"]
                         task = get_task_by_key(task_key)
-                        task.update(payment_status=TaskPaymentStatus.COMPLETE)
+                        task.mark_paid()
+                        record_task_spend(task)
                         task_dict = task.to_dict()
                         msg = "Payment verified and Task has been created successfully"
                         extra_data.update({"task": task_dict})
@@ -184,7 +187,7 @@ def verify_flutterwave_payment(data):
                 msg = "Payment verification failed: " + response_data["message"]
                 success = False
             
-            extra_data.update({"user_data": trendit3_user.to_dict(), "status_code": status_code})
+            extra_data.update({"user_data": get_user_data(trendit3_user, *get_requested_level()), "status_code": status_code})
         else:
             msg = "An error occurred verifying payment: Contact the admin"
             success = False
@@ -257,7 +260,6 @@ def flutterwave_webhook():
                     # Update user"s membership status in the database
                     if payment_type == "membership-fee":
                         update_membership_payment(trendit3_user.id)
-                        trendit3_user.membership_fee(paid=True)
                         try:
                             send_other_emails(trendit3_user.email, amount=amount) # send email
                         except Exception as e:
@@ -266,7 +268,8 @@ def flutterwave_webhook():
                     elif payment_type == "task-creation":
                         task_key = data["data"]["meta"]["task_key"]
                         task = get_task_by_key(task_key)
-                        task.update(payment_status=TaskPaymentStatus.COMPLETE)
+                        task.mark_paid()
+                        record_task_spend(task)
                     
                     elif payment_type == "credit-wallet":
                         # Credit user"s wallet
@@ -556,7 +559,6 @@ def flutterwave_fetch_balance() -> dict:
         response = requests.get(url, headers=headers)
         
         console_log("response", response)
-        console_log("response_data", response.json())
         
         response.raise_for_status()  # raise an exception if the request failed
         response_data = response.json()
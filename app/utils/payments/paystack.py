@@ -15,6 +15,9 @@ from ..helpers.loggers import console_log, log_exception
 from ...utils.helpers.basic_helpers import generate_random_string
 from ...utils.helpers.task_helpers import get_task_by_key
 from ...utils.helpers.mail_helpers import send_other_emails
+from ...utils.helpers.user_data_helpers import get_user_data, get_requested_level
+from ...utils.helpers.user_helpers import update_membership_payment
+from ...utils.helpers.leaderboard_helpers import record_task_spend
 from .exceptions import TransactionMissingError, CreditWalletError, SignatureError
 from config import Config
 
@@ -120,7 +123,7 @@ def verify_paystack_payment(data):
                         
                     # Update user's membership status in the database
                     if payment_type == 'membership-fee':
-                        trendit3_user.membership_fee(paid=True)
+                        update_membership_payment(trendit3_user.id)
                         membership_fee_paid = trendit3_user.membership.membership_fee_paid
                         msg = 'Payment verified successfully and Account has been activated'
                         extra_data.update({'membership_fee_paid': membership_fee_paid})
@@ -128,7 +131,8 @@ def verify_paystack_payment(data):
                     elif payment_type == 'task-creation':
                         task_key = response_data['data']['metadata']['task_key']
                         task = get_task_by_key(task_key)
-                        task.update(payment_status=TaskPaymentStatus.COMPLETE)
+                        task.mark_paid()
+                        record_task_spend(task)
                         task_dict = task.to_dict()
                         msg = 'Payment verified and Task has been created successfully'
                         extra_data.update({'task': task_dict})
@@ -176,7 +180,7 @@ def verify_paystack_payment(data):
                 msg = 'Payment verification failed: ' + response_data['message']
                 success = False
             
-            extra_data.update({'user_data': trendit3_user.to_dict(), 'status_code': status_code})
+            extra_data.update({'user_data': get_user_data(trendit3_user, *get_requested_level()), 'status_code': status_code})
         else:
             msg = 'An error occurred verifying payment: Contact the admin'
             success = False
@@ -237,7 +241,7 @@ def paystack_webhook():
                 
                     # Update user's membership status in the database
                     if payment_type == 'membership-fee':
-                        trendit3_user.membership_fee(paid=True)
+                        update_membership_payment(trendit3_user.id)
                         try:
                             send_other_emails(trendit3_user.email, amount=amount) # send email
                         except Exception as e:
@@ -246,7 +250,8 @@ def paystack_webhook():
                     elif payment_type == 'task-creation':
                         task_key = data['data']['metadata']['task_key']
                         task = get_task_by_key(task_key)
-                        task.update(payment_status=TaskPaymentStatus.COMPLETE)
+                        task.mark_paid()
+                        record_task_spend(task)
                     
                     elif payment_type == 'credit-wallet':
                         # Credit user's wallet
@@ -10,6 +10,7 @@ from ...models import Payment, Transaction, TransactionType, Withdrawal, Trendit
 from ..helpers.loggers import console_log, log_exception
 from ...utils.helpers.basic_helpers import generate_random_string
 from ...utils.helpers.mail_helpers import send_other_emails, send_transaction_alert_email
+from ...utils.helpers.leaderboard_helpers import record_task_earning
 from .rates import convert_amount
 
 
@@ -49,7 +50,7 @@ def debit_wallet(user_id: int, amount: int, payment_type=None) -> float:
         raise e
 
 
-def credit_wallet(user_id: int, amount: int | float | Decimal, credit_type="task-performance", record_txt=False) -> Decimal:
+def credit_wallet(user_id: int, amount: int | float | Decimal, credit_type="task-performance", record_txt=False, platform: str | None = None) -> Decimal:
     user: Trendit3User = Trendit3User.query.get(user_id)
     
     if user is None:
@@ -94,6 +95,9 @@ def credit_wallet(user_id: int, amount: int | float | Decimal, credit_type="task
             
         db.session.commit()
         
+        if credit_type=="task-performance" and platform:
+            record_task_earning(user_id, amount, platform)
+        
         return wallet.balance
     except Exception as e:
         # Handle the exception appropriately (rollback, log the error, etc.)
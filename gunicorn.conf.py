@@ -0,0 +1,25 @@
+'''
+Gunicorn settings for the Trendit³ API.
+
+Each gunicorn worker keeps its own Prometheus metrics. When PROMETHEUS_MULTIPROC_DIR is set,
+workers write them to that directory and `/metrics` aggregates them. The directory is emptied
+when gunicorn starts, and the files of workers that exit are marked dead.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import os, shutil
+
+
+def on_starting(server):
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
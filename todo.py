@@ -12,11 +12,11 @@
 # TODO: Add sanitization.
 # TODO: Implement Caching.
 # TODO: Integrate Coinbase as a payment Option.
-# TODO: Global Search need a rework.
-# TODO: Implement Pagination for Global Search.
 
 
 # DONE
+# TODO: Global Search need a rework. (DONE)
+# TODO: Implement Pagination for Global Search. (DONE)
 # TODO: Refactor JSON response for error handlers (DONE)
 # TODO: Rename Image Model to Media (DONE)
 # TODO: Create endpoint to get a single task. (DONE)